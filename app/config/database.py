@@ -1,33 +1,86 @@
 """
 Database setup and models for visitor tracking.
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text
+from sqlalchemy import (
+    create_engine, inspect, Boolean, Column, Date, Float, ForeignKey, Integer, SmallInteger, String, DateTime, Text
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 from datetime import datetime
+from typing import Optional
+import logging
+from app.config.lazy import Lazy
 from app.config.settings import settings
 
-# Create database engine
+logger = logging.getLogger(__name__)
+
+# Normalize database URL
 raw_url = settings.database_url
 if raw_url.startswith("postgresql://"):
     DATABASE_URL = raw_url.replace("postgresql://", "postgresql+psycopg://", 1)
 else:
     DATABASE_URL = raw_url
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=settings.debug,
-    poolclass=NullPool,   # No connection pooling (better for serverless)
+
+def _create_engine() -> Engine:
+    """Create database engine (imports the DB driver)."""
+    return create_engine(
+        DATABASE_URL,
+        echo=settings.debug,
+        poolclass=NullPool,   # No connection pooling (better for serverless)
+    )
+
+
+# Engine and session factory are built on first use, not at import
+_engine: Lazy[Engine] = Lazy("database_engine", _create_engine)
+_session_factory: Lazy[sessionmaker] = Lazy(
+    "session_factory",
+    lambda: sessionmaker(autocommit=False, autoflush=False, bind=_engine.get())
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine() -> Engine:
+    """Get the shared database engine."""
+    return _engine.get()
+
+
+def peek_engine() -> Optional[Engine]:
+    """Get the database engine only if it has already been created."""
+    return _engine.peek()
+
+
+def SessionLocal():
+    """Create a new database session."""
+    return _session_factory.get()()
 
 # Create base class for models
 Base = declarative_base()
 
 
+class UserAgent(Base):
+    """Distinct user-agent string, referenced by visits (dictionary encoding)."""
+    __tablename__ = "user_agents"
+
+    id = Column(Integer, primary_key=True)
+    ua_hash = Column(String(32), unique=True, nullable=False)  # Lookup key; the text can be too long to index
+    user_agent = Column(Text, nullable=False)
+    # Parsed by app.services.user_agents after the row is created (NULL until then)
+    browser = Column(String(32), nullable=True)
+    os = Column(String(32), nullable=True)
+    device = Column(String(16), nullable=True)
+    is_bot = Column(Boolean, nullable=True)
+
+
+class Page(Base):
+    """Distinct page path, referenced by visits (dictionary encoding)."""
+    __tablename__ = "pages"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String(255), unique=True, nullable=False)
+
+
 class Visitor(Base):
     """Visitor tracking model."""
     __tablename__ = "visitors"
@@ -35,12 +88,12 @@ class Visitor(Base):
     id = Column(Integer, primary_key=True, index=True)
     visit_date = Column(DateTime, default=datetime.now, nullable=False)
     ip_hash = Column(String(64), nullable=True)
-    user_agent = Column(Text, nullable=True)
-    page_visited = Column(String(255), nullable=False)
+    user_agent_id = Column(Integer, ForeignKey("user_agents.id"), nullable=True, index=True)
+    page_id = Column(Integer, ForeignKey("pages.id"), nullable=False, index=True)
 
 
 class ChatSession(Base):
-    """Chat session tracking model (optional for Phase 2)."""
+    """Chat session tracking model."""
     __tablename__ = "chat_sessions"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -49,9 +102,90 @@ class ChatSession(Base):
     messages_count = Column(Integer, default=0)
 
 
-def init_db():
-    """Initialize database tables."""
+class ChatTurn(Base):
+    """One question/answer turn of a chat session (written in batches)."""
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(
+        String(36), ForeignKey("chat_sessions.session_id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    created_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
+    question = Column(Text, nullable=False)
+    answer = Column(Text, nullable=True)
+    latency_ms = Column(Float, nullable=False)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    cached = Column(Boolean, default=False, nullable=False)
+    streamed = Column(Boolean, default=False, nullable=False)
+    success = Column(Boolean, default=True, nullable=False)
+    provider = Column(String(32), nullable=True)
+
+
+class AnalyticsEvent(Base):
+    """
+    One analytics event (resume download, visitor action, ...).
+
+    event_type holds an app.services.events.EventType value, so new kinds of
+    event need no new table; per-kind details go in the small subject column.
+    """
+    __tablename__ = "analytics_events"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
+    event_type = Column(SmallInteger, nullable=False)
+    ip_hash = Column(String(64), nullable=True)
+    subject = Column(String(255), nullable=True)
+
+
+class EventDailyCount(Base):
+    """Running count of events per day and type, updated with each event batch."""
+    __tablename__ = "analytics_event_daily_counts"
+
+    day = Column(Date, primary_key=True)
+    event_type = Column(SmallInteger, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+
+def init_db(engine: Optional[Engine] = None):
+    """
+    Initialize database tables and apply pending migrations.
+
+    Args:
+        engine: Database to initialize (default: the shared engine)
+    """
+    from app.config.migrations import run_migrations
+
+    engine = engine or get_engine()
+    fresh = not inspect(engine).has_table(Visitor.__tablename__)
     Base.metadata.create_all(bind=engine)
+    # A new database already has the current schema: record the migrations as applied
+    run_migrations(engine, stamp_only=fresh)
+
+
+def ensure_schema(engine: Optional[Engine] = None):
+    """
+    Startup fallback for the release step (python init_database.py).
+
+    A current database costs one read of schema_migrations. Outside production a
+    database that is behind is initialized here; in production migrations belong
+    to the release step, which runs once before any worker starts, so workers
+    only report a stale schema instead of racing each other to migrate it.
+
+    Args:
+        engine: Database to check (default: the shared engine)
+    """
+    from app.config.migrations import pending_migrations
+
+    engine = engine or get_engine()
+    pending = pending_migrations(engine)
+    if not pending:
+        return
+    if settings.environment == "production":
+        logger.error(f"Database schema is behind (pending migrations {pending}); run python init_database.py")
+        return
+    init_db(engine)
+    logger.info("Database initialized successfully")
 
 
 def get_db():
@@ -0,0 +1,54 @@
+"""
+Lazily constructed singletons.
+Heavy objects (DB engine, LLM client, knowledge base) are built on first use or by the
+startup warm-up instead of at import time, and their build times are recorded.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Build duration in milliseconds for every lazy singleton that has been created
+startup_timings: Dict[str, float] = {}
+
+
+class Lazy(Generic[T]):
+    """Thread-safe holder that builds its value once, on first access."""
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Return the value, building it if needed."""
+        value = self._value
+        if value is not None:
+            return value
+
+        with self._lock:
+            if self._value is None:
+                started = time.perf_counter()
+                self._value = self._factory()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                startup_timings[self.name] = round(elapsed_ms, 1)
+                logger.info(f"Initialized {self.name} in {elapsed_ms:.1f}ms")
+            return self._value
+
+    def peek(self) -> Optional[T]:
+        """Return the value if already built, without building it."""
+        return self._value
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    def reset(self) -> None:
+        """Drop the cached value so the next access rebuilds it."""
+        with self._lock:
+            self._value = None
@@ -0,0 +1,312 @@
+"""
+Schema migrations.
+create_all() only creates missing tables; changes to tables that already exist
+are applied here, in order, and recorded in schema_migrations so each one runs
+once per database. A database that create_all() has just built from the
+current models only has the migrations recorded, not run.
+"""
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Set, Tuple
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, bindparam, func, inspect, insert,
+    select, update
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.types import TypeEngine
+
+logger = logging.getLogger(__name__)
+
+# Kept off the models' metadata: it is bookkeeping, not part of the schema
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+Migration = Tuple[int, str, Callable[[Connection], None]]
+
+
+class MigrationError(RuntimeError):
+    """Data failed a migration's checks; its transaction is rolled back."""
+
+
+# ==================== Helpers ====================
+# Migrations spell out the columns they touch instead of reading the models,
+# which describe the latest schema, not the one a migration was written for.
+
+def table_columns(conn: Connection, table: str) -> Set[str]:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def add_column_if_missing(conn: Connection, table: str, name: str, type_: TypeEngine) -> bool:
+    """
+    Add a nullable column to an existing table.
+
+    Returns:
+        True if the column was added
+    """
+    if name in table_columns(conn, table):
+        return False
+    conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {type_.compile(conn.dialect)}")
+    return True
+
+
+def drop_column_if_present(conn: Connection, table: str, name: str) -> bool:
+    """Drop a column (drop its indexes first; SQLite needs 3.35+)."""
+    if name not in table_columns(conn, table):
+        return False
+    conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN {name}")
+    return True
+
+
+def create_index(conn: Connection, table: str, column: str) -> None:
+    """Create ix_<table>_<column>, the name the models' index=True gives it."""
+    conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})")
+
+
+def drop_index(conn: Connection, table: str, column: str) -> None:
+    conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{table}_{column}")
+
+
+# ==================== Migrations ====================
+
+PARSED_UA_COLUMNS = ("browser", "os", "device", "is_bot")
+
+# Visits rewritten per UPDATE batch by the dictionary encoding migration
+ENCODE_CHUNK_SIZE = 5000
+
+
+def _user_agent_columns(conn: Connection) -> None:
+    """Parsed user-agent fields on visitors."""
+    types = {"browser": String(32), "os": String(32), "device": String(16), "is_bot": Boolean()}
+    for name, type_ in types.items():
+        add_column_if_missing(conn, "visitors", name, type_)
+    for name in ("browser", "os", "device"):
+        create_index(conn, "visitors", name)
+
+
+def _dictionary_encode_visits(conn: Connection) -> None:
+    """
+    Move user agents and page paths into lookup tables referenced by integer ids.
+
+    The user_agents and pages tables were created by create_all(). Parsed fields
+    move to user_agents with their string; rows never parsed are picked up by the
+    enricher's backfill.
+    """
+    from app.services.user_agents import user_agent_hash
+
+    if "page_visited" not in table_columns(conn, "visitors"):
+        return
+    add_column_if_missing(conn, "visitors", "user_agent_id", Integer())
+    add_column_if_missing(conn, "visitors", "page_id", Integer())
+
+    metadata = MetaData()
+    visitors = Table("visitors", metadata, autoload_with=conn)
+    user_agents = Table("user_agents", metadata, autoload_with=conn)
+    pages = Table("pages", metadata, autoload_with=conn)
+    parsed = PARSED_UA_COLUMNS if "device" in visitors.c else ()
+
+    # Distinct values, hashed in Python (there is no portable SQL digest)
+    page_ids: Dict[str, int] = dict(conn.execute(select(pages.c.path, pages.c.id)).all())
+    new_pages = conn.scalars(select(visitors.c.page_visited).distinct()).all()
+    new_pages = [{"path": path} for path in new_pages if path not in page_ids]
+    if new_pages:
+        conn.execute(insert(pages), new_pages)
+        page_ids = dict(conn.execute(select(pages.c.path, pages.c.id)).all())
+
+    ua_ids: Dict[str, int] = dict(conn.execute(select(user_agents.c.ua_hash, user_agents.c.id)).all())
+    new_agents: Dict[str, Dict] = {}
+    text_hashes: Dict[str, str] = {}
+    distinct_agents = select(visitors.c.user_agent, *(visitors.c[name] for name in parsed)).distinct()
+    for row in conn.execute(distinct_agents.where(visitors.c.user_agent.is_not(None))).mappings():
+        key = text_hashes[row["user_agent"]] = user_agent_hash(row["user_agent"])
+        if key in ua_ids or (key in new_agents and new_agents[key].get("device") is not None):
+            continue
+        new_agents[key] = {"ua_hash": key, **row}
+    if new_agents:
+        rows = [{"browser": None, "os": None, "device": None, "is_bot": None, **row} for row in new_agents.values()]
+        conn.execute(insert(user_agents), rows)
+        ua_ids = dict(conn.execute(select(user_agents.c.ua_hash, user_agents.c.id)).all())
+    text_ids = {text: ua_ids[key] for text, key in text_hashes.items()}
+
+    # Point each visit at its lookup rows, walking the primary key in chunks
+    set_ids = (
+        update(visitors)
+        .where(visitors.c.id == bindparam("visit_id"))
+        .values(user_agent_id=bindparam("ua_id"), page_id=bindparam("p_id"))
+    )
+    last_id = 0
+    while True:
+        chunk = conn.execute(
+            select(visitors.c.id, visitors.c.user_agent, visitors.c.page_visited)
+            .where(visitors.c.id > last_id)
+            .order_by(visitors.c.id)
+            .limit(ENCODE_CHUNK_SIZE)
+        ).all()
+        if not chunk:
+            break
+        conn.execute(set_ids, [
+            {
+                "visit_id": visit_id,
+                "ua_id": None if user_agent is None else text_ids[user_agent],
+                "p_id": page_ids[page],
+            }
+            for visit_id, user_agent, page in chunk
+        ])
+        last_id = chunk[-1][0]
+
+    # The string columns stay until the next migration, once this backfill is committed
+    _check_encoded_visits(conn)
+
+
+def _check_encoded_visits(conn: Connection) -> None:
+    """
+    Check every visit points at existing lookup rows (and, while the string
+    columns remain, at the ones holding the same strings).
+
+    Raises:
+        MigrationError: Describing the first failed check
+    """
+    metadata = MetaData()
+    visitors = Table("visitors", metadata, autoload_with=conn)
+    user_agents = Table("user_agents", metadata, autoload_with=conn)
+    pages = Table("pages", metadata, autoload_with=conn)
+    visits = select(func.count()).select_from(visitors)
+
+    checks = {
+        "without a page_id": visits.where(visitors.c.page_id.is_(None)),
+        "pointing at a missing page": visits.where(
+            visitors.c.page_id.is_not(None), visitors.c.page_id.not_in(select(pages.c.id))
+        ),
+        "pointing at a missing user agent": visits.where(
+            visitors.c.user_agent_id.is_not(None), visitors.c.user_agent_id.not_in(select(user_agents.c.id))
+        ),
+    }
+    if "page_visited" in visitors.c:
+        checks["whose page_id does not match page_visited"] = (
+            visits.join(pages, visitors.c.page_id == pages.c.id).where(pages.c.path != visitors.c.page_visited)
+        )
+    if "user_agent" in visitors.c:
+        checks["without a user_agent_id for their user_agent"] = visits.where(
+            visitors.c.user_agent.is_not(None), visitors.c.user_agent_id.is_(None)
+        )
+        checks["whose user_agent_id does not match user_agent"] = (
+            visits.join(user_agents, visitors.c.user_agent_id == user_agents.c.id)
+            .where(user_agents.c.user_agent != visitors.c.user_agent)
+        )
+    for problem, query in checks.items():
+        count = conn.scalar(query)
+        if count:
+            raise MigrationError(f"{count} visits {problem}")
+
+
+def _constrain_encoded_visits(conn: Connection) -> None:
+    """
+    Make page_id NOT NULL, add the lookup foreign keys and drop the string columns.
+
+    The dropped columns are copied to visitors_unencoded first; drop that table
+    by hand once the encoded data has been checked. SQLite cannot add
+    constraints to an existing table, so there the table is rebuilt.
+    """
+    _check_encoded_visits(conn)
+
+    columns = table_columns(conn, "visitors")
+    legacy = [name for name in ("user_agent", "page_visited", *PARSED_UA_COLUMNS) if name in columns]
+    if legacy and not inspect(conn).has_table("visitors_unencoded"):
+        conn.exec_driver_sql(f"CREATE TABLE visitors_unencoded AS SELECT id, {', '.join(legacy)} FROM visitors")
+        logger.info("Copied the visitor string columns to visitors_unencoded")
+
+    if conn.dialect.name == "sqlite":
+        _rebuild_visitors(conn)
+    else:
+        for name in ("browser", "os", "device"):
+            drop_index(conn, "visitors", name)
+        conn.exec_driver_sql("ALTER TABLE visitors ALTER COLUMN page_id SET NOT NULL")
+        conn.exec_driver_sql(
+            "ALTER TABLE visitors ADD CONSTRAINT visitors_page_id_fkey FOREIGN KEY (page_id) REFERENCES pages (id)"
+        )
+        conn.exec_driver_sql(
+            "ALTER TABLE visitors ADD CONSTRAINT visitors_user_agent_id_fkey "
+            "FOREIGN KEY (user_agent_id) REFERENCES user_agents (id)"
+        )
+        for name in legacy:
+            drop_column_if_present(conn, "visitors", name)
+    create_index(conn, "visitors", "user_agent_id")
+    create_index(conn, "visitors", "page_id")
+
+
+def _rebuild_visitors(conn: Connection) -> None:
+    """Copy visitors into a table with the encoded schema and its constraints, then swap it in."""
+    metadata = MetaData()
+    Table("user_agents", metadata, autoload_with=conn)
+    Table("pages", metadata, autoload_with=conn)
+    rebuilt = Table(
+        "visitors_rebuilt",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("visit_date", DateTime, nullable=False),
+        Column("ip_hash", String(64), nullable=True),
+        Column("user_agent_id", Integer, ForeignKey("user_agents.id"), nullable=True),
+        Column("page_id", Integer, ForeignKey("pages.id"), nullable=False),
+    )
+    rebuilt.create(conn)
+    columns = ", ".join(rebuilt.c.keys())
+    copied = conn.exec_driver_sql(f"INSERT INTO visitors_rebuilt ({columns}) SELECT {columns} FROM visitors").rowcount
+    expected = conn.exec_driver_sql("SELECT COUNT(*) FROM visitors").scalar()
+    if copied != expected:
+        raise MigrationError(f"Rebuilt visitors table has {copied} rows, expected {expected}")
+    conn.exec_driver_sql("DROP TABLE visitors")
+    conn.exec_driver_sql("ALTER TABLE visitors_rebuilt RENAME TO visitors")
+    create_index(conn, "visitors", "id")
+
+
+MIGRATIONS: List[Migration] = [
+    (1, "visitor user-agent columns", _user_agent_columns),
+    (2, "dictionary-encode visitor user agents and pages", _dictionary_encode_visits),
+    (3, "constrain encoded visitor columns", _constrain_encoded_visits),
+]
+
+
+def pending_migrations(engine: Engine) -> List[int]:
+    """Versions not yet recorded in schema_migrations (all of them for a new database)."""
+    versions = [version for version, _, _ in MIGRATIONS]
+    if not inspect(engine).has_table(schema_migrations.name):
+        return versions
+    with engine.connect() as conn:
+        done = set(conn.scalars(select(schema_migrations.c.version)))
+    return [version for version in versions if version not in done]
+
+
+def run_migrations(engine: Engine, stamp_only: bool = False) -> List[int]:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    Args:
+        engine: Database engine
+        stamp_only: Record pending migrations as applied without running them
+            (for a database create_all() has just built from the current models)
+
+    Returns:
+        Versions applied by this call
+    """
+    _metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        done = set(conn.scalars(select(schema_migrations.c.version)))
+
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            if not stamp_only:
+                migrate(conn)
+            conn.execute(insert(schema_migrations).values(version=version, name=name, applied_at=datetime.now()))
+        if not stamp_only:
+            logger.info(f"Applied migration {version}: {name}")
+        applied.append(version)
+    return applied
@@ -3,7 +3,7 @@ Application configuration and settings management.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Union
+from typing import Dict, List, Union
 
 
 class Settings(BaseSettings):
@@ -20,11 +20,27 @@ class Settings(BaseSettings):
     app_name: str = "Portfolio AI Agent API"
     app_version: str = "1.0.0"
     debug: bool = False
-    environment: str = "production"
+    environment: str = "production"  # Outside production, startup also migrates a database the release step missed
     
     # ==================== Server Configuration ====================
     host: str = "0.0.0.0"
     port: int = 8000
+    warmup_on_startup: bool = True  # Build DB engine and AI agent in the background at startup
+    json_backend: str = "orjson"  # "orjson" or "stdlib" for response serialization
+
+    # ==================== Process Model (gunicorn.conf.py) ====================
+    # Worker processes; 0 = one per available CPU. Keep 1 unless RATE_LIMIT_STORAGE_URI is shared:
+    # rate limits, caches and /metrics are per worker
+    web_concurrency: int = 1
+    web_concurrency_max: int = 8  # Cap for the automatic worker count (each worker holds its own caches)
+    preload_app: bool = True  # Import the app once in the master; workers share it copy-on-write
+    worker_max_requests: int = 5000  # Recycle a worker after this many requests (0 = never)
+    worker_max_requests_jitter: int = 500  # Stagger recycling so workers don't restart together
+    worker_timeout_seconds: int = 60  # Restart a worker whose event loop stops heartbeating
+    worker_keepalive_seconds: int = 5
+    graceful_timeout_seconds: int = 30  # SIGTERM to SIGKILL budget per worker
+    stream_drain_seconds: float = 20.0  # In-flight chat streams may run this long after SIGTERM
+    shutdown_hook_timeout_seconds: float = 5.0  # Per flush hook at shutdown
     
     # ==================== CORS Configuration ====================
     # allowed_origins: Union[List[str], str] = "http://localhost:3000,http://127.0.0.1:3000"
@@ -35,6 +51,48 @@ class Settings(BaseSettings):
         "https://howardye.up.railway.app",
         "https://howardye.vercel.app"
     ]
+    cors_max_age_seconds: int = 7200  # Preflight cache lifetime (Chromium caps it at 2 hours)
+    
+    # ==================== Response Compression ====================
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # Bytes; smaller bodies are sent as-is
+    compression_gzip_level: int = 6
+    compression_brotli: bool = True  # Used when the brotli package is installed
+    compression_brotli_quality: int = 4
+    compression_content_types: list[str] = [
+        "application/json",
+        "text/plain",
+        "text/html",
+        "text/markdown",
+        "text/csv",
+        "application/x-ndjson",
+    ]
+    
+    # ==================== HTTP Caching ====================
+    static_response_max_age_seconds: int = 86400  # Cache-Control for /, /api/chat/examples, /api/resume/preview
+
+    # ==================== Observability ====================
+    metrics_enabled: bool = True
+    metrics_token: str = ""  # If set, /metrics requires "Authorization: Bearer <token>"
+
+    # Request profiling (admin only; the middleware is not installed when disabled)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0  # Fraction of requests profiled automatically
+    profiling_buffer_size: int = 20  # Profiles kept in memory per worker
+    profiler: str = "auto"  # "auto", "pyinstrument" or "cprofile"
+    profiling_token: str = ""  # Signs X-Profile-Request headers; on-demand profiling is off while empty
+
+    # Background health probes (/health serves the cached result)
+    health_probe_interval_seconds: float = 15.0
+    health_probe_timeout_seconds: float = 5.0
+    health_llm_probe_interval_seconds: float = 60.0  # LLM pings are rarer; they leave the network
+    health_queue_warn_depth: int = 1000  # Queues deeper than this report degraded
+
+    # OpenTelemetry tracing (requires opentelemetry-sdk)
+    tracing_enabled: bool = False
+    tracing_exporter: str = "file"  # "console", "file" (JSON lines) or "otlp"
+    tracing_file: str = "traces.jsonl"
+    tracing_sample_ratio: float = 1.0
     
     # ==================== Database Configuration ====================
     database_url: str = ""
@@ -42,21 +100,99 @@ class Settings(BaseSettings):
     # ==================== GEmini/Anthropic API Configuration ====================
     #anthropic_api_key: str = ""
     #anthropic_model: str = "claude-sonnet-4-20250514"
-    ai_provider: str = "gemini"  # or "anthropic" if you switch back
+    ai_provider: str = "gemini"  # "gemini" or "stub" (offline load testing)
     gemini_api_key: str = ""
     gemini_model: str = "gemini-2.5-flash"  # Free tier model
     max_tokens: int = 2048  # Gemini calls this "max_output_tokens"
     temperature: float = 0.7
-    
+
+    # Stub provider (AI_PROVIDER=stub) - simulated latency and output size
+    stub_first_token_ms: float = 300.0
+    stub_token_ms: float = 5.0
+    stub_response_tokens: int = 150
+    stub_failure_rate: float = 0.0
+
     # ==================== AI Agent Configuration ====================
     ai_agent_name: str = "Howard's Portfolio Assistant"
     ai_agent_role: str = "AI assistant helping recruiters learn about Howard Ye"
-    
+    faq_fast_path_enabled: bool = True  # Answer close matches to FAQ entries without the LLM
+    faq_match_threshold: float = 0.8  # Minimum match score (0-1) for a stored FAQ answer
+    faq_min_matched_terms: int = 2  # Content words a question must share with the FAQ entry
+
+    # ==================== Token Limits ====================
+    max_prompt_tokens: int = 32000  # Prompts estimated above this are rejected with 413
+    session_token_budget: int = 200000  # Total tokens per chat session (0 disables)
+    session_budget_idle_reset_seconds: float = 3600.0  # Idle sessions start a fresh budget
+
+    # ==================== WebSocket Chat ====================
+    chat_ws_enabled: bool = True  # Serve /api/chat/ws alongside the HTTP endpoints
+
+    # ==================== Batch Chat ====================
+    chat_batch_max_questions: int = 20  # Questions accepted per /api/chat/batch request
+    chat_batch_max_completion_tokens: int = 6000  # Output budget per packed upstream call
+    chat_batch_answer_tokens: int = 400  # Output reserved per answer when packing
+
+    # ==================== Upstream Resilience ====================
+    upstream_timeout_seconds: float = 20.0  # Per-attempt timeout
+    upstream_deadline_seconds: float = 45.0  # Total budget including retries
+    upstream_max_retries: int = 2
+    upstream_backoff_base_seconds: float = 0.5
+    upstream_backoff_max_seconds: float = 4.0
+    upstream_hedge_delay_seconds: float = 0.0  # 0 disables hedged requests
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+
+    # ==================== Response Cache ====================
+    response_cache_max_entries: int = 512
+    response_cache_ttl_seconds: float = 3600.0
+
+    # ==================== Chat Transcripts ====================
+    transcripts_enabled: bool = True
+    transcript_batch_size: int = 100  # Turns per INSERT batch
+    transcript_flush_interval_seconds: float = 2.0
+    transcript_max_queue: int = 10000  # Oldest unwritten turns are dropped beyond this
+    transcript_retention_days: int = 30
+    transcript_prune_interval_seconds: float = 3600.0
+
+    # ==================== Analytics Events ====================
+    events_enabled: bool = True
+    event_batch_size: int = 200  # Events per INSERT batch
+    event_flush_interval_seconds: float = 2.0
+    event_max_queue: int = 20000  # Oldest unwritten events are dropped beyond this
+    event_daily_counts_max_days: int = 366  # Longest window /api/analytics/events/daily serves
+
+    # ==================== User-Agent Enrichment ====================
+    ua_enrichment_enabled: bool = True
+    ua_cache_size: int = 4096  # Distinct parsed user agents kept per worker
+    ua_enrichment_batch_size: int = 200  # Visits per UPDATE batch
+    ua_enrichment_flush_interval_seconds: float = 2.0
+    ua_enrichment_max_queue: int = 10000  # Dropped visits are picked up by the next startup backfill
+    ua_backfill_chunk_size: int = 1000
+
+    # ==================== Visit Storage ====================
+    intern_cache_size: int = 4096  # Page / user-agent ids cached per worker (per table)
+
+    # ==================== Multi-Tenancy ====================
+    tenants_dir: str = "tenants"  # One subdirectory of .md/.txt documents per tenant
+    tenant_hosts: Dict[str, str] = {}  # Host name -> tenant, e.g. {"jane.example.com": "jane"}
+    default_tenant: str = "default"  # Tenant name served by the built-in knowledge base
+    tenant_memory_budget_mb: float = 256.0  # Loaded tenant agents beyond this are evicted LRU
+
+    # ==================== Visit Deduplication ====================
+    visit_dedup_enabled: bool = True
+    visit_dedup_bucket_seconds: int = 1800  # Repeat views of a page within a bucket count once
+    visit_dedup_capacity: int = 50000  # Distinct visits per bucket before the filter grows a slice
+    visit_dedup_error_rate: float = 0.001  # Bloom false-positive rate (max fraction of new visits dropped)
+    visit_idempotency_ttl_seconds: float = 600.0
+
     # ==================== Security ====================
     secret_key: str = "your-secret-key-change-this-in-production"
+    admin_token: str = ""  # Enables /api/admin endpoints when set
     
     # ==================== Rate Limiting ====================
+    rate_limit_enabled: bool = True  # Disable for load testing only
     rate_limit_per_minute: int = 10
+    rate_limit_storage_uri: str = "memory://"  # e.g. redis://host:6379 to share limits across workers
 
 
 # ==================== Global Settings Instance ====================
@@ -1,21 +1,39 @@
 """
 Main FastAPI application for Howard's Portfolio Backend.
 """
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Request, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.config.settings import settings
-# from app.config.database import init_db
+from app.config.lazy import startup_timings
+from app.config.database import ensure_schema, get_engine
 from app.routers.chat import router as chat_router
 from app.routers.analytics import router as analytics_router
-from app.routers import resume
-from app.models.schemas import HealthCheck, HealthStatus
+from app.routers import resume, admin
+from app.models.schemas import HealthCheck
+from app.responses import FastJSONResponse
+from app.middleware import CompressionMiddleware, CORSMiddleware, MetricsMiddleware, ProfilingMiddleware, TenantMiddleware, TracingMiddleware
+from app.services.events import event_store
+from app.services.health import health_prober
+from app.services.lifecycle import lifecycle
+from app.services.metrics import request_stats
+from app.services.profiling import profile_store
+from app.services.static_responses import static_responses
+from app.services.tenants import tenant_registry
+from app.services.tracing import init_tracing, shutdown_tracing
+from app.services.transcripts import transcript_store
+from app.services.user_agents import ua_enricher
+from app.services.ai_agent import get_ai_agent
 
 # Configure logging
 logging.basicConfig(
@@ -24,8 +42,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tracing must be configured before middleware and routes are set up
+tracing_active = init_tracing()
+
 # Create rate limiter instance
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    enabled=settings.rate_limit_enabled,
+    storage_uri=settings.rate_limit_storage_uri,
+)
+
+
+def warm_up():
+    """Build heavy singletons and check the schema ahead of the first request; log the startup breakdown."""
+    for build in (get_engine, ensure_schema, get_ai_agent):
+        try:
+            build()
+        except Exception as e:
+            logger.error(f"Warm-up step {build.__name__} failed: {e}")
+    static_responses.build_all()
+
+    breakdown = ", ".join(f"{name}={ms}ms" for name, ms in startup_timings.items())
+    logger.info(f"Startup breakdown: {breakdown}")
 
 
 @asynccontextmanager
@@ -35,25 +73,35 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Portfolio API...")
     logger.info(f"Environment: {'DEBUG' if settings.debug else 'PRODUCTION'}")
     
-    # Initialize database
-    try:
-        # init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+    # Heavy singletons are built in the background so the server binds immediately
+    warmup_task = None
+    if settings.warmup_on_startup:
+        warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    
+    health_prober.start(after=warmup_task)
+    transcript_store.start()
+    event_store.start()
+    ua_enricher.start()
     
     yield
+
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
     
-    # Shutdown
+    # Shutdown: finish streams, then flush and close in reverse registration order
     logger.info("Shutting down Portfolio API...")
+    await lifecycle.shutdown()
 
 
 # Create FastAPI application
+startup_timings["app_import"] = round((time.perf_counter() - _import_started) * 1000, 1)
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="AI-powered API for Howard Ye's portfolio website",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None
 )
@@ -62,27 +110,66 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Configure CORS
+# Resolve the tenant (path prefix or Host) before routing
+app.add_middleware(TenantMiddleware, registry=tenant_registry)
+
+# Configure CORS; also turns unhandled errors into a JSON 500 that keeps CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["Content-Disposition"]
+    expose_headers=["Content-Disposition"],
+    max_age=settings.cors_max_age_seconds,
 )
 
+# Compress large JSON/text bodies (SSE streams and the resume PDF are never compressed)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        content_types=settings.compression_content_types,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        enable_brotli=settings.compression_brotli,
+    )
+
+# Sampled or on-demand request profiling (admin flag; not installed when off)
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        sample_rate=settings.profiling_sample_rate,
+        profiler=settings.profiler,
+    )
+
+# Record per-route latency (added last so it wraps the whole stack)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    health_prober.register_queue("http_in_flight", lambda: request_stats.in_flight)
+
+# Root span per request (outermost, so it covers every other middleware)
+if tracing_active:
+    app.add_middleware(TracingMiddleware)
+
+# Run at shutdown after streams drain, newest first
+lifecycle.on_shutdown("tracing", shutdown_tracing)
+lifecycle.on_shutdown("health_prober", health_prober.stop)
+lifecycle.on_shutdown("transcripts", transcript_store.stop)
+health_prober.register_queue("transcripts", lambda: transcript_store.writer.depth)
+lifecycle.on_shutdown("analytics_events", event_store.stop)
+health_prober.register_queue("analytics_events", lambda: event_store.writer.depth)
+lifecycle.on_shutdown("ua_enrichment", ua_enricher.stop)
+health_prober.register_queue("ua_enrichment", lambda: ua_enricher.writer.depth)
+
 # Include routers
 app.include_router(chat_router)
 app.include_router(analytics_router)
 app.include_router(resume.router)
+app.include_router(admin.router)
 
 
 # ==================== Root Endpoints ====================
 
-@app.get("/")
-async def root():
-    """Root endpoint with API information."""
+def _api_info() -> dict:
     return {
         "name": settings.app_name,
         "version": settings.app_version,
@@ -99,92 +186,50 @@ async def root():
     }
 
 
-# @app.get("/health", response_model=HealthCheck)
-# async def health_check():
-#     """
-#     Health check endpoint for monitoring.
-#     Tests database and AI service connectivity.
-#     """
-#     try:
-#         # Check database connection
-#         from app.config.database import engine
-#         from sqlalchemy import text
-#         with engine.connect() as conn:
-#             conn.execute(text("SELECT 1"))
-#         db_healthy = True
-#     except Exception as e:
-#         logger.error(f"Database health check failed: {e}")
-#         db_healthy = False
-    
-#     # Check AI service (basic check - just verify we have API key)
-#     ai_healthy = bool(settings.gemini_api_key)
-    
-#     # Determine overall status
-#     if db_healthy and ai_healthy:
-#         status = HealthStatus.HEALTHY
-#     elif db_healthy or ai_healthy:
-#         status = HealthStatus.DEGRADED
-#     else:
-#         status = HealthStatus.UNHEALTHY
-    
-#     return HealthCheck(
-#         status=status,
-#         database=db_healthy,
-#         ai_service=ai_healthy,
-#         version=settings.app_version,
-#     )
-@app.get("/health")
-async def health_check():
-    return {
-        "status": "healthy",
-        "service": "portfolio-api",
-        "version": "1.0.0",
-        "cors_origins": settings.cors_origins  # Include for debugging
-    }
+static_responses.register("root", _api_info)
+
+
+@app.get("/")
+async def root(request: Request):
+    """Root endpoint with API information (pre-serialized, ETag-validated)."""
+    return static_responses.respond("root", request)
+
+
+@app.get("/health", response_model=HealthCheck)
+async def health_check(request: Request):
+    """
+    Health check endpoint for monitoring.
+    Serves the latest background probe of the database, LLM and queues; it never
+    touches a dependency itself, so frequent load-balancer probes are free.
+    Returns 503 only when every dependency is down; 304 while the client's copy is current.
+    """
+    return static_responses.respond("health", request)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint."""
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+    if not settings.metrics_enabled:
+        return JSONResponse(status_code=404, content={"detail": "Metrics are disabled"})
+    if settings.metrics_token and request.headers.get("authorization") != f"Bearer {settings.metrics_token}":
+        return JSONResponse(status_code=401, content={"detail": "Invalid metrics token"})
+
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
 
 
 # ==================== Error Handlers ====================
-# Custom exception handler that includes CORS headers
+# CORS headers for every error response, and the JSON 500 for unhandled
+# exceptions, come from CORSMiddleware
+
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    """Handle rate limit exceeded with CORS headers."""
-    response = JSONResponse(
+    """Handle rate limit exceeded."""
+    return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={"detail": "Rate limit exceeded. Please try again later."},
     )
-    # Add CORS headers
-    origin = request.headers.get("origin")
-    if origin in settings.cors_origins:
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-    return response
-
-# Custom exception handler for all HTTP exceptions
-@app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception):
-    """Handle all exceptions with CORS headers."""
-    from fastapi.exceptions import HTTPException
-    
-    if isinstance(exc, HTTPException):
-        response = JSONResponse(
-            status_code=exc.status_code,
-            content={"detail": exc.detail},
-        )
-    else:
-        response = JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": "Internal server error"},
-        )
-    
-    # Add CORS headers to error responses
-    origin = request.headers.get("origin")
-    if origin in settings.cors_origins:
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Allow-Methods"] = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
-        response.headers["Access-Control-Allow-Headers"] = "*"
-    
-    return response
 
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
@@ -199,19 +244,6 @@ async def not_found_handler(request, exc):
     )
 
 
-@app.exception_handler(500)
-async def internal_error_handler(request, exc):
-    """Handle 500 errors."""
-    logger.error(f"Internal server error: {exc}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal Server Error",
-            "detail": "An unexpected error occurred. Please try again later."
-        }
-    )
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
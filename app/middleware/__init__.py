@@ -0,0 +1,12 @@
+"""
+Middleware package.
+Exposes all middleware for easy importing.
+"""
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.cors import CORSMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.tenant import TenantMiddleware
+from app.middleware.tracing import TracingMiddleware
+
+__all__ = ["CompressionMiddleware", "CORSMiddleware", "MetricsMiddleware", "ProfilingMiddleware", "TenantMiddleware", "TracingMiddleware"]
@@ -0,0 +1,189 @@
+"""
+Response compression middleware.
+Pure ASGI gzip/brotli compression with a size threshold and content-type allowlist.
+"""
+import zlib
+from typing import Iterable, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Never compressed: SSE must flush each event, and these are already compressed
+NEVER_COMPRESS = ("text/event-stream", "application/pdf", "image/", "video/", "audio/")
+
+
+def parse_accept_encoding(header: str) -> List[str]:
+    """Return accepted encodings, dropping any with q=0."""
+    encodings = []
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if name:
+            encodings.append(name.strip().lower())
+    return encodings
+
+
+class _Compressor:
+    """Streaming compressor for a single response."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress a chunk; `flush` makes it decodable by the client immediately."""
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + self._br.flush() if flush else out
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Compress eligible responses with brotli or gzip.
+
+    A response is compressed only if the client accepts an encoding, it is not
+    already encoded, its content type is on the allowlist, and (when the size is
+    known) it is at least `minimum_size` bytes. Streaming bodies are compressed
+    chunk by chunk with a sync flush so clients see each chunk without waiting
+    for the end of the response.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        content_types: Iterable[str] = ("application/json", "text/plain", "text/html"),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        enable_brotli: bool = True,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(ct.lower() for ct in content_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.enable_brotli = enable_brotli and brotli is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accepted = parse_accept_encoding(value.decode("latin-1"))
+                if self.enable_brotli and "br" in accepted:
+                    return "br"
+                if "gzip" in accepted:
+                    return "gzip"
+                return None
+        return None
+
+    def is_compressible(self, content_type: str) -> bool:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        if media_type.startswith(NEVER_COMPRESS):
+            return False
+        return media_type in self.content_types
+
+
+class _CompressionResponder:
+    """Per-response send wrapper that decides on and applies compression."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk decides the strategy
+            self.start_message = message
+            headers = MutableHeaders(raw=message["headers"])
+            if "content-encoding" in headers or not self.middleware.is_compressible(
+                headers.get("content-type", "")
+            ):
+                self.passthrough = True
+                await self._send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            content_length = headers.get("content-length")
+            if content_length is not None and int(content_length) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Small single-chunk body - not worth compressing
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                # The compressed bytes differ, so the validator is no longer strong
+                headers["ETag"] = f"W/{etag}"
+
+            if not more_body:
+                compressed = self.compressor.compress(body, flush=False) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming: length is unknown once compressed
+            del headers["Content-Length"]
+            await self._send(self.start_message)
+
+        if more_body:
+            chunk = self.compressor.compress(body, flush=True)
+            if chunk:
+                await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            tail = self.compressor.compress(body, flush=False) + self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": tail})
@@ -0,0 +1,184 @@
+"""
+CORS and error-handling middleware.
+Pure ASGI replacement for Starlette's CORSMiddleware plus the CORS-aware
+exception handlers: origins live in a frozenset, every header list is built
+once per allowed origin, and unhandled errors become a JSON 500 that still
+carries CORS headers.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+Headers = List[Tuple[bytes, bytes]]
+
+ALLOWED_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+# Same body the app's 500 handler used to return
+ERROR_BODY = (
+    b'{"error":"Internal Server Error",'
+    b'"detail":"An unexpected error occurred. Please try again later."}'
+)
+
+
+class AllowedOrigins:
+    """
+    Origin allow-list: exact origins in a frozenset, or any origin when "*" is listed.
+
+    Shared by CORSMiddleware and the WebSocket handshake check, which browsers
+    don't subject to CORS.
+    """
+
+    def __init__(self, origins: Iterable[str]):
+        origins = frozenset(origins)
+        self.allow_any = "*" in origins
+        self.origins = frozenset(origin.encode("latin-1") for origin in origins - {"*"})
+
+    def __contains__(self, origin: bytes) -> bool:
+        return self.allow_any or origin in self.origins
+
+
+class CORSMiddleware:
+    """
+    Credentialed CORS for a fixed origin list, with preflight caching.
+
+    Matches the previous CORSMiddleware configuration (credentials allowed, all
+    methods, any requested headers, Content-Disposition exposed). Preflights are
+    answered here without reaching the app, with Access-Control-Max-Age so the
+    browser skips them for later requests. "Vary: Origin" is sent on every
+    response, since public Cache-Control is used on some endpoints and a shared
+    cache must not reuse one origin's headers for another.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str],
+        expose_headers: Iterable[str] = (),
+        max_age: int = 600,
+    ):
+        self.app = app
+        allowed = AllowedOrigins(allow_origins)
+        self.allow_any_origin = allowed.allow_any
+        self.allow_origins = allowed.origins
+        self._expose = ", ".join(expose_headers).encode("latin-1")
+        self._max_age = str(max_age).encode()
+        self._simple: Dict[bytes, Headers] = {origin: self._simple_headers(origin) for origin in self.allow_origins}
+        self._preflight: Dict[bytes, Headers] = {
+            origin: self._preflight_headers(origin) for origin in self.allow_origins
+        }
+
+    # ==================== Precomputed Headers ====================
+
+    def _simple_headers(self, origin: bytes) -> Headers:
+        headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+        if self._expose:
+            headers.append((b"access-control-expose-headers", self._expose))
+        return headers
+
+    def _preflight_headers(self, origin: bytes) -> Headers:
+        return [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", ALLOWED_METHODS),
+            (b"access-control-max-age", self._max_age),
+            (b"vary", b"Origin"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", b"2"),
+        ]
+
+    def _headers_for(self, origin: Optional[bytes], table: Dict[bytes, Headers], build) -> Optional[Headers]:
+        if origin is None:
+            return None
+        headers = table.get(origin)
+        if headers is None and self.allow_any_origin:
+            headers = build(origin)  # Not cached: the set of origins is unbounded
+        return headers
+
+    # ==================== ASGI ====================
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if scope["method"] == "OPTIONS" and origin is not None and request_method is not None:
+            await self._preflight_response(origin, request_headers, send)
+            return
+
+        cors_headers = self._headers_for(origin, self._simple, self._simple_headers)
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                headers = message["headers"] = list(message.get("headers", ()))
+                if cors_headers is not None:
+                    headers.extend(cors_headers)
+                _add_vary_origin(headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if response_started:
+                raise
+            logger.exception(f"Unhandled error in {scope['method']} {scope['path']}")
+            await send_wrapper({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(ERROR_BODY)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": ERROR_BODY})
+
+    async def _preflight_response(self, origin: bytes, request_headers: Optional[bytes], send: Send) -> None:
+        headers = self._headers_for(origin, self._preflight, self._preflight_headers)
+        if headers is None:
+            body = b"Disallowed CORS origin"
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"vary", b"Origin"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        if request_headers:
+            # Any header is allowed, so echo what the browser asked for
+            headers = headers + [(b"access-control-allow-headers", request_headers)]
+        await send({"type": "http.response.start", "status": 200, "headers": list(headers)})
+        await send({"type": "http.response.body", "body": b"OK"})
+
+
+def _add_vary_origin(headers: Headers) -> None:
+    """Add Origin to an existing Vary header, or add one."""
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"origin" not in value.lower():
+                headers[i] = (name, value + b", Origin")
+            return
+    headers.append((b"vary", b"Origin"))
@@ -0,0 +1,48 @@
+"""
+Request metrics middleware.
+Pure ASGI middleware recording latency per route template and status.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import request_stats
+
+
+class MetricsMiddleware:
+    """
+    Record request latency and in-flight count.
+
+    Routes are labelled by their template (e.g. `/api/chat/`) rather than the raw
+    path, so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        request_stats.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stats.in_flight -= 1
+            route = scope.get("route")
+            request_stats.observe(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code,
+                time.perf_counter() - started,
+            )
@@ -0,0 +1,115 @@
+"""
+Sampling profiler middleware.
+Profiles a fraction of requests, or any request carrying a valid signed header.
+Only installed when PROFILING_ENABLED is set, so it costs nothing when off.
+"""
+import cProfile
+import logging
+import marshal
+import random
+import threading
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.profiling import ProfileRecord, ProfileStore, verify_profile_request
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # pragma: no cover - optional dependency
+    PyinstrumentProfiler = None
+
+PROFILE_HEADER = b"x-profile-request"
+
+
+class ProfilingMiddleware:
+    """
+    Capture a profile for sampled requests and store it in a ring buffer.
+
+    pyinstrument (when installed) follows the request's own coroutine across
+    awaits. cProfile profiles the whole thread, so it also sees other requests
+    running concurrently; to keep profiles readable only one cProfile capture
+    runs at a time and overlapping sampled requests are skipped.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore, sample_rate: float = 0.0, profiler: str = "auto"):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        if profiler == "auto":
+            profiler = "pyinstrument" if PyinstrumentProfiler is not None else "cprofile"
+        if profiler == "pyinstrument" and PyinstrumentProfiler is None:
+            logger.warning("pyinstrument is not installed, falling back to cProfile")
+            profiler = "cprofile"
+        self.profiler = profiler
+        self._cprofile_lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if self.profiler == "pyinstrument":
+            await self._profile_pyinstrument(scope, receive, send)
+            return
+
+        if not self._cprofile_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile_cprofile(scope, receive, send)
+        finally:
+            self._cprofile_lock.release()
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return verify_profile_request(value.decode("latin-1"), scope["path"])
+        return False
+
+    async def _profile_cprofile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = cProfile.Profile()
+        status = {"code": 500}
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, self._capture_status(send, status))
+        finally:
+            profiler.disable()
+            profiler.create_stats()
+            self._store(scope, status["code"], started, "cprofile", marshal.dumps(profiler.stats))
+
+    async def _profile_pyinstrument(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = PyinstrumentProfiler(async_mode="enabled")
+        status = {"code": 500}
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, self._capture_status(send, status))
+        finally:
+            profiler.stop()
+            self._store(scope, status["code"], started, "pyinstrument", profiler.output_html().encode())
+
+    @staticmethod
+    def _capture_status(send: Send, status: dict) -> Send:
+        async def wrapped(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+        return wrapped
+
+    def _store(self, scope: Scope, status: int, started: float, profiler: str, data: bytes) -> None:
+        record = ProfileRecord(
+            method=scope["method"],
+            path=scope["path"],
+            status=status,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            profiler=profiler,
+            data=data,
+        )
+        self.store.add(record)
+        logger.info(f"Captured {profiler} profile {record.id} for {record.method} {record.path}")
@@ -0,0 +1,47 @@
+"""
+Tenant resolution middleware.
+Pure ASGI middleware that picks the tenant for a request from a /t/<tenant> path
+prefix or the Host header, before routing.
+"""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.tenants import TenantRegistry
+
+TENANT_PREFIX = "/t/"
+
+
+class TenantMiddleware:
+    """
+    Store the tenant name in scope["tenant"].
+
+    A /t/<tenant>/... prefix wins and is stripped from the path, so the same
+    routes serve every tenant. Otherwise the Host header is looked up in the
+    registry's host map. Requests that resolve to nothing use the default tenant.
+    """
+
+    def __init__(self, app: ASGIApp, registry: TenantRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith(TENANT_PREFIX):
+            tenant, _, rest = path[len(TENANT_PREFIX):].partition("/")
+            prefix = f"{TENANT_PREFIX}{tenant}"
+            # In place, not a copy: outer middleware read scope["route"] from this dict after routing
+            scope["path"] = f"/{rest}"
+            scope["raw_path"] = scope.get("raw_path", b"")[len(prefix):] or b"/"
+            scope["tenant"] = tenant
+        else:
+            for name, value in scope["headers"]:
+                if name == b"host":
+                    tenant = self.registry.resolve_host(value.decode("latin-1"))
+                    if tenant is not None:
+                        scope["tenant"] = tenant
+                    break
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,39 @@
+"""
+Request tracing middleware.
+Pure ASGI middleware that opens the root server span for each HTTP request.
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.tracing import start_server_span
+
+
+class TracingMiddleware:
+    """
+    Wrap every HTTP request in a server span.
+
+    The span is renamed to the matched route template once routing has run, and
+    records the response status. Child spans created while the request is handled
+    (validation, chat stages, DB queries) attach to it automatically.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with start_server_span(scope["method"], scope["path"], scope["headers"]) as server_span:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    server_span.update_name(f"{scope['method']} {route.path}")
+                    server_span.set_attribute("http.route", route.path)
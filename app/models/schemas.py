@@ -2,13 +2,19 @@
 Pydantic models for request/response schemas.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Annotated, Dict, Optional, List
+from datetime import date, datetime
 from enum import Enum
 
+from app.config.settings import settings
+
 
 # ==================== Chat Models ====================
 
+# chat_sessions.session_id is String(36): room for a UUID, nothing longer
+SESSION_ID_MAX_LENGTH = 36
+
+
 class ChatMessage(BaseModel):
     """Single chat message."""
     role: str = Field(..., description="Message role: 'user' or 'assistant'")
@@ -19,7 +25,9 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     message: str = Field(..., min_length=1, max_length=2000, description="User's question")
-    session_id: Optional[str] = Field(None, description="Session ID for conversation history")
+    session_id: Optional[str] = Field(
+        None, max_length=SESSION_ID_MAX_LENGTH, description="Session ID for conversation history"
+    )
     conversation_history: Optional[List[ChatMessage]] = Field(
         default=[], 
         description="Previous messages in conversation"
@@ -31,7 +39,41 @@ class ChatResponse(BaseModel):
     response: str = Field(..., description="AI assistant's response")
     session_id: str = Field(..., description="Session ID for tracking conversation")
     timestamp: datetime = Field(default_factory=datetime.now)
-    tokens_used: Optional[int] = Field(None, description="Number of tokens used in response")
+    tokens_used: Optional[int] = Field(None, description="Total tokens (prompt + completion); 0 when served from cache")
+    prompt_tokens: Optional[int] = Field(None, description="Tokens sent to the LLM")
+    completion_tokens: Optional[int] = Field(None, description="Tokens generated by the LLM")
+
+
+class BatchChatRequest(BaseModel):
+    """Request model for the batch chat endpoint."""
+    questions: List[Annotated[str, Field(min_length=1, max_length=2000)]] = Field(
+        ..., min_length=1, max_length=settings.chat_batch_max_questions,
+        description="Standalone questions (answered without conversation history)"
+    )
+    session_id: Optional[str] = Field(
+        None, max_length=SESSION_ID_MAX_LENGTH, description="Session charged for the tokens used"
+    )
+
+
+class BatchAnswer(BaseModel):
+    """Answer to one question of a batch."""
+    question: str
+    response: str = Field(..., description="AI assistant's response (fallback text if success is false)")
+    success: bool
+    cached: bool = Field(False, description="Served from the response cache")
+    faq: bool = Field(False, description="Answered from the FAQ fast path")
+    error: Optional[str] = None
+
+
+class BatchChatResponse(BaseModel):
+    """Response model for the batch chat endpoint."""
+    answers: List[BatchAnswer] = Field(..., description="One answer per question, in request order")
+    session_id: str
+    timestamp: datetime = Field(default_factory=datetime.now)
+    upstream_calls: int = Field(..., description="LLM calls made for the whole batch")
+    tokens_used: int = Field(..., description="Total tokens across all upstream calls")
+    prompt_tokens: int
+    completion_tokens: int
 
 
 # ==================== Analytics Models ====================
@@ -40,7 +82,7 @@ class VisitorCreate(BaseModel):
     """Model for recording a visitor."""
     ip_hash: Optional[str] = Field(None, description="Hashed IP address for privacy")
     user_agent: Optional[str] = Field(None, description="Browser user agent")
-    page_visited: str = Field(..., description="Page path visited")
+    page_visited: str = Field(..., max_length=255, description="Page path visited")
 
 
 class VisitorStats(BaseModel):
@@ -50,6 +92,67 @@ class VisitorStats(BaseModel):
     recent_visits: int = Field(..., description="Visits in last 24 hours")
 
 
+class RecentVisit(BaseModel):
+    """Single entry in the recent visits list."""
+    page: str = Field(..., description="Page path visited")
+    date: datetime = Field(..., description="Visit timestamp")
+    user_agent: Optional[str] = Field(None, description="Truncated browser user agent")
+    browser: Optional[str] = Field(None, description="Parsed browser (None until enriched)")
+    os: Optional[str] = Field(None, description="Parsed operating system")
+    device: Optional[str] = Field(None, description="desktop, mobile, tablet or bot")
+
+
+class RecentVisits(BaseModel):
+    """Model for the recent visits list."""
+    visits: List[RecentVisit]
+
+
+class BreakdownDimension(str, Enum):
+    """Parsed user-agent columns the traffic breakdown can group by."""
+    BROWSER = "browser"
+    OS = "os"
+    DEVICE = "device"
+
+
+class BreakdownEntry(BaseModel):
+    """Visit count for one browser, OS or device class."""
+    value: str
+    visits: int
+
+
+class TrafficBreakdown(BaseModel):
+    """Model for visits grouped by a parsed user-agent field."""
+    dimension: BreakdownDimension
+    entries: List[BreakdownEntry]
+    unparsed: int = Field(..., description="Visits without parsed user-agent fields yet")
+
+
+class DownloadEvent(BaseModel):
+    """Model for recording a resume download (sent by the download button)."""
+    action: str = Field("resume_download", max_length=64, description="Download kind")
+    timestamp: Optional[datetime] = Field(None, description="Client time; the server's clock is stored")
+    file: Optional[str] = Field(None, max_length=255, description="Downloaded file name")
+
+
+class VisitorEvent(BaseModel):
+    """Model for recording a visitor action."""
+    event: str = Field(..., max_length=64, description="Event name, e.g. contact_click")
+    subject: Optional[str] = Field(None, max_length=255, description="What the event was about (link, project, page)")
+    timestamp: Optional[datetime] = Field(None, description="Client time; the server's clock is stored")
+
+
+class DailyEventCounts(BaseModel):
+    """Event totals for one day."""
+    date: date
+    counts: Dict[str, int] = Field(..., description="Event name -> count")
+
+
+class EventCounts(BaseModel):
+    """Model for per-day event totals."""
+    days: List[DailyEventCounts]
+    totals: Dict[str, int] = Field(..., description="Event name -> count across the window")
+
+
 # ==================== Health Check Models ====================
 
 class HealthStatus(str, Enum):
@@ -59,6 +162,13 @@ class HealthStatus(str, Enum):
     UNHEALTHY = "unhealthy"
 
 
+class DependencyHealth(BaseModel):
+    """Result of probing one dependency."""
+    healthy: bool
+    latency_ms: Optional[float] = Field(None, description="Probe round-trip time")
+    detail: Optional[str] = Field(None, description="Error or state when not healthy")
+
+
 class HealthCheck(BaseModel):
     """Health check response model."""
     status: HealthStatus
@@ -66,6 +176,9 @@ class HealthCheck(BaseModel):
     database: bool = Field(..., description="Database connection status")
     ai_service: bool = Field(..., description="AI service status")
     version: str = Field(..., description="API version")
+    checks: Dict[str, DependencyHealth] = Field(default_factory=dict, description="Per-dependency probe results")
+    queues: Dict[str, int] = Field(default_factory=dict, description="Current depth of background queues")
+    upstream: Optional[Dict] = Field(None, description="LLM circuit breaker and cache state")
 
 
 # ==================== Error Models ====================
@@ -0,0 +1,63 @@
+"""
+High-performance response classes: the app-wide JSON default and pre-rendered responses.
+"""
+import logging
+from typing import Any, List, Tuple
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_use_orjson = settings.json_backend == "orjson" and orjson is not None
+if settings.json_backend == "orjson" and orjson is None:
+    logger.warning("orjson is not installed, falling back to the standard json module")
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not know natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that serializes without intermediate copies.
+
+    Pydantic models are written straight to bytes by pydantic-core, skipping the
+    model -> dict -> jsonable_encoder -> json.dumps path FastAPI uses for
+    `response_model`. Plain dicts and lists go through orjson when available.
+    Endpoints that want the zero-copy path should return
+    `FastJSONResponse(model)` instead of the bare model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if _use_orjson:
+            return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+
+class PreparedResponse(Response):
+    """
+    Response built from an already-rendered body and header list.
+
+    Skips Response.__init__ (content-type and content-length rendering) for
+    bodies that are served over and over unchanged.
+    """
+
+    def __init__(self, status_code: int, body: bytes, raw_headers: List[Tuple[bytes, bytes]]):
+        self.status_code = status_code
+        self.body = body
+        self.background = None
+        # Copied because middleware edits header lists in place
+        self.raw_headers = list(raw_headers)
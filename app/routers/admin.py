@@ -0,0 +1,71 @@
+"""
+Admin router for operational tooling (request profiles).
+All endpoints require the X-Admin-Token header to match ADMIN_TOKEN.
+"""
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+
+from app.config.settings import settings
+from app.services.profiling import profile_store
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], include_in_schema=False)
+
+
+async def require_admin(x_admin_token: str = Header(default="")):
+    """Dependency rejecting requests without a valid admin token."""
+    if not settings.admin_token:
+        # Admin API is off unless a token is configured
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    List captured request profiles, newest first.
+
+    Returns:
+        Profile summaries (ID, route, status, duration, size)
+    """
+    return {
+        "profiling_enabled": settings.profiling_enabled,
+        "sample_rate": settings.profiling_sample_rate,
+        "profiles": profile_store.list()
+    }
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str, format: str = "raw"):
+    """
+    Download a captured profile.
+
+    Args:
+        profile_id: Profile ID from the list endpoint
+        format: "raw" for the profile file (.prof for cProfile, .html for pyinstrument)
+            or "text" for a cProfile summary sorted by cumulative time
+
+    Returns:
+        Profile file or text summary
+    """
+    record = profile_store.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found (it may have been evicted)")
+
+    if format == "text":
+        try:
+            return PlainTextResponse(record.as_text())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if record.profiler == "pyinstrument":
+        return HTMLResponse(record.data)
+
+    # Load with: python -c "import pstats; pstats.Stats('profile.prof').sort_stats('cumulative').print_stats(30)"
+    return Response(
+        content=record.data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename=profile-{record.id}.prof"}
+    )
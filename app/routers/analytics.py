@@ -1,16 +1,37 @@
 """
 Analytics router for visitor tracking.
 """
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Dict
+import asyncio
 import hashlib
 
-from app.config.database import get_db, Visitor
-from app.models.schemas import VisitorCreate, VisitorStats
+from app.config.database import get_db, Page, UserAgent, Visitor
+from app.config.settings import settings
+from app.models.schemas import (
+    BreakdownDimension,
+    BreakdownEntry,
+    DailyEventCounts,
+    DownloadEvent,
+    EventCounts,
+    RecentVisit,
+    RecentVisits,
+    TrafficBreakdown,
+    VisitorCreate,
+    VisitorEvent,
+    VisitorStats,
+)
+from app.responses import FastJSONResponse
+from app.services.events import EventType, event_store
+from app.services.interning import page_ids, user_agent_ids
+from app.services.tracing import TracedRoute
+from app.services.user_agents import ua_enricher
+from app.services.visit_dedup import visit_deduplicator
 
-router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+router = APIRouter(prefix="/api/analytics", tags=["analytics"], route_class=TracedRoute)
 
 
 def hash_ip(ip: str) -> str:
@@ -18,6 +39,10 @@ def hash_ip(ip: str) -> str:
     return hashlib.sha256(ip.encode()).hexdigest()
 
 
+def _client_ip_hash(request: Request):
+    return hash_ip(request.client.host) if request.client and request.client.host else None
+
+
 @router.post("/visit")
 async def record_visit(
     visitor_data: VisitorCreate,
@@ -26,6 +51,9 @@ async def record_visit(
 ):
     """
     Record a visitor page view.
+
+    Repeats (same Idempotency-Key, or same visitor and page within the dedup
+    bucket) are acknowledged without writing a row.
     
     Args:
         visitor_data: Visitor information
@@ -39,16 +67,41 @@ async def record_visit(
         # Get client IP and hash it for privacy
         client_ip = request.client.host
         ip_hash = hash_ip(client_ip) if client_ip else None
+
+        # Drop refreshes and retries in memory, before any database work
+        dedup_key = (
+            ip_hash or visitor_data.ip_hash,
+            visitor_data.page_visited,
+            request.headers.get("idempotency-key"),
+        )
+        if visit_deduplicator.is_duplicate(*dedup_key):
+            return {
+                "success": True,
+                "message": "Visit already recorded",
+                "deduplicated": True
+            }
         
+        # Strings are stored once in lookup tables; known ones resolve from memory
+        page_id, _ = page_ids.resolve(visitor_data.page_visited)
+        user_agent_id = None
+        if visitor_data.user_agent is not None:
+            user_agent_id, created = user_agent_ids.resolve(visitor_data.user_agent)
+            if created:
+                # Browser/OS/device columns are filled in the background
+                ua_enricher.enqueue(user_agent_id, visitor_data.user_agent)
+
         # Create visitor record
         visitor = Visitor(
             ip_hash=ip_hash or visitor_data.ip_hash,
-            user_agent=visitor_data.user_agent,
-            page_visited=visitor_data.page_visited
+            user_agent_id=user_agent_id,
+            page_id=page_id
         )
         
         db.add(visitor)
         db.commit()
+
+        # Only a stored visit makes its retries duplicates
+        visit_deduplicator.remember(*dedup_key)
         
         return {
             "success": True,
@@ -84,11 +137,11 @@ async def get_visitor_stats(db: Session = Depends(get_db)):
             Visitor.visit_date >= yesterday
         ).scalar()
         
-        return VisitorStats(
+        return FastJSONResponse(VisitorStats(
             total_visitors=total_visitors or 0,
             total_visits=total_visits or 0,
             recent_visits=recent_visits or 0
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(
@@ -97,7 +150,7 @@ async def get_visitor_stats(db: Session = Depends(get_db)):
         )
 
 
-@router.get("/recent")
+@router.get("/recent", response_model=RecentVisits)
 async def get_recent_visits(limit: int = 10, db: Session = Depends(get_db)):
     """
     Get recent visits (for admin dashboard - Phase 2).
@@ -110,23 +163,166 @@ async def get_recent_visits(limit: int = 10, db: Session = Depends(get_db)):
         List of recent visits
     """
     try:
-        visits = db.query(Visitor).order_by(
+        visits = db.query(
+            Visitor.visit_date, Page.path, UserAgent.user_agent, UserAgent.browser, UserAgent.os, UserAgent.device
+        ).join(
+            Page, Page.id == Visitor.page_id
+        ).outerjoin(
+            UserAgent, UserAgent.id == Visitor.user_agent_id
+        ).order_by(
             Visitor.visit_date.desc()
         ).limit(limit).all()
         
-        return {
-            "visits": [
-                {
-                    "page": visit.page_visited,
-                    "date": visit.visit_date.isoformat(),
-                    "user_agent": visit.user_agent[:50] if visit.user_agent else None  # Truncate for privacy
-                }
+        return FastJSONResponse(RecentVisits(
+            visits=[
+                RecentVisit(
+                    page=visit.path,
+                    date=visit.visit_date,
+                    user_agent=visit.user_agent[:50] if visit.user_agent else None,  # Truncate for privacy
+                    browser=visit.browser,
+                    os=visit.os,
+                    device=visit.device
+                )
                 for visit in visits
             ]
-        }
+        ))
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get recent visits: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/breakdown", response_model=TrafficBreakdown)
+async def get_traffic_breakdown(
+    by: BreakdownDimension = BreakdownDimension.BROWSER,
+    days: int = Query(30, ge=1, le=3650),
+    include_bots: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Get visits grouped by browser, OS or device class.
+
+    Visits are counted per user_agent_id (an indexed integer GROUP BY), then
+    the few resulting rows are joined to user_agents for the parsed column.
+    Visits sent without a user agent, or whose user agent is not parsed yet,
+    are reported as unparsed.
+
+    Args:
+        by: Column to group by
+        days: Number of days to include, counting today
+        include_bots: Count crawler and script traffic too
+        db: Database session
+
+    Returns:
+        Visit counts per value, largest first
+    """
+    try:
+        since = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+        per_agent = db.query(
+            Visitor.user_agent_id.label("user_agent_id"), func.count(Visitor.id).label("visits")
+        ).filter(
+            Visitor.visit_date >= since
+        ).group_by(Visitor.user_agent_id).subquery()
+
+        column = getattr(UserAgent, by.value)
+        visits = func.sum(per_agent.c.visits)
+        query = db.query(column, visits).select_from(per_agent).outerjoin(
+            UserAgent, UserAgent.id == per_agent.c.user_agent_id
+        )
+        if not include_bots:
+            query = query.filter(UserAgent.is_bot.isnot(True))
+        rows = query.group_by(column).order_by(visits.desc()).all()
+
+        entries = [BreakdownEntry(value=value, visits=int(count)) for value, count in rows if value is not None]
+        unparsed = sum(int(count) for value, count in rows if value is None)
+        return FastJSONResponse(TrafficBreakdown(
+            dimension=by,
+            entries=entries,
+            unparsed=unparsed
+        ))
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get traffic breakdown: {str(e)}"
+        )
+
+
+# ==================== Events ====================
+
+@router.post("/download")
+async def record_download(event: DownloadEvent, request: Request):
+    """
+    Record a resume download.
+
+    The event is queued for a batched insert, so this returns without touching
+    the database.
+
+    Args:
+        event: Download details from the client
+        request: FastAPI request object
+
+    Returns:
+        Success confirmation
+    """
+    if EventType.from_public_name(event.action) is not EventType.RESUME_DOWNLOAD:
+        raise HTTPException(status_code=422, detail=f"Unknown download action: {event.action}")
+
+    event_store.record(EventType.RESUME_DOWNLOAD, _client_ip_hash(request), event.file)
+    return {"success": True, "message": "Download recorded"}
+
+
+@router.post("/visitor")
+async def record_visitor_event(event: VisitorEvent, request: Request):
+    """
+    Record a visitor action (contact click, project click, ...).
+
+    Args:
+        event: Event name (an EventType, lower case) and optional subject
+        request: FastAPI request object
+
+    Returns:
+        Success confirmation
+    """
+    event_type = EventType.from_public_name(event.event)
+    if event_type is None:
+        known = ", ".join(member.public_name for member in EventType)
+        raise HTTPException(status_code=422, detail=f"Unknown event: {event.event} (expected one of {known})")
+
+    event_store.record(event_type, _client_ip_hash(request), event.subject)
+    return {"success": True, "message": "Event recorded"}
+
+
+@router.get("/events/daily", response_model=EventCounts)
+async def get_daily_event_counts(
+    days: int = Query(30, ge=1, le=settings.event_daily_counts_max_days)
+):
+    """
+    Get event totals per day, read from the daily counter table.
+
+    Args:
+        days: Number of days to include, counting today
+
+    Returns:
+        Per-day counts (days without events are omitted) and window totals
+    """
+    since = date.today() - timedelta(days=days - 1)
+    try:
+        per_day = await asyncio.to_thread(event_store.daily_counts, since)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get event counts: {str(e)}"
+        )
+
+    totals: Dict[str, int] = {}
+    for counts in per_day.values():
+        for name, count in counts.items():
+            totals[name] = totals.get(name, 0) + count
+
+    return FastJSONResponse(EventCounts(
+        days=[DailyEventCounts(date=day, counts=counts) for day, counts in per_day.items()],
+        totals=totals
+    ))
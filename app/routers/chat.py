@@ -1,22 +1,47 @@
 """
 Chat router for AI agent endpoints.
 """
-from fastapi import APIRouter, HTTPException, status
-from app.models.schemas import ChatRequest, ChatResponse, ErrorResponse
-from app.services.ai_agent import ai_agent
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from app.models.schemas import (
+    SESSION_ID_MAX_LENGTH,
+    BatchAnswer,
+    BatchChatRequest,
+    BatchChatResponse,
+    ChatRequest,
+    ChatResponse,
+    ErrorResponse,
+)
+from app.config.settings import settings
+from app.middleware.cors import AllowedOrigins
+from app.services.ai_agent import AIAgent, get_ai_agent
+from app.services.chat_socket import ChatSocketSession
+from app.services.tenants import TenantNotFound, provide_tenant_agent, tenant_registry
+from app.services.upstream import UpstreamError
+from app.services.lifecycle import lifecycle
+from app.services.tokens import TokenLimitExceeded, TokenUsage
+from app.services.static_responses import static_responses
+from app.services.transcripts import transcript_store
+from app.responses import FastJSONResponse
+from app.services.tracing import TracedRoute, span
+from contextlib import aclosing
+import json
+import time
 import uuid
+from typing import Optional
 from datetime import datetime
 
-router = APIRouter(prefix="/api/chat", tags=["chat"])
+router = APIRouter(prefix="/api/chat", tags=["chat"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, ai_agent: AIAgent = Depends(provide_tenant_agent)):
     """
     Chat with the AI agent about Howard's background and projects.
     
     Args:
         request: ChatRequest with user message and optional conversation history
+        ai_agent: AI agent of the request's tenant
         
     Returns:
         ChatResponse with AI-generated answer
@@ -26,24 +51,42 @@ async def chat(request: ChatRequest):
         session_id = request.session_id or str(uuid.uuid4())
         
         # Get AI response
+        started = time.perf_counter()
         result = await ai_agent.chat(
             message=request.message,
-            conversation_history=request.conversation_history
+            conversation_history=request.conversation_history,
+            session_id=session_id
+        )
+        transcript_store.record(
+            session_id=session_id,
+            question=request.message,
+            answer=result["response"] if result["success"] else None,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            prompt_tokens=result.get("prompt_tokens"),
+            completion_tokens=result.get("completion_tokens"),
+            cached=result.get("cached", False),
+            success=result["success"],
+            provider=ai_agent.provider.name,
         )
         
         if not result["success"]:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                status_code=result.get("status_code", status.HTTP_500_INTERNAL_SERVER_ERROR),
                 detail=f"AI service error: {result.get('error', 'Unknown error')}"
             )
         
-        return ChatResponse(
-            response=result["response"],
-            session_id=session_id,
-            timestamp=datetime.now(),
-            tokens_used=result.get("tokens_used")
-        )
+        with span("chat.response"):
+            return FastJSONResponse(ChatResponse(
+                response=result["response"],
+                session_id=session_id,
+                timestamp=datetime.now(),
+                tokens_used=result.get("tokens_used"),
+                prompt_tokens=result.get("prompt_tokens"),
+                completion_tokens=result.get("completion_tokens")
+            ))
         
+    except TokenLimitExceeded as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -53,14 +96,191 @@ async def chat(request: ChatRequest):
         )
 
 
+@router.post("/batch", response_model=BatchChatResponse)
+async def chat_batch(request: BatchChatRequest, ai_agent: AIAgent = Depends(provide_tenant_agent)):
+    """
+    Answer several standalone questions at once (FAQ prerendering, cache warm-up).
+    
+    Questions are packed into as few LLM calls as the token budgets allow and each
+    answer is cached, so later /api/chat/ requests for them are served from cache.
+    A question that fails gets success=false and the fallback text instead of
+    failing the whole batch.
+    
+    Args:
+        request: BatchChatRequest with the questions
+        ai_agent: AI agent of the request's tenant
+        
+    Returns:
+        BatchChatResponse with one answer per question
+    """
+    try:
+        session_id = request.session_id or str(uuid.uuid4())
+
+        started = time.perf_counter()
+        result = await ai_agent.chat_batch(request.questions, session_id=session_id)
+        latency_ms = (time.perf_counter() - started) * 1000
+        for question, answer in zip(request.questions, result["answers"]):
+            transcript_store.record(
+                session_id=session_id,
+                question=question,
+                answer=answer["response"] if answer["success"] else None,
+                latency_ms=latency_ms,
+                cached=answer["cached"],
+                success=answer["success"],
+                provider=ai_agent.provider.name,
+            )
+
+        return FastJSONResponse(BatchChatResponse(
+            answers=[
+                BatchAnswer(question=question, **answer)
+                for question, answer in zip(request.questions, result["answers"])
+            ],
+            session_id=session_id,
+            timestamp=datetime.now(),
+            upstream_calls=result["upstream_calls"],
+            tokens_used=result["tokens_used"],
+            prompt_tokens=result["prompt_tokens"],
+            completion_tokens=result["completion_tokens"]
+        ))
+
+    except TokenLimitExceeded as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process batch chat request: {str(e)}"
+        )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, ai_agent: AIAgent = Depends(provide_tenant_agent)):
+    """
+    Chat with the AI agent, streaming the answer as server-sent events.
+    
+    Emits `token` events with text chunks, then a final `done` event with the
+    session ID and token usage, or an `error` event if the AI service fails or a
+    token limit is hit.
+    
+    Args:
+        request: ChatRequest with user message and optional conversation history
+        ai_agent: AI agent of the request's tenant
+        
+    Returns:
+        text/event-stream response
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+
+    async def event_stream():
+        started = time.perf_counter()
+        answer = []
+        usage = TokenUsage()
+        success = False
+        with lifecycle.track_stream():
+            try:
+                async with aclosing(ai_agent.stream_chat(
+                    message=request.message,
+                    conversation_history=request.conversation_history,
+                    session_id=session_id,
+                    usage=usage
+                )) as chunks:
+                    async for chunk in chunks:
+                        answer.append(chunk)
+                        yield _sse("token", {"text": chunk})
+                        if lifecycle.should_end_stream():
+                            # Worker is shutting down: end cleanly so the client can retry elsewhere
+                            yield _sse("error", {"detail": "Server restarting, please retry", "status_code": 503})
+                            return
+                success = True
+            except TokenLimitExceeded as e:
+                yield _sse("error", {"detail": str(e), "status_code": e.status_code})
+                return
+            except UpstreamError as e:
+                yield _sse("error", {"detail": f"AI service error: {e}", "status_code": e.status_code})
+                return
+            finally:
+                # Also runs when the client disconnects mid-stream
+                text = "".join(answer)
+                transcript_store.record(
+                    session_id=session_id,
+                    question=request.message,
+                    answer=text or None,
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                    prompt_tokens=usage.prompt_tokens or None,
+                    completion_tokens=usage.completion_tokens or None,
+                    streamed=True,
+                    success=success,
+                    provider=ai_agent.provider.name,
+                )
+            yield _sse("done", {
+                "session_id": session_id,
+                "timestamp": datetime.now().isoformat(),
+                **usage.as_dict()
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering
+        }
+    )
+
+
+async def chat_ws(
+    websocket: WebSocket,
+    session_id: Optional[str] = Query(None, max_length=SESSION_ID_MAX_LENGTH)
+):
+    """
+    Chat over a WebSocket: one connection per visitor, tokens streamed as frames.
+    
+    The session and conversation history are kept for the life of the
+    connection, so frames only carry the new question. Sending a cancel frame
+    or disconnecting stops an in-flight answer. See ChatSocketSession for the
+    frame protocol.
+    
+    Args:
+        websocket: Client connection
+        session_id: Existing session to continue (a new one is created otherwise)
+    """
+    # Browsers don't apply CORS to WebSockets, so check the origin here
+    origin = websocket.headers.get("origin")
+    if origin is not None and origin.encode("latin-1") not in _ws_origins:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    tenant = websocket.scope.get("tenant")
+    try:
+        ai_agent = await tenant_registry.get(tenant) if tenant else get_ai_agent()
+    except TenantNotFound:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    await ChatSocketSession(websocket, ai_agent, session_id or str(uuid.uuid4())).run()
+
+
+# Same allow-list (and "*" handling) as the HTTP CORS middleware
+_ws_origins = AllowedOrigins(settings.cors_origins)
+
+if settings.chat_ws_enabled:
+    router.add_api_websocket_route("/ws", chat_ws)
+
+
+static_responses.register("chat_examples", lambda: {"examples": AIAgent.get_example_questions()})
+
+
 @router.get("/examples")
-async def get_example_questions():
+async def get_example_questions(request: Request):
     """
     Get example questions that recruiters can ask.
     
     Returns:
-        List of example questions
+        List of example questions (pre-serialized, ETag-validated)
     """
-    return {
-        "examples": ai_agent.get_example_questions()
-    }
\ No newline at end of file
+    return static_responses.respond("chat_examples", request)
\ No newline at end of file
@@ -5,15 +5,24 @@ from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import FileResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from app.config.settings import settings
+from app.services.static_responses import static_responses
+from app.services.tracing import TracedRoute
 import os
 from datetime import datetime
 import hashlib
 import base64
+import logging
 
-router = APIRouter(prefix="/api/resume", tags=["resume"])
+router = APIRouter(prefix="/api/resume", tags=["resume"], route_class=TracedRoute)
+logger = logging.getLogger(__name__)
 
 # Rate limiter: 3 downloads per hour per IP
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    enabled=settings.rate_limit_enabled,
+    storage_uri=settings.rate_limit_storage_uri,
+)
 
 # Path to resume PDF
 RESUME_PATH = "resumes/Howard_Ye_Resume.pdf"
@@ -84,7 +93,7 @@ async def download_resume(
         request.client.host.encode()
     ).hexdigest()[:16]
     
-    print(f"📥 Resume download - IP: {ip_hash}, UA: {user_agent[:50]}")
+    logger.info(f"Resume download - IP: {ip_hash}, UA: {user_agent[:50]}")
     
     # Return file
     return FileResponse(
@@ -100,18 +109,24 @@ async def download_resume(
     )
 
 
-@router.get("/preview")
-async def preview_resume():
-    """
-    Return resume info without downloading (for SEO/preview).
-    """
-    file_exists = os.path.exists(RESUME_PATH)
-
+def _resume_info() -> dict:
     return {
-        "available": file_exists,
+        "available": os.path.exists(RESUME_PATH),
         "filename": "Howard_Ye_Resume.pdf",
         "description": "Computer Engineering graduate student (MS) seeking DevOps, Full Stack, Cloud, and System Performance Engineering roles",
         "updated": "December 2025",
         "download_info": "Click 'Download Resume' button on the homepage to access",
         "contact": "hyedailyuse@gmail.com"
-    }
\ No newline at end of file
+    }
+
+
+# Rendered once: the PDF only changes with a deploy
+static_responses.register("resume_preview", _resume_info)
+
+
+@router.get("/preview")
+async def preview_resume(request: Request):
+    """
+    Return resume info without downloading (for SEO/preview).
+    """
+    return static_responses.respond("resume_preview", request)
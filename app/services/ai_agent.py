@@ -1,33 +1,85 @@
 """
-AI Agent service using Google Gemini API.
+AI Agent service backed by a pluggable LLM provider (Google Gemini by default).
 Provides conversational interface for recruiters to learn about Howard.
 """
-from typing import List, Dict, Optional
-import google.generativeai as genai
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import time
 from app.config.settings import settings
-from app.services.document_loader import document_loader
+from app.config.lazy import Lazy
+from app.services.chat_batch import build_batch_prompt, pack_questions, split_answers
+from app.services.document_loader import DocumentLoader, get_document_loader
+from app.services.faq_index import FAQIndex
+from app.services.llm_provider import LLMProvider, create_provider, estimate_usage
+from app.services.metrics import count_llm_tokens, observe_llm_call
+from app.services.tracing import record_span, span
+from app.services.response_cache import ResponseCache, normalize_question
+from app.services.singleflight import SingleFlight
+from app.services.tokens import SessionTokenBudgets, TokenLimitExceeded, TokenUsage, count_tokens_local
+from app.services.upstream import UpstreamClient, UpstreamError, CircuitOpenError
 from app.models.schemas import ChatMessage
 
+logger = logging.getLogger(__name__)
+
+EXAMPLE_QUESTIONS = (
+    "What is Howard's background and education?",
+    "Tell me about Howard's HPC simulation project",
+    "What experience does Howard have with cloud infrastructure?",
+    "What programming languages and technologies does Howard know?",
+    "What types of roles is Howard seeking?",
+    "When does Howard graduate and what is his availability?",
+    "What makes Howard's background unique?",
+    "Can you describe Howard's Smart Home Energy project?",
+)
+
+FALLBACK_RESPONSE = "I apologize, but I'm having trouble processing your question right now. Please try again or contact Howard directly via email or LinkedIn."
+
 
 class AIAgent:
     """AI agent for answering questions about Howard's background and projects."""
     
-    def __init__(self):
-        """Initialize AI agent with Gemini client."""
-        # Configure Gemini
-        genai.configure(api_key=settings.gemini_api_key)
-        
-        # Create model
-        self.model = genai.GenerativeModel(
-            model_name=settings.gemini_model,
-            generation_config={
-                "temperature": settings.temperature,
-                "max_output_tokens": settings.max_tokens,
-            }
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        documents: Optional[DocumentLoader] = None,
+        system_instruction: Optional[str] = None,
+        upstream: Optional[UpstreamClient] = None
+    ):
+        """
+        Initialize AI agent with an LLM provider.
+
+        Args:
+            provider: LLM backend, defaults to the one selected by settings.ai_provider
+            documents: Knowledge base, defaults to Howard's built-in documents
+            system_instruction: Prompt preamble, defaults to Howard's built from documents
+            upstream: Upstream client (and circuit breaker) shared with other agents
+        """
+        self.provider = provider or create_provider()
+
+        documents = documents or get_document_loader()
+        self.knowledge_base = documents.get_all_content()
+        self.faq = FAQIndex.from_documents(
+            documents.documents,
+            threshold=settings.faq_match_threshold,
+            min_matched_terms=settings.faq_min_matched_terms,
+        )
+        self.system_instruction = system_instruction or self._build_system_instruction()
+        # Part of every cache/coalescing key, so answers from an older corpus are never reused
+        self.corpus_version = hashlib.sha256(self.system_instruction.encode()).hexdigest()[:12]
+
+        self.upstream = upstream or UpstreamClient.from_settings(self.provider.name)
+        self.response_cache = ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            ttl=settings.response_cache_ttl_seconds,
+        )
+        self.inflight = SingleFlight()
+        self.token_budgets = SessionTokenBudgets(
+            budget=settings.session_token_budget,
+            idle_reset=settings.session_budget_idle_reset_seconds,
         )
-        
-        self.knowledge_base = document_loader.get_all_content()
-        self.system_instruction = self._build_system_instruction()
     
     def _build_system_instruction(self) -> str:
         """Build system instruction with knowledge base."""
@@ -63,7 +115,8 @@ Remember: Be helpful, accurate, and professional. You're representing Howard to
     async def chat(
         self, 
         message: str, 
-        conversation_history: Optional[List[ChatMessage]] = None
+        conversation_history: Optional[List[ChatMessage]] = None,
+        session_id: Optional[str] = None
     ) -> Dict[str, any]:
         """
         Process a chat message and return AI response.
@@ -71,64 +124,436 @@ Remember: Be helpful, accurate, and professional. You're representing Howard to
         Args:
             message: User's question
             conversation_history: Previous messages in the conversation
+            session_id: Session charged for the tokens used
             
         Returns:
             Dict with response text and metadata
+
+        Raises:
+            TokenLimitExceeded: The prompt is too large or the session budget is used up
         """
+        # Standalone questions can be answered from the FAQ or the cache
+        cache_key = self._cache_key(message, conversation_history)
+        if cache_key:
+            faq_answer = self._faq_answer(message)
+            if faq_answer is not None:
+                return {
+                    "response": faq_answer,
+                    **TokenUsage().as_dict(),
+                    "tokens_used": 0,
+                    "success": True,
+                    "cached": False,
+                    "faq": True
+                }
+            with span("chat.cache_lookup") as cache_span:
+                cached = self.response_cache.get(cache_key)
+                if cache_span is not None:
+                    cache_span.set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                return {
+                    "response": cached,
+                    **TokenUsage().as_dict(),
+                    "tokens_used": 0,
+                    "success": True,
+                    "cached": True
+                }
+
+        with span("chat.history", messages=len(conversation_history or [])):
+            history = self._build_history(conversation_history)
+        with span("chat.retrieval"):
+            knowledge_base = self._retrieve(message)
+        with span("chat.prompt") as prompt_span:
+            full_prompt = self._build_prompt(message, knowledge_base)
+            prompt_tokens = self._check_token_limits(full_prompt, history, session_id)
+            if prompt_span is not None:
+                prompt_span.set_attribute("prompt.tokens", prompt_tokens)
+
+        if not cache_key:
+            result = await self._complete(full_prompt, history, cache_key)
+        else:
+            # Identical standalone questions already in flight share one upstream call
+            result, shared = await self.inflight.do(
+                cache_key, lambda: self._complete(full_prompt, history, cache_key)
+            )
+            if shared:
+                return {**result, **TokenUsage().as_dict(), "tokens_used": 0, "coalesced": True}
+
+        if result["success"]:
+            self.token_budgets.add(session_id, result["tokens_used"])
+        return result
+
+    async def _complete(self, prompt: str, history: List[Dict[str, str]], cache_key: Optional[str]) -> Dict[str, any]:
+        """Call the provider through the upstream client and build the result dict."""
+        started = time.perf_counter()
         try:
-            # Build conversation history for Gemini
-            history = []
-            
-            if conversation_history:
-                for msg in conversation_history[-5:]:  # Keep last 5 messages
-                    history.append({
-                        "role": "user" if msg.role == "user" else "model",  # Gemini uses "model" not "assistant"
-                        "parts": [msg.content]
-                    })
-            
-            # Start chat session with history
-            chat = self.model.start_chat(history=history)
-            
-            # Create prompt with system instruction
-            full_prompt = f"{self.system_instruction}\n\nUser Question: {message}"
-            
-            # Send message
-            response = chat.send_message(full_prompt)
-            
-            # Extract response text
-            response_text = response.text
-            
-            # Gemini doesn't directly provide token counts in the same way
-            # We'll estimate based on response length
-            tokens_used = len(response_text.split()) * 1.3  # Rough estimate
-            
-            return {
-                "response": response_text,
-                "tokens_used": int(tokens_used),
-                "success": True
-            }
-            
-        except Exception as e:
+            with span("chat.upstream", provider=self.provider.name) as upstream_span:
+                result = await self.upstream.call(
+                    lambda: self.provider.chat(prompt, history)
+                )
+                if upstream_span is not None:
+                    upstream_span.set_attribute("response.chars", len(result.text))
+        except UpstreamError as e:
+            observe_llm_call(self.provider.name, type(e).__name__, time.perf_counter() - started)
+            logger.warning(f"{self.provider.name} call failed: {e}")
+            return self._degraded_result(cache_key, e)
+        observe_llm_call(self.provider.name, "success", time.perf_counter() - started)
+        
+        if cache_key:
+            self.response_cache.set(cache_key, result.text)
+        self._count_tokens(result.usage)
+        
+        return {
+            "response": result.text,
+            **result.usage.as_dict(),
+            "tokens_used": result.usage.total_tokens,
+            "success": True,
+            "cached": False
+        }
+
+    async def chat_batch(self, questions: List[str], session_id: Optional[str] = None) -> Dict[str, any]:
+        """
+        Answer several standalone questions with as few upstream calls as possible.
+
+        FAQ and cached questions are answered directly; the rest are packed into calls under
+        the prompt and completion token budgets and every answer is cached. Answers
+        the model leaves out of a packed reply are fetched individually.
+
+        Args:
+            questions: Standalone questions (no conversation history)
+            session_id: Session charged for the tokens used
+
+        Returns:
+            Dict with one result per question, the upstream call count and token usage
+
+        Raises:
+            TokenLimitExceeded: A packed prompt is too large or the session budget is used up
+        """
+        answers: List[Optional[Dict[str, any]]] = [None] * len(questions)
+        pending: Dict[str, List[int]] = {}  # cache key -> indexes of questions asking it
+        for i, question in enumerate(questions):
+            cache_key = self._cache_key(question, None)
+            faq_answer = self._faq_answer(question)
+            if faq_answer is not None:
+                answers[i] = {"response": faq_answer, "success": True, "cached": False, "faq": True}
+                continue
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                answers[i] = {"response": cached, "success": True, "cached": True}
+            else:
+                pending.setdefault(cache_key, []).append(i)
+
+        keys = list(pending)
+        texts = [questions[pending[key][0]] for key in keys]
+        context = self._retrieve("\n".join(texts))
+        groups = pack_questions(
+            texts,
+            base_tokens=count_tokens_local(build_batch_prompt(context, [])),
+            max_prompt_tokens=settings.max_prompt_tokens,
+            max_completion_tokens=settings.chat_batch_max_completion_tokens,
+            answer_tokens=settings.chat_batch_answer_tokens,
+        )
+        prompts = [build_batch_prompt(context, [texts[i] for i in group]) for group in groups]
+        estimated = sum(self._check_token_limits(prompt, [], None) for prompt in prompts)
+        self.token_budgets.check(session_id, estimated)
+
+        usage = TokenUsage()
+        with span("chat.batch", questions=len(questions), calls=len(groups)):
+            outcomes = await asyncio.gather(*(
+                self._complete_batch(prompt, [texts[i] for i in group], [keys[i] for i in group])
+                for prompt, group in zip(prompts, groups)
+            ))
+
+        upstream_calls = 0
+        for group, (results, group_usage, calls) in zip(groups, outcomes):
+            upstream_calls += calls
+            usage.prompt_tokens += group_usage.prompt_tokens
+            usage.completion_tokens += group_usage.completion_tokens
+            for i, result in zip(group, results):
+                for index in pending[keys[i]]:
+                    answers[index] = result
+
+        self.token_budgets.add(session_id, usage.total_tokens)
+        return {
+            "answers": answers,
+            "upstream_calls": upstream_calls,
+            **usage.as_dict(),
+            "tokens_used": usage.total_tokens
+        }
+
+    async def _complete_batch(
+        self, prompt: str, questions: List[str], cache_keys: List[str]
+    ) -> Tuple[List[Dict[str, any]], TokenUsage, int]:
+        """
+        Answer one packed group of questions.
+
+        Returns:
+            (one result per question, tokens used, upstream calls made)
+        """
+        if len(questions) == 1:
+            # Nothing to pack: the normal path adds coalescing with concurrent /api/chat/ callers
+            result = await self.chat(questions[0])
+            usage = TokenUsage(result["prompt_tokens"], result["completion_tokens"])
+            calls = 0 if result.get("cached") or result.get("coalesced") or result.get("faq") else 1
+            return [self._batch_answer(result)], usage, calls
+
+        started = time.perf_counter()
+        try:
+            with span("chat.upstream", provider=self.provider.name, batch=len(questions)):
+                packed = await self.upstream.call(lambda: self.provider.chat(prompt, []))
+        except UpstreamError as e:
+            observe_llm_call(self.provider.name, type(e).__name__, time.perf_counter() - started)
+            logger.warning(f"{self.provider.name} batch call failed: {e}")
+            return [self._batch_answer(self._degraded_result(key, e)) for key in cache_keys], TokenUsage(), 1
+        observe_llm_call(self.provider.name, "success", time.perf_counter() - started)
+        self._count_tokens(packed.usage)
+
+        usage = TokenUsage(packed.usage.prompt_tokens, packed.usage.completion_tokens)
+        calls = 1
+        results: List[Optional[Dict[str, any]]] = []
+        missing = []
+        for i, (text, cache_key) in enumerate(zip(split_answers(packed.text, len(questions)), cache_keys)):
+            if text is None:
+                missing.append(i)
+                results.append(None)
+                continue
+            self.response_cache.set(cache_key, text)
+            results.append({"response": text, "success": True, "cached": False})
+
+        if missing:
+            logger.warning(f"Batch reply left out {len(missing)} of {len(questions)} answer(s); asking separately")
+            for i, result in zip(missing, await asyncio.gather(*(self.chat(questions[i]) for i in missing))):
+                results[i] = self._batch_answer(result)
+                usage.prompt_tokens += result["prompt_tokens"]
+                usage.completion_tokens += result["completion_tokens"]
+                calls += 0 if result.get("cached") or result.get("coalesced") or result.get("faq") else 1
+        return results, usage, calls
+
+    @staticmethod
+    def _batch_answer(result: Dict[str, any]) -> Dict[str, any]:
+        """Reduce a chat() result to the per-question fields of a batch response."""
+        answer = {
+            "response": result["response"],
+            "success": result["success"],
+            "cached": result.get("cached", False),
+            "faq": result.get("faq", False),
+        }
+        if not result["success"]:
+            answer["error"] = result.get("error")
+        return answer
+
+    async def stream_chat(
+        self,
+        message: str,
+        conversation_history: Optional[List[ChatMessage]] = None,
+        session_id: Optional[str] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        """
+        Process a chat message and stream the AI response in chunks.
+
+        Args:
+            message: User's question
+            conversation_history: Previous messages in the conversation
+            session_id: Session charged for the tokens used
+            usage: Filled with the token usage once the stream completes
+
+        Yields:
+            Response text chunks
+
+        Raises:
+            TokenLimitExceeded: The prompt is too large or the session budget is used up
+            UpstreamError: The provider failed before producing a usable answer
+        """
+        cache_key = self._cache_key(message, conversation_history)
+        if cache_key:
+            cached = self._faq_answer(message)
+            if cached is None:
+                cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        history = self._build_history(conversation_history)
+        full_prompt = self._build_prompt(message, self._retrieve(message))
+        self._check_token_limits(full_prompt, history, session_id)
+        usage = usage if usage is not None else TokenUsage()
+
+        if not cache_key:
+            chunks, shared = self._stream_upstream(full_prompt, history, cache_key, usage), False
+        else:
+            # Identical standalone questions already streaming share one upstream stream
+            chunks, shared = self.inflight.stream(
+                cache_key, lambda: self._stream_upstream(full_prompt, history, cache_key, usage)
+            )
+
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+        if not shared:
+            self.token_budgets.add(session_id, usage.total_tokens)
+
+    async def _stream_upstream(
+        self, prompt: str, history: List[Dict[str, str]], cache_key: Optional[str], usage: TokenUsage
+    ) -> AsyncIterator[str]:
+        """Stream from the provider through the upstream client, with degraded fallbacks."""
+        # Spans can't stay current across yields, so the stream is recorded when it ends
+        started = time.perf_counter()
+        started_ns = time.time_ns()
+        try:
+            chunks = []
+            async for chunk in self.upstream.stream(
+                lambda: self.provider.stream(prompt, history, usage)
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except UpstreamError as e:
+            record_span("chat.upstream", started_ns, provider=self.provider.name,
+                        streamed=True, error=type(e).__name__)
+            observe_llm_call(self.provider.name, type(e).__name__, time.perf_counter() - started)
+            if chunks:
+                raise
+            logger.warning(f"{self.provider.name} stream failed: {e}")
+            result = self._degraded_result(cache_key, e)
+            if not result["success"]:
+                raise
+            yield result["response"]
+            return
+        record_span("chat.upstream", started_ns, provider=self.provider.name,
+                    streamed=True, chunks=len(chunks))
+        observe_llm_call(self.provider.name, "success", time.perf_counter() - started)
+
+        if cache_key:
+            self.response_cache.set(cache_key, "".join(chunks))
+        self._count_tokens(usage)
+
+    def _cache_key(self, message: str, conversation_history: Optional[List[ChatMessage]]) -> Optional[str]:
+        """Cache and coalescing key for standalone questions (None when there is history)."""
+        if conversation_history:
+            return None
+        return f"{self.corpus_version}:{normalize_question(message)}"
+
+    def _faq_answer(self, message: str) -> Optional[str]:
+        """Stored FAQ answer for a standalone question that matches an entry closely enough."""
+        if not settings.faq_fast_path_enabled:
+            return None
+        with span("chat.faq_lookup") as faq_span:
+            match = self.faq.match(message)
+            if faq_span is not None:
+                faq_span.set_attribute("faq.score", match[1] if match else 0.0)
+        return match[0] if match else None
+
+    def _build_history(self, conversation_history: Optional[List[ChatMessage]]) -> List[Dict[str, str]]:
+        """Convert recent conversation messages into provider-neutral history."""
+        if not conversation_history:
+            return []
+        return [
+            {"role": "user" if msg.role == "user" else "assistant", "content": msg.content}
+            for msg in conversation_history[-5:]  # Keep last 5 messages
+        ]
+
+    def _retrieve(self, message: str) -> str:
+        """
+        Get the knowledge base context for a question.
+
+        The whole corpus is small enough to send every time, so this returns the
+        system instruction built from DocumentLoader at startup.
+        """
+        return self.system_instruction
+
+    def _build_prompt(self, message: str, context: str) -> str:
+        """Create prompt with system instruction."""
+        return f"{context}\n\nUser Question: {message}"
+
+    def _check_token_limits(self, prompt: str, history: List[Dict[str, str]], session_id: Optional[str]) -> int:
+        """
+        Estimate prompt tokens locally and enforce the prompt size and session budget.
+
+        Returns:
+            Estimated prompt tokens
+        """
+        prompt_tokens = estimate_usage(prompt, history, "").prompt_tokens
+        if prompt_tokens > settings.max_prompt_tokens:
+            raise TokenLimitExceeded(
+                f"Prompt too large ({prompt_tokens} tokens, limit {settings.max_prompt_tokens}). "
+                "Shorten the question or start a new conversation.",
+                status_code=413,
+            )
+        self.token_budgets.check(session_id, prompt_tokens)
+        return prompt_tokens
+
+    def _count_tokens(self, usage: TokenUsage) -> None:
+        """Record a finished upstream call's tokens in metrics."""
+        count_llm_tokens(self.provider.name, "prompt", usage.prompt_tokens)
+        count_llm_tokens(self.provider.name, "completion", usage.completion_tokens)
+
+    def _degraded_result(self, cache_key: Optional[str], error: UpstreamError) -> Dict[str, any]:
+        """
+        Build a result for a failed upstream call.
+
+        Serves a cached answer (even if stale) when one exists. While the circuit is
+        open the static fallback is returned as a normal answer; otherwise the error
+        is surfaced with its status code.
+        """
+        if cache_key:
+            stale = self.response_cache.get(cache_key, allow_stale=True)
+            if stale is not None:
+                return {
+                    "response": stale,
+                    **TokenUsage().as_dict(),
+                    "tokens_used": 0,
+                    "success": True,
+                    "cached": True,
+                    "degraded": True
+                }
+
+        if isinstance(error, CircuitOpenError):
             return {
-                "response": "I apologize, but I'm having trouble processing your question right now. Please try again or contact Howard directly via email or LinkedIn.",
+                "response": FALLBACK_RESPONSE,
+                **TokenUsage().as_dict(),
                 "tokens_used": 0,
-                "success": False,
-                "error": str(e)
+                "success": True,
+                "cached": False,
+                "degraded": True
             }
+
+        return {
+            "response": FALLBACK_RESPONSE,
+            **TokenUsage().as_dict(),
+            "tokens_used": 0,
+            "success": False,
+            "error": str(error),
+            "status_code": error.status_code
+        }
+
+    def get_status(self) -> Dict[str, any]:
+        """Upstream circuit, cache, coalescing and FAQ state for health reporting."""
+        return {
+            **self.upstream.snapshot(),
+            "cache": self.response_cache.stats(),
+            "coalescing": self.inflight.snapshot(),
+            "faq": self.faq.snapshot()
+        }
     
-    def get_example_questions(self) -> List[str]:
+    @staticmethod
+    def get_example_questions() -> List[str]:
         """Get example questions for the UI."""
-        return [
-            "What is Howard's background and education?",
-            "Tell me about Howard's HPC simulation project",
-            "What experience does Howard have with cloud infrastructure?",
-            "What programming languages and technologies does Howard know?",
-            "What types of roles is Howard seeking?",
-            "When does Howard graduate and what is his availability?",
-            "What makes Howard's background unique?",
-            "Can you describe Howard's Smart Home Energy project?"
-        ]
+        return list(EXAMPLE_QUESTIONS)
+
+
+# Global AI agent instance (built on first use or by the startup warm-up)
+_ai_agent: Lazy[AIAgent] = Lazy("ai_agent", AIAgent)
+
+
+def get_ai_agent() -> AIAgent:
+    """Get the shared AI agent, building it on first use."""
+    return _ai_agent.get()
+
+
+def peek_ai_agent() -> Optional[AIAgent]:
+    """Get the AI agent only if it has already been built."""
+    return _ai_agent.peek()
 
 
-# Global AI agent instance
-ai_agent = AIAgent()
\ No newline at end of file
+async def provide_ai_agent() -> AIAgent:
+    """FastAPI dependency for the AI agent (async so it skips the threadpool)."""
+    return _ai_agent.get()
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Asynchronous batched writer.
+Request handlers enqueue items without awaiting I/O; a background task flushes
+them in batches on a worker thread so database latency never reaches a response.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Every writer created in this process (exported by the metrics collector)
+batch_writers: List["AsyncBatchWriter"] = []
+
+
+class AsyncBatchWriter:
+    """
+    Bounded in-memory queue flushed in batches by a background task.
+
+    submit() is a deque append and never blocks. When the queue is full the
+    oldest item is dropped and counted, so a slow or unavailable database costs
+    memory up to max_queue and nothing else. A failed batch is logged and
+    dropped rather than retried forever.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[Any]], None],
+        max_batch: int = 100,
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+    ):
+        """
+        Args:
+            name: Name used in logs, health and metrics
+            flush: Blocking callable that persists one batch (run in a thread)
+            max_batch: Items per flush call
+            flush_interval: Seconds between flushes when the queue is not full
+            max_queue: Items held before the oldest are dropped
+        """
+        self.name = name
+        self._flush = flush
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: deque = deque(maxlen=max_queue)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"submitted": 0, "written": 0, "dropped": 0, "failed_batches": 0}
+        batch_writers.append(self)
+
+    @property
+    def depth(self) -> int:
+        """Items waiting to be written."""
+        return len(self._queue)
+
+    def submit(self, item: Any) -> None:
+        """Queue an item for the next flush (safe to call from the event loop only)."""
+        if len(self._queue) == self._queue.maxlen:
+            self.stats["dropped"] += 1
+        self._queue.append(item)
+        self.stats["submitted"] += 1
+        if self._wakeup is not None and len(self._queue) >= self.max_batch:
+            self._wakeup.set()
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        """Start the background flush task (call from the running event loop)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=f"batch-writer-{self.name}")
+
+    async def stop(self) -> None:
+        """Stop the background task and flush everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue:
+            await self.flush_once()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._queue:
+                await self.flush_once()
+                if len(self._queue) < self.max_batch:
+                    break  # Leave a partial batch for the next interval
+
+    async def flush_once(self) -> int:
+        """Write up to max_batch queued items. Returns the number written."""
+        batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+        if not batch:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._flush, batch)
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            logger.error(f"Batch writer {self.name} dropped {len(batch)} item(s): {e}")
+            return 0
+
+        self.stats["written"] += len(batch)
+        logger.debug(f"Batch writer {self.name} wrote {len(batch)} item(s) in "
+                     f"{(time.perf_counter() - started) * 1000:.1f}ms")
+        return len(batch)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Queue depth and counters for health reporting."""
+        return {"depth": self.depth, **self.stats}
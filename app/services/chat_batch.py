@@ -0,0 +1,86 @@
+"""
+Packing several standalone questions into one LLM call.
+Groups questions under the prompt and completion token budgets, builds the
+combined prompt, and splits the combined answer back out per question.
+"""
+import re
+from typing import Dict, List, Optional
+
+from app.services.tokens import count_tokens_local
+
+# The model is asked to start every answer with this heading
+ANSWER_HEADING = "### Answer"
+_ANSWER_SPLIT = re.compile(rf"^{re.escape(ANSWER_HEADING)} (\d+)\s*:?\s*$", re.MULTILINE)
+
+# Tokens added per question by the "Question N:" framing
+_QUESTION_OVERHEAD_TOKENS = 4
+
+
+def pack_questions(
+    questions: List[str],
+    base_tokens: int,
+    max_prompt_tokens: int,
+    max_completion_tokens: int,
+    answer_tokens: int,
+) -> List[List[int]]:
+    """
+    Group questions into as few calls as the token budgets allow.
+
+    Greedy first-fit in the given order: a call takes questions until the prompt
+    would exceed max_prompt_tokens or the answers reserved at answer_tokens each
+    would exceed max_completion_tokens.
+
+    Args:
+        questions: Questions to answer
+        base_tokens: Tokens of the shared context sent with every call
+        max_prompt_tokens: Prompt token limit per call
+        max_completion_tokens: Completion tokens available per call
+        answer_tokens: Completion tokens reserved per answer
+
+    Returns:
+        Groups of indexes into questions, one group per upstream call
+    """
+    per_call = max(1, max_completion_tokens // answer_tokens)
+    groups: List[List[int]] = []
+    current: List[int] = []
+    used = base_tokens
+    for i, question in enumerate(questions):
+        cost = count_tokens_local(question) + _QUESTION_OVERHEAD_TOKENS
+        if current and (used + cost > max_prompt_tokens or len(current) >= per_call):
+            groups.append(current)
+            current, used = [], base_tokens
+        current.append(i)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def build_batch_prompt(context: str, questions: List[str]) -> str:
+    """Create one prompt asking for a separately headed answer to each question."""
+    numbered = "\n".join(f"Question {n}: {question}" for n, question in enumerate(questions, 1))
+    return (
+        f"{context}\n\n"
+        f"Answer each of the following {len(questions)} questions independently, as if "
+        f"each were asked on its own. Start each answer with a line containing only "
+        f"\"{ANSWER_HEADING} <number>\" and write nothing before the first answer.\n\n"
+        f"{numbered}"
+    )
+
+
+def split_answers(text: str, count: int) -> List[Optional[str]]:
+    """
+    Split a combined answer by its headings.
+
+    Returns:
+        One entry per question; None where the model left an answer out
+    """
+    answers: Dict[int, str] = {}
+    parts = _ANSWER_SPLIT.split(text)
+    # parts = [preamble, number, body, number, body, ...]
+    for number, body in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        body = body.strip()
+        if 0 <= index < count and body and index not in answers:
+            answers[index] = body
+    return [answers.get(i) for i in range(count)]
@@ -0,0 +1,154 @@
+"""
+WebSocket chat sessions.
+One connection carries a whole conversation: the session and its history live
+on the server, answers stream back as token frames, and an in-flight answer can
+be cancelled without closing the connection.
+"""
+import asyncio
+import json
+import time
+from contextlib import aclosing, suppress
+from typing import Any, Dict, List, Optional
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from app.models.schemas import ChatMessage
+from app.services.ai_agent import AIAgent
+from app.services.lifecycle import lifecycle
+from app.services.tokens import TokenLimitExceeded, TokenUsage
+from app.services.transcripts import transcript_store
+from app.services.upstream import UpstreamError
+
+# Messages kept per connection (the agent itself only uses the last few)
+MAX_HISTORY = 10
+MAX_MESSAGE_LENGTH = 2000
+
+# Close code sent when the worker is shutting down (RFC 6455 "service restart")
+CLOSE_SERVICE_RESTART = 1012
+
+
+class ChatSocketSession:
+    """
+    Protocol handler for one /api/chat/ws connection.
+
+    Client frames (JSON text):
+        {"type": "ask", "message": "...", "id": "optional client id"}
+        {"type": "cancel"}
+        {"type": "ping"}
+
+    Server frames:
+        {"type": "session", "session_id": ...} once, after the connection opens
+        {"type": "token", "text": ..., "id": ...} per chunk
+        {"type": "done", "id": ..., "prompt_tokens": ..., ...} when an answer completes
+        {"type": "cancelled", "id": ...} after a cancel
+        {"type": "error", "detail": ..., "status_code": ..., "id": ...}
+        {"type": "pong"}
+    """
+
+    def __init__(self, websocket: WebSocket, ai_agent: AIAgent, session_id: str):
+        self.websocket = websocket
+        self.ai_agent = ai_agent
+        self.session_id = session_id
+        self.history: List[ChatMessage] = []
+        self._generation: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects."""
+        await self._send({"type": "session", "session_id": self.session_id})
+        try:
+            while True:
+                try:
+                    frame = json.loads(await self.websocket.receive_text())
+                except json.JSONDecodeError:
+                    await self._error("Frames must be JSON", 400)
+                    continue
+                await self._handle(frame if isinstance(frame, dict) else {})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # The visitor left: stop generating an answer nobody will read
+            await self._cancel_generation()
+
+    async def _handle(self, frame: Dict[str, Any]) -> None:
+        kind = frame.get("type")
+        if kind == "ask":
+            message = frame.get("message")
+            if not isinstance(message, str) or not 1 <= len(message) <= MAX_MESSAGE_LENGTH:
+                await self._error(f"message must be 1-{MAX_MESSAGE_LENGTH} characters", 422, frame.get("id"))
+            elif self._generation is not None and not self._generation.done():
+                await self._error("An answer is already in progress; cancel it first", 409, frame.get("id"))
+            else:
+                self._generation = asyncio.create_task(self._answer(message, frame.get("id")))
+        elif kind == "cancel":
+            await self._cancel_generation()
+        elif kind == "ping":
+            await self._send({"type": "pong"})
+        else:
+            await self._error(f"Unknown frame type: {kind}", 400)
+
+    async def _cancel_generation(self) -> None:
+        if self._generation is None:
+            return
+        if not self._generation.done():
+            self._generation.cancel()
+        # Also collects a send failure from a generation that outlived the connection
+        with suppress(asyncio.CancelledError, Exception):
+            await self._generation
+
+    async def _answer(self, message: str, request_id: Any) -> None:
+        """Stream one answer; runs as a task so it can be cancelled."""
+        started = time.perf_counter()
+        answer: List[str] = []
+        usage = TokenUsage()
+        success = False
+        with lifecycle.track_stream():
+            try:
+                async with aclosing(self.ai_agent.stream_chat(
+                    message=message,
+                    conversation_history=self.history,
+                    session_id=self.session_id,
+                    usage=usage
+                )) as chunks:
+                    async for chunk in chunks:
+                        answer.append(chunk)
+                        await self._send({"type": "token", "text": chunk, "id": request_id})
+                        if lifecycle.should_end_stream():
+                            # Worker is shutting down: the client should reconnect elsewhere
+                            await self._error("Server restarting, please reconnect", 503, request_id)
+                            await self.websocket.close(code=CLOSE_SERVICE_RESTART)
+                            return
+                success = True
+            except asyncio.CancelledError:
+                with suppress(Exception):
+                    await self._send({"type": "cancelled", "id": request_id})
+                raise
+            except TokenLimitExceeded as e:
+                await self._error(str(e), e.status_code, request_id)
+                return
+            except UpstreamError as e:
+                await self._error(f"AI service error: {e}", e.status_code, request_id)
+                return
+            finally:
+                text = "".join(answer)
+                transcript_store.record(
+                    session_id=self.session_id,
+                    question=message,
+                    answer=text or None,
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                    prompt_tokens=usage.prompt_tokens or None,
+                    completion_tokens=usage.completion_tokens or None,
+                    streamed=True,
+                    success=success,
+                    provider=self.ai_agent.provider.name,
+                )
+
+        self.history.append(ChatMessage(role="user", content=message))
+        self.history.append(ChatMessage(role="assistant", content=text))
+        del self.history[:-MAX_HISTORY]
+        await self._send({"type": "done", "id": request_id, **usage.as_dict()})
+
+    async def _send(self, frame: Dict[str, Any]) -> None:
+        await self.websocket.send_text(json.dumps(frame))
+
+    async def _error(self, detail: str, status_code: int, request_id: Any = None) -> None:
+        await self._send({"type": "error", "detail": detail, "status_code": status_code, "id": request_id})
@@ -2,15 +2,38 @@
 Document loader service for loading resume and project documentation.
 This provides the knowledge base for the AI agent.
 """
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional
+from app.config.lazy import Lazy
+
+# File types read from a tenant's document directory
+DOCUMENT_SUFFIXES = (".md", ".txt")
 
 
 class DocumentLoader:
     """Loads and manages documents for AI agent knowledge base."""
     
-    def __init__(self):
-        """Initialize document loader with Howard's information."""
-        self.documents = self._load_documents()
+    def __init__(self, documents: Optional[List[Dict[str, str]]] = None):
+        """
+        Initialize document loader with Howard's information.
+
+        Args:
+            documents: Documents to serve instead of the built-in ones (other tenants)
+        """
+        self.documents = documents if documents is not None else self._load_documents()
+
+    @classmethod
+    def from_directory(cls, path: Path) -> "DocumentLoader":
+        """
+        Load every .md/.txt file in a directory, in name order.
+
+        The file stem is the document type, so a file named faq.md feeds the FAQ fast path.
+        """
+        return cls([
+            {"type": file.stem, "content": file.read_text(encoding="utf-8")}
+            for file in sorted(path.iterdir())
+            if file.suffix in DOCUMENT_SUFFIXES and file.is_file()
+        ])
     
     def _load_documents(self) -> List[Dict[str, str]]:
         """Load all documents for the knowledge base."""
@@ -205,5 +228,10 @@ A: Microservices architecture, containerization (Docker/Kubernetes), CI/CD autom
         return relevant_docs if relevant_docs else self.documents
 
 
-# Global document loader instance
-document_loader = DocumentLoader()
\ No newline at end of file
+# Global document loader instance (built on first use)
+_document_loader: Lazy[DocumentLoader] = Lazy("document_loader", DocumentLoader)
+
+
+def get_document_loader() -> DocumentLoader:
+    """Get the shared document loader."""
+    return _document_loader.get()
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Analytics event store.
+Records typed events (resume downloads, visitor actions) through an
+AsyncBatchWriter into one compact table, and keeps a per-day, per-type counter
+table up to date in the same transaction so daily totals are read by primary
+key instead of counted from the event rows.
+"""
+import logging
+from collections import Counter
+from datetime import date, datetime
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.config.database import AnalyticsEvent, EventDailyCount, get_engine
+from app.config.settings import settings
+from app.services.batching import AsyncBatchWriter
+
+logger = logging.getLogger(__name__)
+
+
+class EventType(IntEnum):
+    """
+    Stored event kinds. Values are persisted: append new members, never renumber.
+
+    The lower-case member name is the event's public name in the API.
+    """
+    RESUME_DOWNLOAD = 1
+    RESUME_VIEW = 2
+    CONTACT_CLICK = 3
+    PROJECT_CLICK = 4
+    CHAT_OPEN = 5
+
+    @property
+    def public_name(self) -> str:
+        return self.name.lower()
+
+    @classmethod
+    def from_public_name(cls, name: str) -> Optional["EventType"]:
+        return cls.__members__.get(name.upper())
+
+
+class EventStore:
+    """Batched analytics event persistence with daily counters."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.writer = AsyncBatchWriter(
+            "analytics_events",
+            self._write,
+            max_batch=settings.event_batch_size,
+            flush_interval=settings.event_flush_interval_seconds,
+            max_queue=settings.event_max_queue,
+        )
+
+    def record(self, event_type: EventType, ip_hash: Optional[str] = None, subject: Optional[str] = None) -> None:
+        """
+        Queue an event for persistence. Returns immediately.
+
+        Args:
+            event_type: Kind of event
+            ip_hash: Hashed client IP
+            subject: What the event was about (file name, page, link), truncated to 255 characters
+        """
+        if not self.enabled:
+            return
+        self.writer.submit({
+            "created_at": datetime.now(),
+            "event_type": int(event_type),
+            "ip_hash": ip_hash,
+            "subject": subject[:255] if subject else None,
+        })
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        if self.enabled:
+            self.writer.start()
+
+    async def stop(self) -> None:
+        """Flush queued events."""
+        await self.writer.stop()
+
+    # ==================== Persistence ====================
+
+    def _write(self, events: List[Dict]) -> None:
+        """Insert a batch of events and add them to the daily counters (runs in a thread)."""
+        try:
+            self._insert(events)
+        except IntegrityError:
+            # Another worker created one of these counter rows since we checked; retry once
+            self._insert(events)
+
+    @staticmethod
+    def _insert(events: List[Dict]) -> None:
+        counts: Counter[Tuple[date, int]] = Counter(
+            (event["created_at"].date(), event["event_type"]) for event in events
+        )
+
+        with get_engine().begin() as conn:
+            existing = {tuple(row) for row in conn.execute(
+                select(EventDailyCount.day, EventDailyCount.event_type)
+                .where(tuple_(EventDailyCount.day, EventDailyCount.event_type).in_(counts))
+            )}
+            new_counters = [
+                {"day": day, "event_type": event_type, "count": n}
+                for (day, event_type), n in counts.items() if (day, event_type) not in existing
+            ]
+            if new_counters:
+                conn.execute(insert(EventDailyCount), new_counters)
+            if existing:
+                conn.execute(
+                    update(EventDailyCount)
+                    .where(
+                        EventDailyCount.day == bindparam("d"),
+                        EventDailyCount.event_type == bindparam("t"),
+                    )
+                    .values(count=EventDailyCount.count + bindparam("n")),
+                    [{"d": day, "t": event_type, "n": counts[day, event_type]} for day, event_type in existing],
+                )
+            conn.execute(insert(AnalyticsEvent), events)
+
+    # ==================== Queries ====================
+
+    @staticmethod
+    def daily_counts(since: date) -> Dict[date, Dict[str, int]]:
+        """
+        Event totals per day from the counter table (a primary-key range scan).
+
+        Events still queued in a worker's batch writer are not included yet.
+
+        Args:
+            since: First day to include
+
+        Returns:
+            {day: {event name: count}} for days that have events, oldest first
+        """
+        with get_engine().connect() as conn:
+            rows = conn.execute(
+                select(EventDailyCount.day, EventDailyCount.event_type, EventDailyCount.count)
+                .where(EventDailyCount.day >= since)
+                .order_by(EventDailyCount.day)
+            )
+            days: Dict[date, Dict[str, int]] = {}
+            for day, event_type, count in rows:
+                try:
+                    name = EventType(event_type).public_name
+                except ValueError:
+                    name = str(event_type)  # Written by a newer deployment
+                days.setdefault(day, {})[name] = count
+        return days
+
+
+# Global event store instance
+event_store = EventStore(enabled=settings.events_enabled)
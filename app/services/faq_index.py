@@ -0,0 +1,141 @@
+"""
+FAQ fast path.
+Parses the Q/A pairs from the FAQ document at load time and answers questions
+that closely match one of them without calling the LLM.
+"""
+import math
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+_QA_PAIR = re.compile(r"^Q:\s*(.+?)\s*\nA:\s*(.+?)(?=\n\s*\n|\Z)", re.MULTILINE | re.DOTALL)
+_WORD = re.compile(r"[a-z0-9+#]+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Every question is about Howard, so his name and pronouns carry no signal
+_STOPWORDS = frozenset("""
+a an and any are as at be can could do does for from have has he his him how i in is it
+me of on or s tell the this that there to what where which who why will would with you your about
+howard howards hao ye
+""".split())
+_SUFFIXES = ("ations", "ation", "ating", "ated", "ates", "ate", "ions", "ion", "ing", "ies", "es", "ed", "s", "e", "y")
+
+# Words recruiters use for the same thing, mapped onto the FAQ's own wording
+_SYNONYMS = {
+    "when": "date",
+    "availability": "date",
+    "available": "date",
+    "willing": "open",
+    "job": "role",
+    "jobs": "role",
+    "position": "role",
+    "positions": "role",
+    "looking": "seeking",
+    "searching": "seeking",
+    "kind": "type",
+    "kinds": "type",
+}
+
+
+def _stem(word: str) -> str:
+    """Strip one common suffix so graduate/graduation or role/roles share a term."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[: -len(suffix)]
+    return word
+
+
+def _terms(text: str) -> FrozenSet[str]:
+    return frozenset(
+        _stem(_SYNONYMS.get(word, word)) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS
+    )
+
+
+def parse_faq(content: str) -> List[Tuple[str, str]]:
+    """Extract (question, answer) pairs written as "Q: ..." / "A: ..." blocks."""
+    return [
+        (question.strip(), _WHITESPACE.sub(" ", answer).strip())
+        for question, answer in _QA_PAIR.findall(content)
+    ]
+
+
+class FAQIndex:
+    """
+    Lexical matcher over the FAQ questions.
+
+    Terms are weighted by inverse document frequency across the FAQ, and a
+    match is scored mostly by how much of the incoming question the FAQ entry
+    covers: a question with content the entry doesn't mention ("experience with
+    cloud infrastructure" vs "experience level") scores low and goes to the LLM.
+    A match must also share at least `min_matched_terms` terms with the entry,
+    so one-word fragments ("graduate", "What roles?") are never answered from
+    the FAQ however well they score.
+    """
+
+    # Share of the score from covering the incoming question vs covering the entry
+    QUERY_COVERAGE_WEIGHT = 0.75
+
+    def __init__(self, pairs: List[Tuple[str, str]], threshold: float, min_matched_terms: int = 2):
+        """
+        Args:
+            pairs: (question, answer) pairs
+            threshold: Minimum score (0-1) for a stored answer to be returned
+            min_matched_terms: Terms a question must share with an entry (capped at the entry's own count)
+        """
+        self.threshold = threshold
+        self.min_matched_terms = min_matched_terms
+        self.entries = [(_terms(question), answer) for question, answer in pairs]
+        document_frequency: Dict[str, int] = {}
+        for terms, _ in self.entries:
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        n = len(self.entries)
+        self._idf = {term: math.log((n + 1) / (df + 1)) + 1 for term, df in document_frequency.items()}
+        # Terms the FAQ never uses are the most informative of all
+        self._unknown_idf = math.log(n + 1) + 1
+        self.stats = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def from_documents(
+        cls, documents: List[Dict[str, str]], threshold: float, min_matched_terms: int = 2
+    ) -> "FAQIndex":
+        """Build the index from every document of type "faq"."""
+        pairs = [pair for doc in documents if doc["type"] == "faq" for pair in parse_faq(doc["content"])]
+        return cls(pairs, threshold, min_matched_terms)
+
+    def _weight(self, terms: FrozenSet[str]) -> float:
+        return sum(self._idf.get(term, self._unknown_idf) for term in terms)
+
+    def match(self, question: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the stored answer for a question.
+
+        Returns:
+            (answer, score) for the best entry at or above the threshold, else None
+        """
+        query = _terms(question)
+        query_weight = self._weight(query)
+        best: Optional[Tuple[str, float]] = None
+        if query_weight:
+            for terms, answer in self.entries:
+                matched = query & terms
+                if len(matched) < min(self.min_matched_terms, len(terms)):
+                    continue
+                common = self._weight(matched)
+                score = (self.QUERY_COVERAGE_WEIGHT * common / query_weight
+                         + (1 - self.QUERY_COVERAGE_WEIGHT) * common / self._weight(terms))
+                if best is None or score > best[1]:
+                    best = (answer, score)
+
+        if best is None or best[1] < self.threshold:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return best
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "entries": len(self.entries),
+            "threshold": self.threshold,
+            "min_matched_terms": self.min_matched_terms,
+            **self.stats,
+        }
@@ -0,0 +1,200 @@
+"""
+Background dependency health prober.
+Checks run on an interval and /health serves the last result as pre-serialized
+JSON, so load-balancer probes never open a database connection or call the LLM.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.config.database import get_engine
+from app.config.settings import settings
+from app.models.schemas import DependencyHealth, HealthCheck, HealthStatus
+from app.services.ai_agent import peek_ai_agent
+from app.services.static_responses import static_responses
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProber:
+    """
+    Periodically probe the database, the LLM provider and registered queues.
+
+    The latest result is kept as bytes plus a status code; reading it is an
+    attribute lookup. The LLM is pinged less often than the database because
+    each ping is a network round trip to the vendor.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        timeout: float,
+        llm_interval: float,
+        queue_warn_depth: int,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.llm_interval = llm_interval
+        self.queue_warn_depth = queue_warn_depth
+        self._queues: Dict[str, Callable[[], int]] = {}
+        self._llm_result: Optional[DependencyHealth] = None
+        self._llm_checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.last: Optional[HealthCheck] = None  # Most recent completed probe
+        self._publish(HealthCheck(
+            status=HealthStatus.DEGRADED,
+            database=False,
+            ai_service=False,
+            version=settings.app_version,
+            checks={"prober": DependencyHealth(healthy=False, detail="First probe pending")},
+        ))
+
+    # ==================== Registration ====================
+
+    def register_queue(self, name: str, depth: Callable[[], int]) -> None:
+        """
+        Report a background queue's depth in health checks.
+
+        Args:
+            name: Queue name shown under "queues"
+            depth: Cheap callable returning the current number of queued items
+        """
+        self._queues[name] = depth
+
+    def unregister_queue(self, name: str) -> None:
+        self._queues.pop(name, None)
+
+    # ==================== Lifecycle ====================
+
+    def start(self, after: Optional[Awaitable] = None) -> None:
+        """
+        Start probing in the background (call from the running event loop).
+
+        Args:
+            after: Optional startup work (e.g. warm-up) to wait for before the first probe
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(after), name="health-prober")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, after: Optional[Awaitable]) -> None:
+        if after is not None:
+            try:
+                await after
+            except Exception:
+                pass  # Warm-up failures surface in the probe itself
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:  # Never let the prober die silently
+                logger.error(f"Health probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ==================== Probes ====================
+
+    async def probe(self) -> HealthCheck:
+        """Run all checks now and publish the result."""
+        database, llm = await asyncio.gather(self._check_database(), self._check_llm())
+        queues = self._queue_depths()
+
+        if not database.healthy and not llm.healthy:
+            status = HealthStatus.UNHEALTHY
+        elif not database.healthy or not llm.healthy or any(
+            depth > self.queue_warn_depth for depth in queues.values()
+        ):
+            status = HealthStatus.DEGRADED
+        else:
+            status = HealthStatus.HEALTHY
+
+        agent = peek_ai_agent()
+        result = HealthCheck(
+            status=status,
+            database=database.healthy,
+            ai_service=llm.healthy,
+            version=settings.app_version,
+            checks={"database": database, "llm": llm},
+            queues=queues,
+            upstream=agent.get_status() if agent else None,
+        )
+        if self.last is not None and result.status != self.last.status:
+            logger.warning(f"Health changed from {self.last.status.value} to {result.status.value}")
+        self.last = result
+        self._publish(result)
+        return result
+
+    async def _check_database(self) -> DependencyHealth:
+        def select_one():
+            with get_engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        return await self._timed(asyncio.to_thread(select_one))
+
+    async def _check_llm(self) -> DependencyHealth:
+        agent = peek_ai_agent()
+        if agent is None:
+            return DependencyHealth(healthy=False, detail="AI agent initializing")
+
+        circuit = agent.upstream.breaker.snapshot()
+        if circuit["state"] == "open":
+            # Don't ping a vendor the circuit breaker is already shielding
+            return DependencyHealth(
+                healthy=False, detail=f"Circuit open, retry in {circuit['retry_in_seconds']}s"
+            )
+
+        now = time.monotonic()
+        if self._llm_result is None or now - self._llm_checked_at >= self.llm_interval:
+            self._llm_result = await self._timed(agent.provider.ping())
+            self._llm_checked_at = now
+        return self._llm_result
+
+    async def _timed(self, check) -> DependencyHealth:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return DependencyHealth(healthy=False, detail=f"Timed out after {self.timeout}s")
+        except Exception as e:
+            return DependencyHealth(
+                healthy=False,
+                latency_ms=round((time.perf_counter() - started) * 1000, 2),
+                detail=f"{type(e).__name__}: {e}"[:200],
+            )
+        return DependencyHealth(healthy=True, latency_ms=round((time.perf_counter() - started) * 1000, 2))
+
+    def _queue_depths(self) -> Dict[str, int]:
+        depths = {}
+        for name, depth in self._queues.items():
+            try:
+                depths[name] = int(depth())
+            except Exception as e:
+                logger.warning(f"Queue depth for {name} unavailable: {e}")
+        return depths
+
+    # ==================== Cached Result ====================
+
+    def _publish(self, result: HealthCheck) -> None:
+        self.body = HealthCheck.__pydantic_serializer__.to_json(result)
+        # Load balancers should only pull the instance when nothing works
+        self.status_code = 503 if result.status == HealthStatus.UNHEALTHY else 200
+        # Served with an ETag; clients must revalidate, and get a 304 until the next probe changes it
+        static_responses.set("health", self.body, self.status_code, cache_control="no-cache")
+
+
+# Global health prober instance
+health_prober = HealthProber(
+    interval=settings.health_probe_interval_seconds,
+    timeout=settings.health_probe_timeout_seconds,
+    llm_interval=settings.health_llm_probe_interval_seconds,
+    queue_warn_depth=settings.health_queue_warn_depth,
+)
@@ -0,0 +1,105 @@
+"""
+Lookup-table interning for visit ingestion.
+Visits store integer ids into the user_agents and pages tables instead of
+repeating the strings. Each worker keeps an LRU of value -> id, so a visit from
+a known user agent to a known page resolves both ids without a database round
+trip; only the first sighting of a value reads (or inserts) its lookup row.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.config.database import Page, UserAgent, get_engine
+from app.config.settings import settings
+from app.services.user_agents import user_agent_hash
+
+
+class InternTable:
+    """Value -> id cache in front of a lookup table with a unique key column."""
+
+    def __init__(
+        self,
+        model: Any,
+        key_column: str,
+        max_entries: int,
+        key_of: Callable[[str], str] = lambda value: value,
+        row_of: Optional[Callable[[str, str], Dict[str, Any]]] = None,
+    ):
+        """
+        Args:
+            model: Lookup table model (needs an integer id)
+            key_column: Unique column looked up by key
+            max_entries: Ids cached per worker
+            key_of: Maps a value to its key (default: the value itself)
+            row_of: Builds the row to insert from (value, key); default {key_column: key}
+        """
+        self.model = model
+        self.key_column = getattr(model, key_column)
+        self.max_entries = max_entries
+        self.key_of = key_of
+        self.row_of = row_of or (lambda value, key: {key_column: key})
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "inserts": 0}
+
+    def resolve(self, value: str) -> Tuple[int, bool]:
+        """
+        Get the id for a value, creating its lookup row if needed.
+
+        Args:
+            value: String to intern
+
+        Returns:
+            (id, created) where created is True if this call inserted the row
+        """
+        key = self.key_of(value)
+        with self._lock:
+            row_id = self._ids.get(key)
+            if row_id is not None:
+                self._ids.move_to_end(key)
+                self.stats["hits"] += 1
+                return row_id, False
+            self.stats["misses"] += 1
+
+        row_id, created = self._fetch_or_insert(value, key)
+        with self._lock:
+            self._ids[key] = row_id
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+        return row_id, created
+
+    def _fetch_or_insert(self, value: str, key: str) -> Tuple[int, bool]:
+        engine = get_engine()
+        lookup = select(self.model.id).where(self.key_column == key)
+        with engine.connect() as conn:
+            row_id = conn.scalar(lookup)
+        if row_id is not None:
+            return row_id, False
+
+        try:
+            with engine.begin() as conn:
+                result = conn.execute(insert(self.model).values(**self.row_of(value, key)))
+                row_id = result.inserted_primary_key[0]
+        except IntegrityError:
+            # Another worker inserted the same value since we looked
+            with engine.connect() as conn:
+                return conn.scalar(lookup), False
+        self.stats["inserts"] += 1
+        return row_id, True
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"entries": len(self._ids), **self.stats}
+
+
+# Global intern tables
+page_ids = InternTable(Page, "path", max_entries=settings.intern_cache_size)
+user_agent_ids = InternTable(
+    UserAgent,
+    "ua_hash",
+    max_entries=settings.intern_cache_size,
+    key_of=user_agent_hash,
+    row_of=lambda value, key: {"ua_hash": key, "user_agent": value},
+)
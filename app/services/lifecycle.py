@@ -0,0 +1,101 @@
+"""
+Process lifecycle: graceful drain and shutdown hooks.
+Background buffers register a flush hook here; streaming endpoints register
+while they run so shutdown can let them finish instead of cutting them off.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """
+    Tracks in-flight streams and runs shutdown hooks in order.
+
+    Shutdown has two phases:
+    1. Drain: begin_drain() is called when the server stops accepting connections.
+       Streams keep going until the stream deadline, then finish early with a
+       "server restarting" event so clients can retry cleanly.
+    2. Flush: shutdown() (from the lifespan) runs the registered hooks, newest
+       first, each with a timeout, so buffered writes reach the database before
+       the process exits.
+    """
+
+    def __init__(self, stream_drain_seconds: float, hook_timeout: float):
+        self.stream_drain_seconds = stream_drain_seconds
+        self.hook_timeout = hook_timeout
+        self.draining = False
+        self.active_streams = 0
+        self._stream_deadline: Optional[float] = None
+        self._hooks: List[Tuple[str, Callable]] = []
+
+    def on_shutdown(self, name: str, hook: Callable) -> None:
+        """
+        Register a hook (sync or async, no arguments) to run at shutdown.
+
+        Args:
+            name: Name used in shutdown logs
+            hook: Flush/close callable
+        """
+        self._hooks.append((name, hook))
+
+    # ==================== Drain ====================
+
+    def begin_drain(self) -> None:
+        """Mark the process as draining and start the stream deadline."""
+        if self.draining:
+            return
+        self.draining = True
+        self._stream_deadline = time.monotonic() + self.stream_drain_seconds
+        logger.info(f"Draining: {self.active_streams} active stream(s), deadline {self.stream_drain_seconds}s")
+
+    @contextmanager
+    def track_stream(self):
+        """Count a streaming response as in flight for the duration of the block."""
+        self.active_streams += 1
+        try:
+            yield
+        finally:
+            self.active_streams -= 1
+
+    def should_end_stream(self) -> bool:
+        """True once draining and the stream deadline has passed."""
+        return self.draining and time.monotonic() >= self._stream_deadline
+
+    # ==================== Shutdown ====================
+
+    async def shutdown(self) -> None:
+        """Drain remaining streams, then run shutdown hooks newest first."""
+        self.begin_drain()
+        while self.active_streams and not self.should_end_stream():
+            await asyncio.sleep(0.1)
+
+        for name, hook in reversed(self._hooks):
+            started = time.perf_counter()
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await asyncio.wait_for(result, timeout=self.hook_timeout)
+                logger.info(f"Shutdown hook {name} finished in {(time.perf_counter() - started) * 1000:.1f}ms")
+            except asyncio.TimeoutError:
+                logger.error(f"Shutdown hook {name} timed out after {self.hook_timeout}s")
+            except Exception as e:
+                logger.error(f"Shutdown hook {name} failed: {e}")
+
+        # The same process may start the app again (e.g. test clients)
+        self.draining = False
+        self._stream_deadline = None
+
+
+# Global lifecycle instance
+lifecycle = Lifecycle(
+    stream_drain_seconds=settings.stream_drain_seconds,
+    hook_timeout=settings.shutdown_hook_timeout_seconds,
+)
@@ -0,0 +1,225 @@
+"""
+LLM provider abstraction.
+Decouples the AI agent from a specific vendor SDK and offers an offline stub for load testing.
+"""
+import asyncio
+import hashlib
+import random
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.config.settings import settings
+from app.services.chat_batch import ANSWER_HEADING
+from app.services.tokens import TokenUsage, count_tokens_local
+
+
+@dataclass
+class LLMResult:
+    """A complete answer and the tokens it cost."""
+    text: str
+    usage: TokenUsage
+
+
+def estimate_usage(prompt: str, history: List[Dict[str, str]], completion: str) -> TokenUsage:
+    """Count a call's tokens locally (for providers that don't report usage)."""
+    prompt_tokens = count_tokens_local(prompt) + sum(count_tokens_local(msg["content"]) for msg in history)
+    return TokenUsage(prompt_tokens, count_tokens_local(completion) if completion else 0, estimated=True)
+
+
+class LLMProvider(ABC):
+    """
+    Interface every LLM backend implements.
+
+    History entries are provider-neutral dicts: {"role": "user" | "assistant", "content": str}.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    async def chat(self, prompt: str, history: List[Dict[str, str]]) -> LLMResult:
+        """Generate a complete answer for the prompt."""
+
+    @abstractmethod
+    def stream(
+        self, prompt: str, history: List[Dict[str, str]], usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate an answer as an async iterator of text chunks.
+
+        If `usage` is given it is filled in once the stream has finished.
+        """
+
+    @abstractmethod
+    async def count_tokens(self, text: str) -> int:
+        """Count tokens in text the way the provider bills them."""
+
+    async def ping(self) -> None:
+        """
+        Cheap reachability check for health probes.
+
+        Token counting is a real API round trip but generates nothing and is not billed.
+        """
+        await self.count_tokens("ping")
+
+
+# ==================== Gemini ====================
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini backend."""
+
+    name = "gemini"
+
+    def __init__(self):
+        """Configure the Gemini SDK and build the model."""
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.gemini_api_key)
+        self.model = genai.GenerativeModel(
+            model_name=settings.gemini_model,
+            generation_config={
+                "temperature": settings.temperature,
+                "max_output_tokens": settings.max_tokens,
+            }
+        )
+
+    @staticmethod
+    def _to_gemini_history(history: List[Dict[str, str]]) -> List[Dict]:
+        return [
+            {
+                "role": "user" if msg["role"] == "user" else "model",  # Gemini uses "model" not "assistant"
+                "parts": [msg["content"]]
+            }
+            for msg in history
+        ]
+
+    @staticmethod
+    def _usage(response, prompt: str, history: List[Dict[str, str]], text: str) -> TokenUsage:
+        """Billed usage from the response metadata, or a local count if it is missing."""
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata is None or not metadata.prompt_token_count:
+            return estimate_usage(prompt, history, text)
+        return TokenUsage(metadata.prompt_token_count, metadata.candidates_token_count or 0)
+
+    async def chat(self, prompt: str, history: List[Dict[str, str]]) -> LLMResult:
+        # Fresh chat session per call - sessions mutate their history
+        chat = self.model.start_chat(history=self._to_gemini_history(history))
+        response = await chat.send_message_async(prompt)
+        return LLMResult(response.text, self._usage(response, prompt, history, response.text))
+
+    async def stream(
+        self, prompt: str, history: List[Dict[str, str]], usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        chat = self.model.start_chat(history=self._to_gemini_history(history))
+        response = await chat.send_message_async(prompt, stream=True)
+        chunks = []
+        async for chunk in response:
+            if chunk.text:
+                chunks.append(chunk.text)
+                yield chunk.text
+        if usage is not None:
+            # The final chunk carries the totals for the whole stream
+            usage.copy_from(self._usage(response, prompt, history, "".join(chunks)))
+
+    async def count_tokens(self, text: str) -> int:
+        result = await self.model.count_tokens_async(text)
+        return result.total_tokens
+
+
+# ==================== Local Stub ====================
+
+_STUB_VOCABULARY = (
+    "Howard has built cloud infrastructure, HPC simulation pipelines and full stack "
+    "services with Python, C++, Docker, Kubernetes, FastAPI and React, focusing on "
+    "performance optimization, observability and reliable deployments"
+).split()
+
+
+_BATCH_QUESTION = re.compile(r"^Question (\d+): ", re.MULTILINE)
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic offline provider for load tests and benchmarks.
+
+    Output and failures are seeded from the prompt, so the same request always
+    produces the same answer. Latency is simulated with asyncio.sleep.
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        first_token_ms: float = None,
+        token_ms: float = None,
+        response_tokens: int = None,
+        failure_rate: float = None,
+    ):
+        self.first_token_ms = settings.stub_first_token_ms if first_token_ms is None else first_token_ms
+        self.token_ms = settings.stub_token_ms if token_ms is None else token_ms
+        self.response_tokens = settings.stub_response_tokens if response_tokens is None else response_tokens
+        self.failure_rate = settings.stub_failure_rate if failure_rate is None else failure_rate
+
+    def _tokens(self, prompt: str) -> List[str]:
+        seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], "big")
+        rng = random.Random(seed)
+        if rng.random() < self.failure_rate:
+            raise ConnectionError("Simulated upstream failure")
+        return [rng.choice(_STUB_VOCABULARY) for _ in range(self.response_tokens)]
+
+    async def chat(self, prompt: str, history: List[Dict[str, str]]) -> LLMResult:
+        tokens = self._tokens(prompt)
+        questions = _BATCH_QUESTION.findall(prompt)
+        if questions:
+            # Batched prompt: one headed answer per question, like a model following the instructions
+            answers = [self._tokens(f"{prompt}\n{number}") for number in questions]
+            tokens = [token for answer in answers for token in answer]
+            text = "\n\n".join(
+                f"{ANSWER_HEADING} {number}\n" + " ".join(answer) + "."
+                for number, answer in zip(questions, answers)
+            )
+        else:
+            text = " ".join(tokens) + "."
+        await asyncio.sleep((self.first_token_ms + self.token_ms * len(tokens)) / 1000)
+        return LLMResult(text, estimate_usage(prompt, history, text))
+
+    async def stream(
+        self, prompt: str, history: List[Dict[str, str]], usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self.first_token_ms / 1000)
+        for i, token in enumerate(tokens):
+            if self.token_ms:
+                await asyncio.sleep(self.token_ms / 1000)
+            yield token if i == 0 else f" {token}"
+        yield "."
+        if usage is not None:
+            usage.copy_from(estimate_usage(prompt, history, " ".join(tokens) + "."))
+
+    async def count_tokens(self, text: str) -> int:
+        return count_tokens_local(text)
+
+
+# ==================== Factory ====================
+
+PROVIDERS = {
+    GeminiProvider.name: GeminiProvider,
+    StubProvider.name: StubProvider,
+}
+
+
+def create_provider(name: str = None) -> LLMProvider:
+    """
+    Instantiate the configured LLM provider.
+
+    Args:
+        name: Provider name, defaults to settings.ai_provider
+
+    Returns:
+        LLMProvider instance
+    """
+    name = (name or settings.ai_provider).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown AI provider '{name}'. Choose one of: {', '.join(PROVIDERS)}")
+    return PROVIDERS[name]()
@@ -0,0 +1,270 @@
+"""
+Prometheus metrics for the API.
+Hot-path metrics are plain counters/histograms with cached label children; anything
+that already keeps its own counters (caches, circuit breaker, DB pool) is read at
+scrape time by a collector so it costs nothing per request.
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Tuple
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# ==================== HTTP ====================
+
+class RequestStats:
+    """
+    Lock-free request latency histogram and in-flight count.
+
+    Only touched from the event loop thread, so plain ints are safe and an
+    observation is a bisect plus two additions (well under a microsecond),
+    versus the locked children of prometheus_client.Histogram. Exported by
+    AppStateCollector at scrape time.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+    def __init__(self):
+        self.in_flight = 0
+        # (method, route, status) -> [bucket counts (last is +Inf), sum]
+        self.series: Dict[Tuple[str, str, int], List] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Record a finished request."""
+        key = (method, route, status)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.BUCKETS) + 1), 0.0]
+        series[0][bisect_left(self.BUCKETS, seconds)] += 1
+        series[1] += seconds
+
+    def collect(self) -> Iterator:
+        latency = HistogramMetricFamily(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template and status",
+            labels=["method", "route", "status"],
+        )
+        for (method, route, status), (counts, total) in list(self.series.items()):
+            cumulative, buckets = 0, []
+            for bound, count in zip(self.BUCKETS + (float("inf"),), counts):
+                cumulative += count
+                buckets.append(("+Inf" if bound == float("inf") else str(bound), cumulative))
+            latency.add_metric([method, route, str(status)], buckets, total)
+        yield latency
+        yield GaugeMetricFamily(
+            "http_requests_in_flight", "HTTP requests currently being processed", value=self.in_flight
+        )
+
+
+request_stats = RequestStats()
+
+
+# ==================== LLM ====================
+
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds",
+    "Upstream LLM call duration including retries",
+    ["provider", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by upstream LLM calls",
+    ["provider", "kind"],
+)
+
+
+def observe_llm_call(provider: str, outcome: str, seconds: float) -> None:
+    """Record an upstream LLM call."""
+    LLM_CALL_DURATION.labels(provider, outcome).observe(seconds)
+
+
+def count_llm_tokens(provider: str, kind: str, tokens: int) -> None:
+    """Add to the LLM token counter."""
+    if tokens:
+        LLM_TOKENS.labels(provider, kind).inc(tokens)
+
+
+# ==================== Database ====================
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_CONNECTIONS_OPENED = Counter(
+    "db_connections_opened_total",
+    "New DB connections opened (every checkout with NullPool)",
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_connections_in_use",
+    "DB connections currently checked out of the pool",
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    DB_QUERY_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+
+@event.listens_for(Pool, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    DB_CONNECTIONS_OPENED.inc()
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_CONNECTIONS_IN_USE.inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    DB_CONNECTIONS_IN_USE.dec()
+
+
+# ==================== Scrape-time Collectors ====================
+
+class AppStateCollector(Collector):
+    """Reads request stats, cache, circuit breaker, batch writer, visit dedup, UA parser, intern cache and pool state when /metrics is scraped."""
+
+    def describe(self) -> list:
+        # Metric names depend on what has been built; skip the registration-time collect
+        return []
+
+    def collect(self) -> Iterator:
+        yield from request_stats.collect()
+
+        # Imported lazily so metrics can be loaded without building anything
+        from app.config.database import peek_engine
+        from app.services.ai_agent import peek_ai_agent
+
+        agent = peek_ai_agent()
+        if agent is not None:
+            cache = agent.response_cache.stats()
+            lookups = CounterMetricFamily(
+                "response_cache_lookups", "Response cache lookups by result", labels=["result"]
+            )
+            lookups.add_metric(["hit"], cache["hits"])
+            lookups.add_metric(["miss"], cache["misses"])
+            lookups.add_metric(["stale_hit"], cache["stale_hits"])
+            yield lookups
+            yield GaugeMetricFamily("response_cache_entries", "Entries in the response cache", value=cache["entries"])
+
+            coalescing = agent.inflight.snapshot()
+            coalesced = CounterMetricFamily(
+                "llm_coalesced_requests", "Chat requests by single-flight role", labels=["kind", "role"]
+            )
+            coalesced.add_metric(["chat", "leader"], coalescing["leaders"])
+            coalesced.add_metric(["chat", "follower"], coalescing["followers"])
+            coalesced.add_metric(["stream", "leader"], coalescing["stream_leaders"])
+            coalesced.add_metric(["stream", "follower"], coalescing["stream_followers"])
+            yield coalesced
+
+            faq = agent.faq.snapshot()
+            faq_lookups = CounterMetricFamily(
+                "faq_lookups", "FAQ fast path lookups by result", labels=["result"]
+            )
+            faq_lookups.add_metric(["hit"], faq["hits"])
+            faq_lookups.add_metric(["miss"], faq["misses"])
+            yield faq_lookups
+
+            upstream = agent.upstream.snapshot()
+            calls = CounterMetricFamily(
+                "llm_upstream_events", "Upstream client events by type", labels=["event"]
+            )
+            for name in ("calls", "successes", "failures", "retries", "timeouts", "hedges", "short_circuits"):
+                calls.add_metric([name], upstream[name])
+            yield calls
+
+            state = GaugeMetricFamily(
+                "llm_circuit_state", "Circuit breaker state (1 for the current state)", labels=["state"]
+            )
+            for name in ("closed", "open", "half_open"):
+                state.add_metric([name], 1 if upstream["circuit"]["state"] == name else 0)
+            yield state
+
+        from app.services.batching import batch_writers
+
+        if batch_writers:
+            depth = GaugeMetricFamily(
+                "batch_writer_queue_depth", "Items waiting to be written", labels=["writer"]
+            )
+            events = CounterMetricFamily(
+                "batch_writer_items", "Batch writer items and batches by event", labels=["writer", "event"]
+            )
+            for writer in batch_writers:
+                depth.add_metric([writer.name], writer.depth)
+                for name, value in writer.stats.items():
+                    events.add_metric([writer.name, name], value)
+            yield depth
+            yield events
+
+        from app.services.tenants import tenant_registry
+
+        tenants = tenant_registry.snapshot()
+        yield GaugeMetricFamily("tenants_loaded", "Tenant agents in memory", value=tenants["loaded"])
+        yield GaugeMetricFamily(
+            "tenants_memory_bytes", "Estimated memory held by loaded tenant agents", value=tenants["memory_bytes"]
+        )
+        tenant_events = CounterMetricFamily("tenant_events", "Tenant agent loads and evictions", labels=["event"])
+        tenant_events.add_metric(["load"], tenants["loads"])
+        tenant_events.add_metric(["eviction"], tenants["evictions"])
+        yield tenant_events
+
+        from app.services.visit_dedup import visit_deduplicator
+
+        dedup = visit_deduplicator.snapshot()
+        visits = CounterMetricFamily(
+            "analytics_visits_ingested", "Visit ingestion decisions", labels=["result"]
+        )
+        for name in ("accepted", "idempotent_replays", "bucket_repeats"):
+            visits.add_metric([name], dedup[name])
+        yield visits
+        yield GaugeMetricFamily(
+            "analytics_visit_filter_error_rate", "Estimated Bloom filter false-positive rate",
+            value=dedup["filter"]["estimated_error_rate"],
+        )
+
+        from app.services.user_agents import ua_enricher
+
+        parser = ua_enricher.parser.snapshot()
+        ua_lookups = CounterMetricFamily(
+            "user_agent_parse_lookups", "Memoized user-agent parser lookups by result", labels=["result"]
+        )
+        ua_lookups.add_metric(["hit"], parser["hits"])
+        ua_lookups.add_metric(["miss"], parser["misses"])
+        yield ua_lookups
+
+        from app.services.interning import page_ids, user_agent_ids
+
+        interned = CounterMetricFamily(
+            "intern_lookups", "Lookup-table id resolutions by table and result", labels=["table", "result"]
+        )
+        for table, intern in (("pages", page_ids), ("user_agents", user_agent_ids)):
+            stats = intern.snapshot()
+            for name, result in (("hits", "hit"), ("misses", "miss"), ("inserts", "insert")):
+                interned.add_metric([table, result], stats[name])
+        yield interned
+
+        engine = peek_engine()
+        if engine is not None and hasattr(engine.pool, "checkedout"):
+            pool = engine.pool
+            yield GaugeMetricFamily("db_pool_size", "Configured pool size", value=pool.size())
+            yield GaugeMetricFamily("db_pool_checked_out", "Pooled connections in use", value=pool.checkedout())
+            yield GaugeMetricFamily("db_pool_overflow", "Connections above pool size", value=pool.overflow())
+
+
+REGISTRY.register(AppStateCollector())
@@ -0,0 +1,121 @@
+"""
+Request profile storage and signing helpers.
+Captured profiles are kept in a bounded in-memory ring buffer per worker.
+"""
+import hashlib
+import hmac
+import io
+import marshal
+import pstats
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+
+# Signed on-demand profile headers are valid for this long
+SIGNATURE_MAX_AGE_SECONDS = 300
+
+
+@dataclass
+class ProfileRecord:
+    """One captured request profile."""
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    profiler: str  # "cprofile" or "pyinstrument"
+    data: bytes  # marshalled pstats (cprofile) or HTML (pyinstrument)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    created_at: float = field(default_factory=time.time)
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "profiler": self.profiler,
+            "created_at": self.created_at,
+            "size_bytes": len(self.data),
+        }
+
+    def as_text(self, limit: int = 40) -> str:
+        """Human-readable top functions by cumulative time (cProfile only)."""
+        if self.profiler != "cprofile":
+            raise ValueError("Text output is only available for cProfile profiles")
+        stream = io.StringIO()
+        stats = pstats.Stats(_StatsSource(marshal.loads(self.data)), stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+class _StatsSource:
+    """Adapter so pstats.Stats can load from an in-memory stats dict."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """Thread-safe ring buffer of the most recent profiles."""
+
+    def __init__(self, max_profiles: int):
+        self._profiles: deque = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def add(self, record: ProfileRecord) -> None:
+        with self._lock:
+            self._profiles.append(record)
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        with self._lock:
+            for record in self._profiles:
+                if record.id == profile_id:
+                    return record
+        return None
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [record.summary() for record in reversed(self._profiles)]
+
+
+def sign_profile_request(path: str, timestamp: Optional[int] = None) -> str:
+    """
+    Build an X-Profile-Request header value for an on-demand profile.
+
+    Format: "<unix timestamp>.<hex HMAC-SHA256 of 'timestamp:path'>" keyed with PROFILING_TOKEN.
+
+    Raises:
+        ValueError: PROFILING_TOKEN is not set
+    """
+    if not settings.profiling_token:
+        raise ValueError("PROFILING_TOKEN is not set; on-demand profiling is disabled")
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(
+        settings.profiling_token.encode(), f"{timestamp}:{path}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{timestamp}.{digest}"
+
+
+def verify_profile_request(header: str, path: str) -> bool:
+    """Check an X-Profile-Request header for this path (always False without PROFILING_TOKEN)."""
+    if not settings.profiling_token:
+        return False
+    timestamp, _, _ = header.partition(".")
+    if not timestamp.isdigit():
+        return False
+    if abs(time.time() - int(timestamp)) > SIGNATURE_MAX_AGE_SECONDS:
+        return False
+    return hmac.compare_digest(header, sign_profile_request(path, int(timestamp)))
+
+
+# Global profile store instance
+profile_store = ProfileStore(max_profiles=settings.profiling_buffer_size)
@@ -0,0 +1,90 @@
+"""
+In-process cache of AI answers for standalone questions.
+Serves repeat questions without an upstream call and backs degraded-mode fallbacks.
+"""
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+
+
+def normalize_question(message: str) -> str:
+    """Normalize a question so trivially different phrasings share a cache key."""
+    text = _WHITESPACE.sub(" ", message.strip().lower())
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with a freshness TTL.
+
+    Entries older than `ttl` are not served as normal hits but are kept until
+    evicted, so they can still be returned while the upstream is degraded.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[str]:
+        """
+        Look up a cached answer.
+
+        Args:
+            key: Normalized question
+            allow_stale: Return entries past their TTL (degraded mode)
+
+        Returns:
+            Cached answer or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            if not allow_stale:
+                self.misses += 1
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            if not allow_stale:
+                self.misses += 1
+                return None
+            self.stale_hits += 1
+        elif not allow_stale:
+            self.hits += 1
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store an answer, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by cached answers (characters stored)."""
+        return sum(len(value) for _, value in self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for health reporting."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,140 @@
+"""
+Single-flight request coalescing.
+Concurrent callers asking for the same key share one execution (or one stream)
+instead of each starting their own upstream call.
+"""
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class SharedStream:
+    """
+    One upstream stream replayed to any number of subscribers.
+
+    The source is consumed by a background task, so a subscriber that
+    disconnects (including the one that started it) doesn't cut the stream off
+    for the others. Late subscribers receive every chunk from the beginning.
+    When the last subscriber leaves before the end, the source is cancelled so
+    an abandoned answer stops consuming upstream capacity.
+    """
+
+    def __init__(self, source: AsyncIterator[str]):
+        self.chunks: List[str] = []
+        self.done = False
+        self.abandoned = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self.task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async with aclosing(source):
+                async for chunk in source:
+                    self.chunks.append(chunk)
+                    self._notify()
+        except asyncio.CancelledError:
+            self.error = ConnectionAbortedError("Shared stream was cancelled")
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def subscribe(self) -> AsyncIterator[str]:
+        """Iterator over every chunk of the stream, re-raising its error if it failed."""
+        # Counted now rather than on first iteration, so a follower that hasn't
+        # started reading yet keeps the stream alive if the leader leaves
+        self.subscribers += 1
+        return self._replay()
+
+    async def _replay(self) -> AsyncIterator[str]:
+        position = 0
+        try:
+            while True:
+                if position < len(self.chunks):
+                    yield self.chunks[position]
+                    position += 1
+                elif self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                else:
+                    await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                self.abandoned = True
+                self.task.cancel()
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls and streams by key (event loop only, per worker).
+
+    The shared work runs as its own task: cancelling one waiting caller never
+    cancels it for the rest, and a finished result is handed to everyone who
+    joined while it was in flight. Entries are removed as soon as the work ends,
+    so nothing is cached here; caching stays the response cache's job.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, SharedStream] = {}
+        self.stats = {"leaders": 0, "followers": 0, "stream_leaders": 0, "stream_followers": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Returns:
+            (result, shared) where shared is True if another caller started the work
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.stats["followers"] += 1
+        else:
+            self.stats["leaders"] += 1
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finish_call(key, t))
+        return await asyncio.shield(task), shared
+
+    def _finish_call(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved even if every caller went away
+
+    def stream(self, key: str, source: Callable[[], AsyncIterator[str]]) -> Tuple[AsyncIterator[str], bool]:
+        """
+        Subscribe to the in-flight stream for key, starting it if there is none.
+
+        Returns:
+            (chunks, shared) where shared is True if another caller started the stream
+        """
+        stream = self._streams.get(key)
+        shared = stream is not None and not stream.abandoned
+        if shared:
+            self.stats["stream_followers"] += 1
+        else:
+            self.stats["stream_leaders"] += 1
+            stream = SharedStream(source())
+            self._streams[key] = stream
+            stream.task.add_done_callback(lambda _: self._finish_stream(key, stream))
+        return stream.subscribe(), shared
+
+    def _finish_stream(self, key: str, stream: SharedStream) -> None:
+        if self._streams.get(key) is stream:
+            del self._streams[key]
+
+    def snapshot(self) -> Dict[str, int]:
+        """Counters and current in-flight keys for health reporting."""
+        return {**self.stats, "in_flight": len(self._calls) + len(self._streams)}
@@ -0,0 +1,117 @@
+"""
+Pre-serialized responses for endpoints whose body rarely changes.
+Bodies are rendered once (at startup, or when their source publishes a change)
+with a strong ETag and Cache-Control, then served as raw bytes with 304 support.
+"""
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+
+from app.config.settings import settings
+from app.responses import FastJSONResponse, PreparedResponse
+
+logger = logging.getLogger(__name__)
+
+
+class StaticResponse:
+    """One rendered body with its validators and pre-encoded headers."""
+
+    __slots__ = ("body", "status_code", "etag", "raw_headers", "not_modified_headers")
+
+    def __init__(self, body: bytes, status_code: int, cache_control: str, media_type: str):
+        self.body = body
+        self.status_code = status_code
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        validators: List[Tuple[bytes, bytes]] = [
+            (b"etag", self.etag.encode()),
+            (b"cache-control", cache_control.encode()),
+        ]
+        self.not_modified_headers = validators
+        self.raw_headers = [
+            (b"content-type", media_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+            *validators,
+        ]
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Weak comparison against an If-None-Match header, as RFC 9110 requires.
+
+        Compression turns the ETag weak (W/"..."), so the prefix is ignored.
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+    def respond(self, request: Request) -> PreparedResponse:
+        if self.status_code == 200 and self.matches(request.headers.get("if-none-match")):
+            return PreparedResponse(304, b"", self.not_modified_headers)
+        return PreparedResponse(self.status_code, self.body, self.raw_headers)
+
+
+class StaticResponseRegistry:
+    """
+    Named static responses.
+
+    Endpoints register a builder; the body is rendered on first use (or by
+    build_all() during warm-up) and reused until refresh() or set() replaces it.
+    """
+
+    def __init__(self, max_age: int):
+        """
+        Args:
+            max_age: Cache-Control max-age in seconds for registered responses
+        """
+        self.default_cache_control = f"public, max-age={max_age}"
+        self._builders: Dict[str, Tuple[Callable[[], Any], str]] = {}
+        self._responses: Dict[str, StaticResponse] = {}
+
+    def register(self, name: str, build: Callable[[], Any], cache_control: Optional[str] = None) -> None:
+        """
+        Register a response whose JSON content comes from build().
+
+        Args:
+            name: Registry key
+            build: Returns the content (dict or Pydantic model) to serialize
+            cache_control: Cache-Control value, defaults to public with the configured max-age
+        """
+        self._builders[name] = (build, cache_control or self.default_cache_control)
+        self._responses.pop(name, None)
+
+    def refresh(self, name: str) -> StaticResponse:
+        """Render a registered response again (call when its source changes)."""
+        build, cache_control = self._builders[name]
+        body = FastJSONResponse(build()).body
+        response = StaticResponse(body, 200, cache_control, "application/json")
+        self._responses[name] = response
+        return response
+
+    def set(self, name: str, body: bytes, status_code: int = 200, cache_control: str = "no-cache") -> None:
+        """Publish an already-serialized JSON body (for sources that render their own)."""
+        self._responses[name] = StaticResponse(body, status_code, cache_control, "application/json")
+
+    def build_all(self) -> None:
+        """Render every registered response that hasn't been rendered yet."""
+        for name in self._builders:
+            if name not in self._responses:
+                try:
+                    self.refresh(name)
+                except Exception as e:
+                    logger.error(f"Static response {name} failed to render: {e}")
+
+    def respond(self, name: str, request: Request) -> PreparedResponse:
+        """Serve a static response, or 304 if the client's copy is current."""
+        response = self._responses.get(name)
+        if response is None:
+            response = self.refresh(name)
+        return response.respond(request)
+
+
+# Global static response registry
+static_responses = StaticResponseRegistry(max_age=settings.static_response_max_age_seconds)
@@ -0,0 +1,179 @@
+"""
+Multi-tenant knowledge bases.
+Each tenant is a directory of documents served by its own AI agent (corpus, FAQ
+index, response cache). Agents are built on first request and evicted least
+recently used once their estimated memory exceeds the budget, checked when a
+tenant loads and periodically as loaded agents' caches grow.
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.config.settings import settings
+from app.services.ai_agent import AIAgent, get_ai_agent
+from app.services.document_loader import DocumentLoader
+from app.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Tenant names double as directory names, so nothing that could escape tenants_dir
+_TENANT_NAME = re.compile(r"^[a-z0-9][a-z0-9_-]{0,62}$")
+
+TENANT_INSTRUCTION = """You are {name}'s Portfolio Assistant, an AI helping recruiters and hiring managers learn about {name}.
+
+ROLE:
+You are professional, helpful, and concise. Your goal is to provide accurate information about {name}'s background, skills, projects, and career interests.
+
+GUIDELINES:
+1. Provide specific details from the knowledge base below
+2. If asked about something not in the knowledge base, acknowledge that honestly
+3. Highlight relevant experience for the specific question asked
+4. Be concise but thorough - recruiters are busy
+5. Include links to projects when relevant
+
+KNOWLEDGE BASE:
+{knowledge_base}
+
+Remember: Be helpful, accurate, and professional. You're representing {name} to potential employers!
+"""
+
+
+class TenantNotFound(KeyError):
+    """No tenant directory exists for the requested name."""
+
+
+class TenantRegistry:
+    """
+    Per-tenant AI agents, loaded lazily and evicted LRU under a memory budget.
+
+    Tenant agents share the default agent's provider and upstream client, so
+    there is one connection pool and one circuit breaker per worker no matter how
+    many tenants are loaded. The default tenant is the built-in agent and is never
+    evicted.
+    """
+
+    # Loaded agents' response caches fill up after load; re-check the budget this often
+    BUDGET_CHECK_SECONDS = 10.0
+
+    def __init__(self, root: Path, hosts: Dict[str, str], memory_budget_bytes: int, default_tenant: str):
+        """
+        Args:
+            root: Directory holding one subdirectory of documents per tenant
+            hosts: Host name -> tenant name
+            memory_budget_bytes: Estimated memory allowed for loaded tenant agents
+            default_tenant: Name that refers to the built-in agent
+        """
+        self.root = root
+        self.hosts = {host.lower(): tenant for host, tenant in hosts.items()}
+        self.memory_budget_bytes = memory_budget_bytes
+        self.default_tenant = default_tenant
+        self._agents: "OrderedDict[str, AIAgent]" = OrderedDict()
+        self._loading = SingleFlight()
+        self._budget_checked_at = 0.0
+        self.stats = {"loads": 0, "evictions": 0}
+
+    def resolve_host(self, host: str) -> Optional[str]:
+        """Tenant configured for a Host header value (port ignored), if any."""
+        return self.hosts.get(host.split(":", 1)[0].lower())
+
+    async def get(self, name: str) -> AIAgent:
+        """
+        Get a tenant's agent, loading it on first use.
+
+        Raises:
+            TenantNotFound: No such tenant directory
+        """
+        if name == self.default_tenant:
+            return get_ai_agent()
+        agent = self._agents.get(name)
+        if agent is not None:
+            self._agents.move_to_end(name)
+            if time.monotonic() - self._budget_checked_at >= self.BUDGET_CHECK_SECONDS:
+                self._evict()
+            return agent
+        if not _TENANT_NAME.match(name) or not (self.root / name).is_dir():
+            raise TenantNotFound(name)
+
+        # Concurrent first requests for a tenant share one load
+        agent, _ = await self._loading.do(name, lambda: self._load(name))
+        return agent
+
+    async def _load(self, name: str) -> AIAgent:
+        agent = await asyncio.to_thread(self._build, name)
+        self._agents[name] = agent
+        self.stats["loads"] += 1
+        self._evict()
+        logger.info(f"Loaded tenant {name} ({self._footprint(agent) // 1024} KB, {len(self._agents)} loaded)")
+        return agent
+
+    def _build(self, name: str) -> AIAgent:
+        """Read a tenant's documents and build its agent (blocking)."""
+        path = self.root / name
+        metadata_file = path / "tenant.json"
+        metadata = json.loads(metadata_file.read_text(encoding="utf-8")) if metadata_file.exists() else {}
+        documents = DocumentLoader.from_directory(path)
+        default = get_ai_agent()
+        return AIAgent(
+            provider=default.provider,
+            documents=documents,
+            system_instruction=TENANT_INSTRUCTION.format(
+                name=metadata.get("name", name.replace("-", " ").title()),
+                knowledge_base=documents.get_all_content(),
+            ),
+            upstream=default.upstream,
+        )
+
+    @staticmethod
+    def _footprint(agent: AIAgent) -> int:
+        """Rough bytes held by an agent: its corpus, FAQ answers and cached answers."""
+        return (
+            len(agent.knowledge_base)
+            + len(agent.system_instruction)
+            + sum(len(answer) for _, answer in agent.faq.entries)
+            + agent.response_cache.size_bytes()
+        )
+
+    def _evict(self) -> None:
+        """Drop least recently used agents until the rest fit the budget (keeps at least one)."""
+        self._budget_checked_at = time.monotonic()
+        total = sum(self._footprint(agent) for agent in self._agents.values())
+        while total > self.memory_budget_bytes and len(self._agents) > 1:
+            name, agent = self._agents.popitem(last=False)
+            total -= self._footprint(agent)
+            self.stats["evictions"] += 1
+            logger.info(f"Evicted tenant {name}")
+
+    def snapshot(self) -> Dict[str, int]:
+        """Loaded tenants and counters for health reporting."""
+        return {
+            "loaded": len(self._agents),
+            "memory_bytes": sum(self._footprint(agent) for agent in self._agents.values()),
+            **self.stats,
+        }
+
+
+# Global tenant registry instance
+tenant_registry = TenantRegistry(
+    root=Path(settings.tenants_dir),
+    hosts=settings.tenant_hosts,
+    memory_budget_bytes=int(settings.tenant_memory_budget_mb * 1024 * 1024),
+    default_tenant=settings.default_tenant,
+)
+
+
+async def provide_tenant_agent(request: Request) -> AIAgent:
+    """FastAPI dependency for the AI agent of the tenant resolved by TenantMiddleware."""
+    tenant = request.scope.get("tenant")
+    if tenant is None:
+        return get_ai_agent()
+    try:
+        return await tenant_registry.get(tenant)
+    except TenantNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown tenant: {tenant}")
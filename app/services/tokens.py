@@ -0,0 +1,123 @@
+"""
+Token accounting.
+Usage as reported by the provider, a cached local tokenizer for pre-flight
+estimates (and for the stub provider), and per-session token budgets that are
+enforced before a prompt is sent upstream.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=4096)
+def _count_block(block: str) -> int:
+    return len(_TOKEN_PATTERN.findall(block))
+
+
+def count_tokens_local(text: str) -> int:
+    """
+    Local token count (words and punctuation marks), memoized per paragraph.
+
+    Tracks Gemini's SentencePiece counts closely enough for limits and budgets
+    without a network round trip. Tokens never span a blank line, so a prompt is
+    counted paragraph by paragraph: the knowledge base paragraphs are the same on
+    every request and only the question is actually scanned.
+    """
+    return sum(_count_block(block) for block in text.split("\n\n"))
+
+
+@dataclass
+class TokenUsage:
+    """Prompt and completion tokens for one LLM call."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated: bool = False  # True when counted locally instead of reported by the provider
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def copy_from(self, other: "TokenUsage") -> None:
+        """Overwrite in place (used to report stream usage through an out-parameter)."""
+        self.prompt_tokens = other.prompt_tokens
+        self.completion_tokens = other.completion_tokens
+        self.estimated = other.estimated
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+
+class TokenLimitExceeded(Exception):
+    """A prompt is too large or a session has used up its token budget."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SessionTokenBudgets:
+    """
+    Per-session token totals with a budget, kept in memory per worker.
+
+    Sessions idle for longer than `idle_reset` start over; at most `max_sessions`
+    are tracked (least recently used are forgotten).
+    """
+
+    def __init__(self, budget: int, max_sessions: int = 10000, idle_reset: float = 3600.0):
+        """
+        Args:
+            budget: Total tokens allowed per session (0 disables budgets)
+            max_sessions: Sessions tracked before the least recently used is evicted
+            idle_reset: Seconds of inactivity after which a session's usage resets
+        """
+        self.budget = budget
+        self.max_sessions = max_sessions
+        self.idle_reset = idle_reset
+        self._used: OrderedDict = OrderedDict()  # session_id -> (tokens, last_used)
+        self._lock = threading.Lock()
+
+    def used(self, session_id: str) -> int:
+        with self._lock:
+            entry = self._used.get(session_id)
+            if entry is None or time.monotonic() - entry[1] > self.idle_reset:
+                return 0
+            return entry[0]
+
+    def check(self, session_id: Optional[str], prompt_tokens: int) -> None:
+        """
+        Raise if sending this prompt would exceed the session's budget.
+
+        Raises:
+            TokenLimitExceeded: With status 429 when the budget is exhausted
+        """
+        if not self.budget or not session_id:
+            return
+        used = self.used(session_id)
+        if used + prompt_tokens > self.budget:
+            raise TokenLimitExceeded(
+                f"Session token budget exhausted ({used} of {self.budget} tokens used). "
+                "Please start a new conversation.",
+                status_code=429,
+            )
+
+    def add(self, session_id: Optional[str], tokens: int) -> None:
+        """Charge tokens to a session."""
+        if not self.budget or not session_id or not tokens:
+            return
+        now = time.monotonic()
+        with self._lock:
+            entry = self._used.pop(session_id, None)
+            used = entry[0] if entry is not None and now - entry[1] <= self.idle_reset else 0
+            self._used[session_id] = (used + tokens, now)
+            if len(self._used) > self.max_sessions:
+                self._used.popitem(last=False)
@@ -0,0 +1,199 @@
+"""
+OpenTelemetry tracing.
+Spans are exported to the console, a local JSON-lines file, or OTLP. When tracing is
+disabled (the default) or the SDK is not installed, every helper is a no-op.
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+_NOOP_SPAN = nullcontext()
+_tracer = None
+_provider = None
+_export_file = None
+
+# When the route handler started (before body parsing and validation)
+_handler_started_ns: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "handler_started_ns", default=None
+)
+
+
+def init_tracing() -> bool:
+    """
+    Configure the tracer provider from settings.
+
+    Returns:
+        True if tracing is active
+    """
+    global _tracer, _provider, _export_file
+
+    if not settings.tracing_enabled or _tracer is not None:
+        return _tracer is not None
+    if trace is None:
+        logger.warning("Tracing enabled but opentelemetry-sdk is not installed; spans are disabled")
+        return False
+
+    exporter_name = settings.tracing_exporter.lower()
+    if exporter_name == "console":
+        exporter = ConsoleSpanExporter()
+    elif exporter_name == "file":
+        _export_file = open(settings.tracing_file, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(
+            out=_export_file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    elif exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter()  # Configured via OTEL_EXPORTER_OTLP_* variables
+    else:
+        raise ValueError(f"Unknown tracing exporter '{settings.tracing_exporter}'")
+
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": "portfolio-api",
+            "service.version": settings.app_version,
+            "deployment.environment": settings.environment,
+        }),
+        sampler=ParentBasedTraceIdRatio(settings.tracing_sample_ratio),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+    _tracer = _provider.get_tracer("app")
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _on_db_error)
+
+    logger.info(f"Tracing enabled with {exporter_name} exporter")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and close the exporter."""
+    if _provider is not None:
+        _provider.shutdown()
+    if _export_file is not None:
+        _export_file.close()
+
+
+def tracing_active() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attributes):
+    """Context manager for a child span of the current span (no-op when tracing is off)."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def record_span(name: str, start_ns: int, end_ns: Optional[int] = None, **attributes) -> None:
+    """Record a span retroactively for work that has already finished."""
+    if _tracer is None or start_ns is None:
+        return
+    finished = _tracer.start_span(name, start_time=start_ns, attributes=attributes)
+    finished.end(end_time=end_ns or time.time_ns())
+
+
+def start_server_span(method: str, path: str, headers):
+    """Start the root span for an incoming request, continuing any W3C traceparent."""
+    carrier = {name.decode("latin-1"): value.decode("latin-1") for name, value in headers}
+    return _tracer.start_as_current_span(
+        f"{method} {path}",
+        context=propagate.extract(carrier),
+        kind=trace.SpanKind.SERVER,
+        attributes={"http.method": method, "http.target": path},
+    )
+
+
+# ==================== Route Validation Spans ====================
+
+class TracedRoute(APIRoute):
+    """
+    API route that records a `request.validation` span.
+
+    The span covers body parsing, Pydantic validation and dependency resolution:
+    from the moment the route handler starts to the moment the endpoint body runs.
+    Only instruments routes when tracing is enabled at import time.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        # include_router() builds a second route from the already wrapped endpoint
+        if (settings.tracing_enabled and inspect.iscoroutinefunction(endpoint)
+                and not getattr(endpoint, "_traced", False)):
+            endpoint = self._wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _wrap_endpoint(endpoint):
+        @functools.wraps(endpoint)  # FastAPI reads the signature through __wrapped__
+        async def traced_endpoint(*args, **kwargs):
+            record_span("request.validation", _handler_started_ns.get())
+            return await endpoint(*args, **kwargs)
+        traced_endpoint._traced = True
+        return traced_endpoint
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not settings.tracing_enabled:
+            return handler
+
+        async def traced_handler(request):
+            _handler_started_ns.set(time.time_ns())
+            return await handler(request)
+        return traced_handler
+
+
+# ==================== Database Spans ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    db_span = _tracer.start_span(
+        f"db.{operation.lower()}",
+        kind=trace.SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.operation": operation,
+            "db.statement": statement[:500],
+        },
+    )
+    conn.info.setdefault("trace_spans", []).append(db_span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        db_span = spans.pop()
+        if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+            db_span.set_attribute("db.rowcount", cursor.rowcount)
+        db_span.end()
+
+
+def _on_db_error(exception_context):
+    spans = exception_context.connection.info.get("trace_spans") if exception_context.connection else None
+    if spans:
+        db_span = spans.pop()
+        db_span.record_exception(exception_context.original_exception)
+        db_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        db_span.end()
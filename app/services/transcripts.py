@@ -0,0 +1,204 @@
+"""
+Chat transcript store.
+Records every chat turn (question, answer, latency, tokens, cache hit) through an
+AsyncBatchWriter so persistence never adds latency to /api/chat/, and prunes
+turns older than the retention window.
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, delete, exists, insert, select, update
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config.database import ChatSession, ChatTurn, get_engine
+from app.config.settings import settings
+from app.services.batching import AsyncBatchWriter
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted per statement when pruning, to keep locks short
+PRUNE_CHUNK_SIZE = 5000
+
+
+class TranscriptStore:
+    """Batched chat turn persistence with retention pruning."""
+
+    def __init__(self, enabled: bool, retention_days: int, prune_interval: float):
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self.prune_interval = prune_interval
+        self.writer = AsyncBatchWriter(
+            "transcripts",
+            self._write,
+            max_batch=settings.transcript_batch_size,
+            flush_interval=settings.transcript_flush_interval_seconds,
+            max_queue=settings.transcript_max_queue,
+        )
+        self._prune_task: Optional[asyncio.Task] = None
+        self.rejected = 0  # Turns dropped because the database refused the row
+
+    def record(
+        self,
+        session_id: str,
+        question: str,
+        answer: Optional[str],
+        latency_ms: float,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        cached: bool = False,
+        streamed: bool = False,
+        success: bool = True,
+        provider: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a chat turn for persistence. Returns immediately.
+
+        Args:
+            session_id: Conversation session ID
+            question: User's question
+            answer: Answer sent back (None if the request failed)
+            latency_ms: Time spent producing the answer
+            prompt_tokens: Tokens sent to the LLM (None if unknown)
+            completion_tokens: Tokens generated by the LLM
+            cached: Answer came from the response cache
+            streamed: Answer was sent over /api/chat/stream
+            success: Request produced an answer
+            provider: LLM provider name
+        """
+        if not self.enabled:
+            return
+        self.writer.submit({
+            "session_id": session_id,
+            "created_at": datetime.now(),
+            "question": question,
+            "answer": answer,
+            "latency_ms": round(latency_ms, 2),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached": cached,
+            "streamed": streamed,
+            "success": success,
+            "provider": provider,
+        })
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self.writer.start()
+        if self.retention_days > 0 and self._prune_task is None:
+            self._prune_task = asyncio.create_task(self._prune_loop(), name="transcript-pruner")
+
+    async def stop(self) -> None:
+        """Stop pruning and flush queued turns."""
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            self._prune_task = None
+        await self.writer.stop()
+
+    # ==================== Persistence ====================
+
+    def _write(self, turns: List[Dict]) -> None:
+        """
+        Insert a batch of turns and create/update their sessions (runs in a thread).
+
+        A row the database rejects (e.g. a value too long for its column) would
+        fail the whole transaction, so the batch is split in halves until the bad
+        rows are isolated and only those are dropped.
+        """
+        try:
+            self._insert_retrying(turns)
+        except (DataError, IntegrityError) as e:
+            if len(turns) == 1:
+                self.rejected += 1
+                logger.error(f"Dropped chat turn for session {turns[0]['session_id'][:40]!r}: {e.orig}")
+                return
+            middle = len(turns) // 2
+            self._write(turns[:middle])
+            self._write(turns[middle:])
+
+    def _insert_retrying(self, turns: List[Dict]) -> None:
+        try:
+            self._insert(turns)
+        except IntegrityError:
+            # Another worker created one of these sessions since we checked; retry once
+            self._insert(turns)
+
+    @staticmethod
+    def _insert(turns: List[Dict]) -> None:
+        counts = Counter(turn["session_id"] for turn in turns)
+        started_at: Dict[str, datetime] = {}
+        for turn in turns:
+            started_at.setdefault(turn["session_id"], turn["created_at"])
+
+        with get_engine().begin() as conn:
+            existing = set(conn.scalars(
+                select(ChatSession.session_id).where(ChatSession.session_id.in_(counts))
+            ))
+            new_sessions = [
+                {"session_id": sid, "created_at": started_at[sid], "messages_count": n}
+                for sid, n in counts.items() if sid not in existing
+            ]
+            if new_sessions:
+                conn.execute(insert(ChatSession), new_sessions)
+            if existing:
+                conn.execute(
+                    update(ChatSession)
+                    .where(ChatSession.session_id == bindparam("sid"))
+                    .values(messages_count=ChatSession.messages_count + bindparam("n")),
+                    [{"sid": sid, "n": counts[sid]} for sid in existing],
+                )
+            conn.execute(insert(ChatTurn), turns)
+
+    # ==================== Retention ====================
+
+    async def _prune_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.prune)
+            except Exception as e:
+                logger.error(f"Transcript pruning failed: {e}")
+            await asyncio.sleep(self.prune_interval)
+
+    def prune(self) -> int:
+        """
+        Delete turns older than the retention window, then sessions left without turns.
+
+        Returns:
+            Number of turns deleted
+        """
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        deleted = 0
+        engine = get_engine()
+
+        while True:
+            with engine.begin() as conn:
+                expired = select(ChatTurn.id).where(ChatTurn.created_at < cutoff).limit(PRUNE_CHUNK_SIZE)
+                rowcount = conn.execute(delete(ChatTurn).where(ChatTurn.id.in_(expired))).rowcount
+            deleted += rowcount
+            if rowcount < PRUNE_CHUNK_SIZE:
+                break
+
+        with engine.begin() as conn:
+            conn.execute(
+                delete(ChatSession).where(
+                    ChatSession.created_at < cutoff,
+                    ~exists().where(ChatTurn.session_id == ChatSession.session_id),
+                )
+            )
+
+        if deleted:
+            logger.info(f"Pruned {deleted} chat turn(s) older than {self.retention_days} days")
+        return deleted
+
+
+# Global transcript store instance
+transcript_store = TranscriptStore(
+    enabled=settings.transcripts_enabled,
+    retention_days=settings.transcript_retention_days,
+    prune_interval=settings.transcript_prune_interval_seconds,
+)
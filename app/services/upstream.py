@@ -0,0 +1,423 @@
+"""
+Resilient call layer for upstream AI services.
+Wraps each call with a deadline, jittered retries, optional hedging and a circuit breaker.
+"""
+import asyncio
+import logging
+import random
+import time
+from contextlib import aclosing
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP status codes that indicate a transient upstream problem
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+async def _close(iterator: AsyncIterator) -> None:
+    """Close an async generator if it supports it."""
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+# ==================== Errors ====================
+
+class UpstreamError(Exception):
+    """Upstream call failed after all retries."""
+    status_code = 502
+
+
+class UpstreamTimeout(UpstreamError):
+    """Upstream call exceeded its deadline."""
+    status_code = 504
+
+
+class CircuitOpenError(UpstreamError):
+    """Upstream call rejected because the circuit breaker is open."""
+    status_code = 503
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Decide whether an upstream exception is worth retrying.
+
+    Timeouts, connection problems and rate-limit/5xx responses are transient.
+    Anything else (bad request, blocked content, auth) will fail again.
+    """
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+
+    # google.api_core exceptions expose the HTTP status as `code`
+    code = getattr(exc, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+# ==================== Circuit Breaker ====================
+
+class CircuitState(str, Enum):
+    """Circuit breaker state enum."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after `failure_threshold` transient failures in a row, rejects calls for
+    `reset_timeout` seconds, then lets a single probe through (half-open).
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed right now."""
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+
+        # Half-open: only one probe at a time
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != CircuitState.CLOSED:
+            logger.info("Circuit closed after successful probe")
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Free the half-open probe slot without changing state."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure and open the circuit if needed."""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                logger.warning(
+                    f"Circuit opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state for health reporting."""
+        retry_in = None
+        if self.state == CircuitState.OPEN:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+        }
+
+
+# ==================== Upstream Client ====================
+
+class UpstreamClient:
+    """Executes upstream calls with deadlines, retries, hedging and a circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        deadline: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        hedge_delay: float,
+        breaker: CircuitBreaker,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_delay = hedge_delay
+        self.breaker = breaker
+
+        self.stats = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "hedges": 0,
+            "short_circuits": 0,
+        }
+
+    @classmethod
+    def from_settings(cls, name: str) -> "UpstreamClient":
+        """Build a client configured from application settings."""
+        return cls(
+            name=name,
+            timeout=settings.upstream_timeout_seconds,
+            deadline=settings.upstream_deadline_seconds,
+            max_retries=settings.upstream_max_retries,
+            backoff_base=settings.upstream_backoff_base_seconds,
+            backoff_max=settings.upstream_backoff_max_seconds,
+            hedge_delay=settings.upstream_hedge_delay_seconds,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_timeout=settings.circuit_reset_seconds,
+            ),
+        )
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an upstream call with the full resilience policy.
+
+        Args:
+            fn: Zero-argument factory returning a fresh awaitable per attempt
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            UpstreamTimeout: The call or its overall deadline timed out
+            UpstreamError: Any other failure after retries
+        """
+        self.stats["calls"] += 1
+        probe = self._admit()
+
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.deadline
+        attempt = 0
+
+        try:
+            while True:
+                remaining = give_up_at - loop.time()
+                try:
+                    result = await self._attempt(fn, min(self.timeout, remaining))
+                except Exception as exc:
+                    backoff = self._handle_failure(exc, attempt, give_up_at - loop.time())
+                    attempt += 1
+                    await asyncio.sleep(backoff)
+                    continue
+
+                self.stats["successes"] += 1
+                self.breaker.record_success()
+                return result
+        finally:
+            if probe:
+                # Cancelled before the probe settled: let the next call probe instead
+                self.breaker.release()
+
+    async def stream(self, fn: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """
+        Stream chunks from an upstream call with the resilience policy.
+
+        Retries only happen before the first chunk arrives; once output has been
+        delivered a failure is raised to the caller. Every chunk must arrive within
+        the per-attempt timeout. Hedging does not apply to streams.
+
+        Args:
+            fn: Zero-argument factory returning a fresh async iterator per attempt
+
+        Yields:
+            Chunks from the first attempt that starts producing output
+        """
+        self.stats["calls"] += 1
+        probe = self._admit()
+
+        try:
+            async with aclosing(self._stream(fn)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            if probe:
+                # Cancelled or abandoned before the probe settled: let the next call probe instead
+                self.breaker.release()
+
+    async def _stream(self, fn: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """stream() without the probe bookkeeping."""
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.deadline
+        attempt = 0
+
+        while True:
+            iterator = fn().__aiter__()
+            remaining = give_up_at - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                first = await asyncio.wait_for(iterator.__anext__(), min(self.timeout, remaining))
+            except StopAsyncIteration:
+                self.stats["successes"] += 1
+                self.breaker.record_success()
+                return
+            except Exception as exc:
+                await _close(iterator)
+                backoff = self._handle_failure(exc, attempt, give_up_at - loop.time())
+                attempt += 1
+                await asyncio.sleep(backoff)
+                continue
+            break
+
+        try:
+            yield first
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), self.timeout)
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        except Exception as exc:
+            if isinstance(exc, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+            self.stats["failures"] += 1
+            if is_retryable(exc):
+                self.breaker.record_failure()
+            else:
+                # Caller error, not upstream degradation
+                self.breaker.release()
+            raise self._wrap(exc) from exc
+        finally:
+            await _close(iterator)
+
+        self.stats["successes"] += 1
+        self.breaker.record_success()
+
+    def _admit(self) -> bool:
+        """
+        Check the circuit breaker before a call.
+
+        Returns:
+            True if this call holds the half-open probe slot
+
+        Raises:
+            CircuitOpenError: The breaker is open
+        """
+        if not self.breaker.allow():
+            self.stats["short_circuits"] += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        return self.breaker.state == CircuitState.HALF_OPEN
+
+    def _handle_failure(self, exc: Exception, attempt: int, remaining: float) -> float:
+        """
+        Record a failed attempt and decide whether to retry.
+
+        Returns:
+            Backoff delay before the next attempt
+
+        Raises:
+            UpstreamError: The failure is final
+        """
+        retryable = is_retryable(exc)
+        if isinstance(exc, asyncio.TimeoutError):
+            self.stats["timeouts"] += 1
+
+        backoff = self._backoff(attempt + 1)
+        if not retryable or attempt >= self.max_retries or remaining <= backoff:
+            self.stats["failures"] += 1
+            if retryable:
+                self.breaker.record_failure()
+            else:
+                # Caller error, not upstream degradation
+                self.breaker.release()
+            raise self._wrap(exc) from exc
+
+        self.stats["retries"] += 1
+        logger.info(
+            f"{self.name} attempt {attempt + 1} failed ({type(exc).__name__}), "
+            f"retrying in {backoff:.2f}s"
+        )
+        return backoff
+
+    async def _attempt(self, fn: Callable[[], Awaitable[T]], timeout: float) -> T:
+        """Run one attempt, hedging with a second request if the first is slow."""
+        if timeout <= 0:
+            raise asyncio.TimeoutError()
+
+        if not self.hedge_delay or self.hedge_delay >= timeout:
+            return await asyncio.wait_for(fn(), timeout)
+
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + timeout
+        pending = {asyncio.ensure_future(fn())}
+        hedged = False
+        last_exc: Optional[BaseException] = None
+
+        try:
+            while pending:
+                wait_for = expires_at - loop.time()
+                if not hedged:
+                    wait_for = min(wait_for, self.hedge_delay)
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(wait_for, 0), return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_exc = task.exception()
+
+                if not done and not hedged and loop.time() < expires_at:
+                    # Primary is slow: fire a hedge and take whichever finishes first
+                    hedged = True
+                    self.stats["hedges"] += 1
+                    pending.add(asyncio.ensure_future(fn()))
+                elif not done:
+                    raise asyncio.TimeoutError()
+
+            raise last_exc
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _wrap(self, exc: BaseException) -> UpstreamError:
+        """Convert a raw exception into an UpstreamError subclass."""
+        if isinstance(exc, UpstreamError):
+            return exc
+        if isinstance(exc, asyncio.TimeoutError):
+            return UpstreamTimeout(f"{self.name} timed out")
+        return UpstreamError(f"{self.name} error: {exc}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current client state for health reporting."""
+        return {
+            "circuit": self.breaker.snapshot(),
+            **self.stats,
+        }
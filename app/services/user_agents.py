@@ -0,0 +1,249 @@
+"""
+User-agent enrichment.
+Parses user-agent strings into browser, OS, device class and bot flag off the
+request path: record_visit queues each newly interned user_agents row, and a
+batch writer parses it (memoized) and fills the normalized columns that the
+traffic breakdown groups by.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+
+from app.config.database import UserAgent, get_engine
+from app.config.settings import settings
+from app.services.batching import AsyncBatchWriter
+
+logger = logging.getLogger(__name__)
+
+OTHER = "Other"
+
+# ==================== Parsing ====================
+
+# Crawlers write "bot" or "Bot" as a token ending (Googlebot/2.1, AhrefsBot/7.0,
+# Slackbot-LinkExpanding). Case-sensitive so device names don't match: CUBOT is
+# a phone maker, also excluded when written "Cubot X30"
+_BOT = re.compile(
+    r"(?<![Cc][Uu])(?:bot|Bot)(?![A-Za-z0-9])"
+    r"|(?i:crawl|spider|slurp|archiver|facebookexternalhit|embedly|preview|headless"
+    r"|curl/|wget/|python-requests|python-urllib|httpx|go-http-client|okhttp|java/|libwww|scrapy)"
+)
+_BOT_NAME = re.compile(
+    r"([A-Za-z][\w-]*?(?:bot|Bot|crawler|spider))(?![A-Za-z0-9])|^(curl|wget|python-requests|scrapy)\b"
+)
+
+# First match wins, so more specific tokens come before the ones they contain
+_BROWSERS: Tuple[Tuple[re.Pattern, str], ...] = tuple((re.compile(pattern), name) for pattern, name in (
+    (r"Edg(?:e|A|iOS)?/", "Edge"),
+    (r"OPR/|Opera", "Opera"),
+    (r"SamsungBrowser/", "Samsung Internet"),
+    (r"Firefox/|FxiOS/", "Firefox"),
+    (r"CriOS/|Chrome/|Chromium/", "Chrome"),
+    (r"Version/[\d.]+.*Safari/|Mobile/\w+ Safari", "Safari"),
+    (r"MSIE |Trident/", "Internet Explorer"),
+))
+_SYSTEMS: Tuple[Tuple[re.Pattern, str], ...] = tuple((re.compile(pattern), name) for pattern, name in (
+    (r"Windows", "Windows"),
+    (r"iPhone|iPad|iPod", "iOS"),
+    (r"Android", "Android"),
+    (r"CrOS", "ChromeOS"),
+    (r"Macintosh|Mac OS X", "macOS"),
+    (r"Linux|X11", "Linux"),
+))
+_TABLET = re.compile(r"iPad|Tablet|Kindle|Silk/|PlayBook")
+_MOBILE = re.compile(r"Mobi|iPhone|iPod|Android|Windows Phone")
+
+
+def user_agent_hash(user_agent: str) -> str:
+    """Fixed-size key for a user-agent string (user_agents.ua_hash)."""
+    return hashlib.blake2b(user_agent.encode("utf-8", "replace"), digest_size=16).hexdigest()
+
+
+class UserAgentInfo(NamedTuple):
+    """Normalized fields parsed from a user-agent string."""
+    browser: str
+    os: str
+    device: str  # desktop, mobile, tablet or bot
+    is_bot: bool
+
+
+def _first_match(rules: Tuple[Tuple[re.Pattern, str], ...], user_agent: str) -> str:
+    for pattern, name in rules:
+        if pattern.search(user_agent):
+            return name
+    return OTHER
+
+
+def parse_user_agent(user_agent: str) -> UserAgentInfo:
+    """
+    Classify a user-agent string.
+
+    Bots are reported with their own name as the browser (e.g. "Googlebot").
+    Anything unrecognized is "Other"; an empty string is an unknown desktop.
+    """
+    os_name = _first_match(_SYSTEMS, user_agent)
+    if _BOT.search(user_agent):
+        match = _BOT_NAME.search(user_agent)
+        browser = (match.group(1) or match.group(2))[:32] if match else "Bot"
+        return UserAgentInfo(browser, os_name, "bot", True)
+
+    if _TABLET.search(user_agent) or (os_name == "Android" and "Mobile" not in user_agent):
+        device = "tablet"
+    elif _MOBILE.search(user_agent):
+        device = "mobile"
+    else:
+        device = "desktop"
+    return UserAgentInfo(_first_match(_BROWSERS, user_agent), os_name, device, False)
+
+
+class UserAgentParser:
+    """
+    parse_user_agent() behind an LRU cache.
+
+    Keys are user_agent_hash() digests rather than the strings themselves, so a
+    full cache holds a bounded amount of memory however long the user agents are.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, UserAgentInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, user_agent: str) -> UserAgentInfo:
+        key = user_agent_hash(user_agent)
+        with self._lock:
+            info = self._entries.get(key)
+            if info is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return info
+            self.misses += 1
+
+        info = parse_user_agent(user_agent)
+        with self._lock:
+            self._entries[key] = info
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return info
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# ==================== Enrichment ====================
+
+class UserAgentEnricher:
+    """
+    Fills UserAgent.browser/os/device/is_bot in the background.
+
+    New user agents arrive through enqueue(). At startup, rows that were never
+    parsed (migrated ones, or a queued update lost to a restart or a full queue)
+    are backfilled in chunks, oldest first.
+    """
+
+    def __init__(self, enabled: bool, cache_size: int, backfill_chunk: int):
+        self.enabled = enabled
+        self.backfill_chunk = backfill_chunk
+        self.parser = UserAgentParser(cache_size)
+        self.writer = AsyncBatchWriter(
+            "ua_enrichment",
+            self._write,
+            max_batch=settings.ua_enrichment_batch_size,
+            flush_interval=settings.ua_enrichment_flush_interval_seconds,
+            max_queue=settings.ua_enrichment_max_queue,
+        )
+        self._backfill_task: Optional[asyncio.Task] = None
+
+    def enqueue(self, user_agent_id: int, user_agent: str) -> None:
+        """Queue a new user_agents row for parsing. Returns immediately."""
+        if self.enabled:
+            self.writer.submit((user_agent_id, user_agent))
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self.writer.start()
+        if self._backfill_task is None:
+            self._backfill_task = asyncio.create_task(self._backfill(), name="ua-backfill")
+
+    async def stop(self) -> None:
+        """Stop the backfill and flush queued user agents."""
+        if self._backfill_task is not None:
+            self._backfill_task.cancel()
+            self._backfill_task = None
+        await self.writer.stop()
+
+    # ==================== Persistence ====================
+
+    def _write(self, agents: List[Tuple[int, str]]) -> None:
+        """Parse a batch of user agents and store the results (runs in a thread)."""
+        rows = []
+        for user_agent_id, user_agent in agents:
+            info = self.parser.parse(user_agent)
+            rows.append({
+                "ua_id": user_agent_id,
+                "b_browser": info.browser,
+                "b_os": info.os,
+                "b_device": info.device,
+                "b_is_bot": info.is_bot,
+            })
+        with get_engine().begin() as conn:
+            conn.execute(
+                update(UserAgent)
+                .where(UserAgent.id == bindparam("ua_id"))
+                .values(
+                    browser=bindparam("b_browser"),
+                    os=bindparam("b_os"),
+                    device=bindparam("b_device"),
+                    is_bot=bindparam("b_is_bot"),
+                ),
+                rows,
+            )
+
+    async def _backfill(self) -> None:
+        try:
+            total = 0
+            while True:
+                count = await asyncio.to_thread(self.backfill_once)
+                total += count
+                if count < self.backfill_chunk:
+                    break
+            if total:
+                logger.info(f"Backfilled parsed fields for {total} user agent(s)")
+        except Exception as e:
+            logger.error(f"User-agent backfill failed: {e}")
+
+    def backfill_once(self) -> int:
+        """
+        Enrich one chunk of user agents that have no parsed fields yet.
+
+        Returns:
+            Number of user agents updated
+        """
+        with get_engine().connect() as conn:
+            pending = conn.execute(
+                select(UserAgent.id, UserAgent.user_agent)
+                .where(UserAgent.device.is_(None))
+                .order_by(UserAgent.id)
+                .limit(self.backfill_chunk)
+            ).all()
+        if pending:
+            self._write([tuple(row) for row in pending])
+        return len(pending)
+
+
+# Global user-agent enricher instance
+ua_enricher = UserAgentEnricher(
+    enabled=settings.ua_enrichment_enabled,
+    cache_size=settings.ua_cache_size,
+    backfill_chunk=settings.ua_backfill_chunk_size,
+)
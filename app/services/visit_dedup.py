@@ -0,0 +1,220 @@
+"""
+Ingestion-side deduplication for visit tracking.
+Repeat page views (refreshes, client retries, re-renders) are recognized in memory
+with idempotency keys and a time-bucketed Bloom filter, so they never reach the
+database and never need a lookup query.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter sized for `capacity` items at `error_rate` false positives.
+
+    Uses double hashing over a 128-bit BLAKE2b digest: k positions cost one hash.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str) -> None:
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def estimated_error_rate(self) -> float:
+        """Current false-positive probability given the number of items added."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class RotatingBloomFilter:
+    """
+    Bloom filter for "seen in this time bucket?" that starts fresh every bucket.
+
+    Memory is bounded by the traffic of one bucket. If a bucket sees more than
+    `capacity` distinct keys a new slice is added (a scalable Bloom filter), so
+    the false-positive rate stays bounded by slices x error_rate instead of
+    degrading silently.
+    """
+
+    def __init__(self, bucket_seconds: int, capacity: int, error_rate: float):
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bucket: Optional[int] = None
+        self.slices: List[BloomFilter] = []
+
+    def current_bucket(self, now: Optional[float] = None) -> int:
+        return int((now if now is not None else time.time()) // self.bucket_seconds)
+
+    def _rotate(self, now: Optional[float]) -> None:
+        bucket = self.current_bucket(now)
+        if bucket != self.bucket:
+            self.bucket = bucket
+            self.slices = [BloomFilter(self.capacity, self.error_rate)]
+
+    def contains(self, key: str, now: Optional[float] = None) -> bool:
+        """True if key was (probably) already added in the current bucket."""
+        self._rotate(now)
+        return any(key in bloom for bloom in self.slices)
+
+    def add(self, key: str, now: Optional[float] = None) -> None:
+        """Record key in the current bucket."""
+        self._rotate(now)
+        if self.slices[-1].count >= self.capacity:
+            self.slices.append(BloomFilter(self.capacity, self.error_rate))
+        self.slices[-1].add(key)
+
+    def check_and_add(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Record key in the current bucket.
+
+        Returns:
+            True if key was (probably) already seen in this bucket
+        """
+        if self.contains(key, now):
+            return True
+        self.add(key, now)
+        return False
+
+    def snapshot(self) -> Dict:
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "slices": len(self.slices),
+            "keys": sum(bloom.count for bloom in self.slices),
+            "memory_bytes": sum(len(bloom.bits) for bloom in self.slices),
+            "estimated_error_rate": round(
+                1 - math.prod(1 - bloom.estimated_error_rate() for bloom in self.slices), 6
+            ),
+        }
+
+
+class IdempotencyKeys:
+    """Idempotency keys seen within a TTL (bounded LRU)."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        """True if key was used within the TTL."""
+        seen_at = self._seen.get(key)
+        return seen_at is not None and time.monotonic() - seen_at <= self.ttl
+
+    def add(self, key: str) -> None:
+        self._seen[key] = time.monotonic()
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+    def check_and_add(self, key: str) -> bool:
+        """Returns True if key was already used within the TTL."""
+        if key in self:
+            return True
+        self.add(key)
+        return False
+
+
+class VisitDeduplicator:
+    """
+    Decide whether a visit is a repeat before it is written.
+
+    Two stages, both in memory per worker:
+    1. Idempotency-Key header: exact replays of the same request (client retries).
+    2. Bloom filter on (ip_hash, page, time bucket): refreshes and re-renders by
+       the same visitor within the bucket.
+
+    Error bound: a genuinely new visit is wrongly dropped with probability at most
+    about `error_rate` per filter slice (0.1% by default), so unique-visitor and
+    visit counts are undercounted by at most that fraction in expectation. Repeats
+    are never over-admitted within a worker; with several workers, a repeat routed
+    to a different worker is stored (counts can only err on the high side by that).
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        bucket_seconds: int,
+        capacity: int,
+        error_rate: float,
+        idempotency_ttl: float,
+    ):
+        self.enabled = enabled
+        self.bloom = RotatingBloomFilter(bucket_seconds, capacity, error_rate)
+        self.idempotency = IdempotencyKeys(ttl=idempotency_ttl, max_entries=capacity)
+        self._lock = threading.Lock()
+        self.stats = {"accepted": 0, "idempotent_replays": 0, "bucket_repeats": 0}
+
+    def is_duplicate(self, ip_hash: Optional[str], page: str, idempotency_key: Optional[str] = None) -> bool:
+        """
+        Check whether a visit repeats one already stored.
+
+        Nothing is remembered here: call remember() once the visit has been
+        written, so a failed insert can be retried with the same key.
+
+        Args:
+            ip_hash: Hashed client IP
+            page: Page path visited
+            idempotency_key: Value of the Idempotency-Key header, if sent
+
+        Returns:
+            True if the visit should not be stored
+        """
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            if idempotency_key and f"{ip_hash}:{idempotency_key}" in self.idempotency:
+                self.stats["idempotent_replays"] += 1
+                return True
+            if ip_hash and self.bloom.contains(f"{ip_hash}\x1f{page}"):
+                self.stats["bucket_repeats"] += 1
+                return True
+            return False
+
+    def remember(self, ip_hash: Optional[str], page: str, idempotency_key: Optional[str] = None) -> None:
+        """Mark a stored visit so its repeats are recognized (same arguments as is_duplicate)."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if idempotency_key:
+                self.idempotency.add(f"{ip_hash}:{idempotency_key}")
+            if ip_hash:
+                self.bloom.add(f"{ip_hash}\x1f{page}")
+            self.stats["accepted"] += 1
+
+    def snapshot(self) -> Dict:
+        return {**self.stats, "filter": self.bloom.snapshot()}
+
+
+# Global visit deduplicator instance
+visit_deduplicator = VisitDeduplicator(
+    enabled=settings.visit_dedup_enabled,
+    bucket_seconds=settings.visit_dedup_bucket_seconds,
+    capacity=settings.visit_dedup_capacity,
+    error_rate=settings.visit_dedup_error_rate,
+    idempotency_ttl=settings.visit_idempotency_ttl_seconds,
+)
@@ -0,0 +1,42 @@
+"""
+Gunicorn worker class for production (see gunicorn.conf.py).
+Extends uvicorn's worker with a graceful drain: in-flight chat streams get a
+deadline to finish, and the lifespan shutdown hooks (buffer flushes) always run
+before gunicorn's graceful timeout kills the process.
+"""
+import math
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from app.config.settings import settings
+from app.services.lifecycle import lifecycle
+
+
+class DrainingServer(Server):
+    """Uvicorn server that tells the app it is draining as soon as shutdown starts."""
+
+    async def shutdown(self, sockets=None) -> None:
+        lifecycle.begin_drain()
+        await super().shutdown(sockets=sockets)
+
+
+class PortfolioWorker(UvicornWorker):
+    """UvicornWorker with a bounded connection drain."""
+
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        # Streams end at the drain deadline; the rest of graceful_timeout is for shutdown hooks
+        "timeout_graceful_shutdown": math.ceil(settings.stream_drain_seconds) + 2,
+    }
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
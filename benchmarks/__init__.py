@@ -0,0 +1,4 @@
+"""
+Benchmarks for the portfolio backend.
+Run modules from the repository root, e.g. `python -m benchmarks.bench_serialization`.
+"""
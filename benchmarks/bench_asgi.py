@@ -0,0 +1,145 @@
+"""
+In-process ASGI micro-benchmarks (pytest-benchmark).
+
+Measures per-request overhead of each router, of the middleware/exception-handler
+stack (full app vs bare router for the same endpoint), and of ChatRequest validation
+with large conversation histories.
+
+Usage (from the repository root):
+    pytest benchmarks/bench_asgi.py --benchmark-disable-gc --benchmark-min-rounds=200
+    pytest benchmarks/bench_asgi.py -k middleware --benchmark-autosave
+    pytest-benchmark compare 0001 0002
+"""
+import itertools
+import json
+
+import pytest
+
+from app.models.schemas import ChatRequest
+
+_unique = itertools.count()
+
+
+def _check(result, expected_status):
+    status, _ = result
+    assert status == expected_status, f"expected {expected_status}, got {status}"
+
+
+# ==================== Routers ====================
+
+@pytest.mark.benchmark(group="router-root")
+def test_root(benchmark, call):
+    _check(benchmark(call, "GET", "/"), 200)
+
+
+@pytest.mark.benchmark(group="router-root")
+def test_health(benchmark, call):
+    _check(benchmark(call, "GET", "/health"), 200)
+
+
+@pytest.mark.benchmark(group="router-root")
+def test_root_not_modified(benchmark, call):
+    _check(benchmark(call, "GET", "/", headers={"If-None-Match": "*"}), 304)
+
+
+@pytest.mark.benchmark(group="router-chat")
+def test_chat_examples(benchmark, call):
+    _check(benchmark(call, "GET", "/api/chat/examples"), 200)
+
+
+@pytest.mark.benchmark(group="router-chat")
+def test_chat_examples_not_modified(benchmark, call):
+    _check(benchmark(call, "GET", "/api/chat/examples", headers={"If-None-Match": "*"}), 304)
+
+
+@pytest.mark.benchmark(group="router-chat")
+def test_chat_cached(benchmark, call):
+    body = {"message": "What is Howard's background and education?"}
+    call("POST", "/api/chat/", body)  # Prime the response cache
+    _check(benchmark(call, "POST", "/api/chat/", body), 200)
+
+
+@pytest.mark.benchmark(group="router-chat")
+def test_chat_uncached_stub(benchmark, call):
+    # Unique question per round: full pipeline through the zero-latency stub provider
+    result = benchmark(lambda: call("POST", "/api/chat/", {"message": f"Question {next(_unique)}"}))
+    _check(result, 200)
+
+
+@pytest.mark.benchmark(group="router-analytics")
+def test_analytics_visit(benchmark, call):
+    body = {"page_visited": "/", "user_agent": "Mozilla/5.0 (bench)"}
+    _check(benchmark(call, "POST", "/api/analytics/visit", body), 200)
+
+
+@pytest.mark.benchmark(group="router-analytics")
+def test_analytics_stats(benchmark, call):
+    _check(benchmark(call, "GET", "/api/analytics/stats"), 200)
+
+
+@pytest.mark.benchmark(group="router-analytics")
+def test_analytics_recent(benchmark, call):
+    _check(benchmark(call, "GET", "/api/analytics/recent", query="limit=50"), 200)
+
+
+@pytest.mark.benchmark(group="router-resume")
+def test_resume_preview(benchmark, call):
+    _check(benchmark(call, "GET", "/api/resume/preview"), 200)
+
+
+@pytest.mark.benchmark(group="router-resume")
+def test_resume_invalid_token(benchmark, call):
+    # HTTPException path through the exception handlers
+    _check(benchmark(call, "GET", "/api/resume/download", query="token=invalid"), 403)
+
+
+# ==================== Middleware Stack ====================
+
+@pytest.mark.benchmark(group="middleware")
+def test_middleware_full_stack(benchmark, call):
+    _check(benchmark(call, "GET", "/api/chat/examples"), 200)
+
+
+@pytest.mark.benchmark(group="middleware")
+def test_middleware_bare_router(benchmark, call_router):
+    # Same endpoint without CORS, compression, metrics or exception middleware
+    _check(benchmark(call_router, "GET", "/api/chat/examples"), 200)
+
+
+@pytest.mark.benchmark(group="middleware")
+def test_middleware_cors_preflight(benchmark, call):
+    headers = {"access-control-request-method": "POST", "access-control-request-headers": "content-type"}
+    _check(benchmark(call, "OPTIONS", "/api/chat/", headers=headers), 200)
+
+
+@pytest.mark.benchmark(group="middleware")
+def test_middleware_not_found(benchmark, call):
+    _check(benchmark(call, "GET", "/api/does-not-exist"), 404)
+
+
+# ==================== Validation ====================
+
+def _history_payload(messages: int) -> bytes:
+    history = [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": "Tell me more about Howard's cloud infrastructure experience. " * 4,
+        }
+        for i in range(messages)
+    ]
+    return json.dumps({"message": "And his HPC work?", "conversation_history": history}).encode()
+
+
+@pytest.mark.benchmark(group="validation")
+@pytest.mark.parametrize("messages", [0, 10, 100, 1000])
+def test_validate_chat_request(benchmark, messages):
+    payload = _history_payload(messages)
+    request = benchmark(ChatRequest.model_validate_json, payload)
+    assert len(request.conversation_history) == messages
+
+
+@pytest.mark.benchmark(group="validation-endpoint")
+@pytest.mark.parametrize("messages", [10, 1000])
+def test_chat_endpoint_large_history(benchmark, call, messages):
+    body = json.loads(_history_payload(messages))
+    _check(benchmark(call, "POST", "/api/chat/", body), 200)
@@ -0,0 +1,133 @@
+"""
+CORS/error middleware micro-benchmarks (pytest-benchmark).
+
+Compares the previous setup (Starlette's CORSMiddleware, with the 500 handler
+adding CORS headers itself) against app.middleware.CORSMiddleware, around a
+trivial endpoint so only the middleware cost is measured.
+
+Usage (from the repository root):
+    pytest benchmarks/bench_cors.py --benchmark-disable-gc --benchmark-min-rounds=500
+"""
+import logging
+from contextlib import suppress
+
+import pytest
+from starlette.middleware.cors import CORSMiddleware as StarletteCORSMiddleware
+from starlette.middleware.errors import ServerErrorMiddleware
+from starlette.responses import JSONResponse
+
+from app.config.settings import settings
+from app.middleware import CORSMiddleware
+
+from .conftest import ORIGIN, ASGICaller
+
+BODY = b'{"ok":true}'
+PREFLIGHT = {"access-control-request-method": "POST", "access-control-request-headers": "content-type"}
+
+
+async def endpoint(scope, receive, send):
+    if scope["path"] == "/error":
+        raise RuntimeError("boom")
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", b"11")],
+    })
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def previous_error_handler(request, exc):
+    """The exception handler app/main.py used before, CORS headers included."""
+    response = JSONResponse(status_code=500, content={"detail": "Internal server error"})
+    origin = request.headers.get("origin")
+    if origin in settings.cors_origins:
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        response.headers["Access-Control-Allow-Methods"] = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+        response.headers["Access-Control-Allow-Headers"] = "*"
+    return response
+
+
+def previous_stack():
+    cors = StarletteCORSMiddleware(
+        endpoint,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Content-Disposition"],
+    )
+    return ServerErrorMiddleware(cors, handler=previous_error_handler)
+
+
+def current_stack():
+    cors = CORSMiddleware(
+        endpoint,
+        allow_origins=settings.cors_origins,
+        expose_headers=["Content-Disposition"],
+        max_age=settings.cors_max_age_seconds,
+    )
+    return ServerErrorMiddleware(cors)
+
+
+STACKS = {"previous": previous_stack, "current": current_stack}
+
+# Both stacks log the traceback of an unhandled error (the previous one via the
+# server, after ServerErrorMiddleware re-raises); keep logging out of the timing
+logging.getLogger("app.middleware.cors").disabled = True
+
+
+def server(app):
+    """What the ASGI server does with an exception that escapes the app."""
+    async def call(scope, receive, send):
+        with suppress(Exception):
+            await app(scope, receive, send)
+    return call
+
+
+@pytest.fixture(params=list(STACKS))
+def stack(request, loop):
+    return ASGICaller(server(STACKS[request.param]()), loop)
+
+
+def _check(result, expected_status):
+    status, _ = result
+    assert status == expected_status, f"expected {expected_status}, got {status}"
+
+
+@pytest.mark.benchmark(group="cors-simple")
+def test_cors_simple_request(benchmark, stack):
+    _check(benchmark(stack, "GET", "/"), 200)
+
+
+@pytest.mark.benchmark(group="cors-preflight")
+def test_cors_preflight(benchmark, stack):
+    _check(benchmark(stack, "OPTIONS", "/", headers=PREFLIGHT), 200)
+
+
+@pytest.mark.benchmark(group="cors-error")
+def test_cors_unhandled_error(benchmark, stack):
+    _check(benchmark(stack, "GET", "/error"), 500)
+
+
+def test_cors_headers_match(loop):
+    """Both stacks send the same CORS headers for an allowed origin."""
+    for build in STACKS.values():
+        app = build()
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        scope = {
+            "type": "http", "method": "GET", "path": "/", "raw_path": b"/", "query_string": b"",
+            "root_path": "", "headers": [(b"origin", ORIGIN.encode())], "scheme": "http",
+            "server": ("bench", 80), "client": ("127.0.0.1", 1), "asgi": {"version": "3.0"},
+        }
+        loop.run_until_complete(app(scope, receive, send))
+        headers = dict(sent[0]["headers"])
+        assert headers[b"access-control-allow-origin"] == ORIGIN.encode()
+        assert headers[b"access-control-allow-credentials"] == b"true"
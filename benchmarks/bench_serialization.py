@@ -0,0 +1,87 @@
+"""
+Serialization throughput benchmark for API responses.
+
+Compares FastAPI's default path (model -> jsonable_encoder -> JSONResponse) with
+FastJSONResponse for large chat answers and long visit lists.
+
+Usage:
+    python -m benchmarks.bench_serialization [--repeat 5] [--visits 1000]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.schemas import ChatResponse, RecentVisit, RecentVisits, VisitorStats
+from app.responses import FastJSONResponse
+
+MARKDOWN_PARAGRAPH = (
+    "**Howard** built an HPC simulation pipeline with OMNeT++ and Python, "
+    "cutting analysis time by 40%. See [the repo](https://github.com/yehao622) for details.\n\n"
+    "- Cloud infrastructure on AWS with Docker and Kubernetes\n"
+    "- Observability with Prometheus and Grafana\n\n"
+)
+
+
+def build_payloads(chat_kb: int, visit_count: int):
+    """Build representative response models."""
+    answer = (MARKDOWN_PARAGRAPH * (chat_kb * 1024 // len(MARKDOWN_PARAGRAPH) + 1))[:chat_kb * 1024]
+    chat = ChatResponse(
+        response=answer,
+        session_id="2f6c3a38-0f0e-4a43-9a57-4d5a3f0c9e11",
+        tokens_used=len(answer.split()),
+    )
+
+    now = datetime.now()
+    visits = RecentVisits(visits=[
+        RecentVisit(
+            page="/projects/hpc-smartops",
+            date=now - timedelta(minutes=i),
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebK",
+        )
+        for i in range(visit_count)
+    ])
+
+    stats = VisitorStats(total_visitors=12345, total_visits=67890, recent_visits=321)
+    return {"chat_answer": chat, "recent_visits": visits, "visitor_stats": stats}
+
+
+def default_path(model):
+    """What FastAPI does for a returned model with response_model set."""
+    return JSONResponse(jsonable_encoder(model.model_dump())).body
+
+
+def fast_path(model):
+    """FastJSONResponse straight from the model."""
+    return FastJSONResponse(model).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    parser.add_argument("--chat-kb", type=int, default=8, help="Size of the chat answer in KB")
+    parser.add_argument("--visits", type=int, default=1000, help="Number of entries in the visit list")
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.chat_kb, args.visits)
+
+    print(f"{'payload':<16} {'bytes':>9} {'default ops/s':>14} {'fast ops/s':>12} {'speedup':>8}")
+    for name, model in payloads.items():
+        size = len(fast_path(model))
+        results = {}
+        for label, fn in (("default", default_path), ("fast", fast_path)):
+            timer = timeit.Timer(lambda: fn(model))
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+            results[label] = 1 / best
+
+        print(
+            f"{name:<16} {size:>9} {results['default']:>14,.0f} {results['fast']:>12,.0f} "
+            f"{results['fast'] / results['default']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
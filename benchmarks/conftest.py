@@ -0,0 +1,123 @@
+"""
+Fixtures for the in-process ASGI micro-benchmarks.
+
+Requests are fed straight into the ASGI callable with a hand-built scope, so the
+numbers contain no socket, HTTP parsing or client library overhead.
+"""
+import asyncio
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+_db_dir = tempfile.mkdtemp(prefix="portfolio-bench-")
+
+# Must be set before anything imports app.config.settings
+os.environ.update({
+    "AI_PROVIDER": "stub",
+    "STUB_FIRST_TOKEN_MS": "0",
+    "STUB_TOKEN_MS": "0",
+    "STUB_RESPONSE_TOKENS": "150",
+    "DATABASE_URL": f"sqlite:///{os.path.join(_db_dir, 'bench.db')}",
+    "RATE_LIMIT_ENABLED": "false",
+    "WARMUP_ON_STARTUP": "false",
+})
+
+ORIGIN = "http://localhost:3000"
+
+
+class ASGICaller:
+    """Synchronous wrapper that runs one request through an ASGI app."""
+
+    def __init__(self, app, loop: asyncio.AbstractEventLoop, root_app=None):
+        self.app = app
+        self.loop = loop
+        self.root_app = root_app or app
+
+    def __call__(
+        self,
+        method: str,
+        path: str,
+        body: Optional[dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        query: str = "",
+    ) -> Tuple[int, bytes]:
+        return self.loop.run_until_complete(self.request(method, path, body, headers, query))
+
+    async def request(self, method, path, body=None, headers=None, query="") -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        raw_headers: List[Tuple[bytes, bytes]] = [(b"host", b"bench"), (b"origin", ORIGIN.encode())]
+        if body is not None:
+            raw_headers += [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        for name, value in (headers or {}).items():
+            raw_headers.append((name.lower().encode(), value.encode()))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+            "app": self.root_app,
+        }
+
+        received = False
+
+        async def receive():
+            nonlocal received
+            if received:
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+
+        status = 0
+        chunks = []
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+
+@pytest.fixture(scope="session")
+def loop():
+    event_loop = asyncio.new_event_loop()
+    yield event_loop
+    event_loop.close()
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.config.database import init_db
+    from app.main import app as fastapi_app
+
+    init_db()
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def call(app, loop):
+    """Run a request through the full middleware stack."""
+    return ASGICaller(app, loop)
+
+
+@pytest.fixture(scope="session")
+def call_router(app, loop):
+    """Run a request through the bare router, skipping all middleware and exception handlers."""
+    return ASGICaller(app.router, loop, root_app=app)
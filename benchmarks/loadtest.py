@@ -0,0 +1,305 @@
+"""
+Asyncio load generator for the portfolio API.
+
+Drives a running server (or the app in-process) with either a closed loop of
+`--concurrency` workers or an open-loop Poisson arrival rate (`--rate`), then
+reports p50/p95/p99 latency and throughput per scenario. Results can be saved as
+JSON baselines and compared against a previous run.
+
+Open-loop latency is measured from each request's scheduled start, so a slow
+server cannot hide queueing delay (no coordinated omission).
+
+Fully offline run against the stub LLM and a local SQLite database:
+    AI_PROVIDER=stub DATABASE_URL=sqlite:///./bench.db RATE_LIMIT_ENABLED=false \\
+        python -m benchmarks.loadtest mixed --in-process --duration 20 --rate 200
+
+Against a running server, saving a baseline and comparing later:
+    python -m benchmarks.loadtest chat --url http://localhost:8000 --concurrency 32 \\
+        --output benchmarks/baselines/chat.json
+    python -m benchmarks.loadtest chat --compare benchmarks/baselines/chat.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.scenarios import RequestSpec, Scenario, resolve
+
+
+# ==================== Statistics ====================
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    """Collects per-scenario latencies and outcomes."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, scenario: Scenario, status: Optional[int], latency: float) -> None:
+        if status is None:
+            self.statuses[scenario.name]["exception"] += 1
+            self.errors[scenario.name] += 1
+            return
+        self.statuses[scenario.name][str(status)] += 1
+        if status in scenario.ok_statuses:
+            self.latencies[scenario.name].append(latency)
+        else:
+            self.errors[scenario.name] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        results = {}
+        for name in sorted(self.statuses):
+            values = sorted(self.latencies[name])
+            total = sum(self.statuses[name].values())
+            results[name] = {
+                "requests": total,
+                "errors": self.errors[name],
+                "error_rate": round(self.errors[name] / total, 4) if total else 0.0,
+                "throughput_rps": round(total / elapsed, 2),
+                "latency_ms": {
+                    "mean": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+                    "p50": round(percentile(values, 50) * 1000, 2),
+                    "p95": round(percentile(values, 95) * 1000, 2),
+                    "p99": round(percentile(values, 99) * 1000, 2),
+                    "max": round(values[-1] * 1000, 2) if values else 0.0,
+                },
+                "statuses": dict(self.statuses[name]),
+            }
+        return results
+
+
+# ==================== Load Generation ====================
+
+async def send(client: httpx.AsyncClient, spec: RequestSpec) -> int:
+    """Send one request and read the full body (including streams)."""
+    async with client.stream(
+        spec.method, spec.path, json=spec.json, params=spec.params, headers=spec.headers
+    ) as response:
+        async for _ in response.aiter_raw():
+            pass
+        return response.status_code
+
+
+def pick(weighted: List[Tuple[Scenario, float]], rng: random.Random) -> Scenario:
+    return rng.choices([s for s, _ in weighted], weights=[w for _, w in weighted])[0]
+
+
+async def run_closed_loop(client, weighted, recorder, concurrency, duration, seed):
+    """`concurrency` workers each send back-to-back requests until time is up."""
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        while time.perf_counter() < deadline:
+            scenario = pick(weighted, rng)
+            spec = scenario.build(rng)
+            started = time.perf_counter()
+            try:
+                status = await send(client, spec)
+            except Exception:
+                status = None
+            recorder.record(scenario, status, time.perf_counter() - started)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+async def run_open_loop(client, weighted, recorder, rate, duration, max_in_flight, seed):
+    """Start requests on a Poisson schedule regardless of how fast responses come back."""
+    rng = random.Random(seed)
+    limiter = asyncio.Semaphore(max_in_flight)
+    tasks = set()
+    start = time.perf_counter()
+    next_at = start
+
+    async def one(scenario: Scenario, spec: RequestSpec, scheduled: float):
+        async with limiter:
+            try:
+                status = await send(client, spec)
+            except Exception:
+                status = None
+        recorder.record(scenario, status, time.perf_counter() - scheduled)
+
+    while next_at < start + duration:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        scenario = pick(weighted, rng)
+        task = asyncio.create_task(one(scenario, scenario.build(rng), next_at))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        next_at += rng.expovariate(rate)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+def build_client(args) -> Tuple[httpx.AsyncClient, object]:
+    """Return an HTTP client and, for in-process runs, the ASGI app."""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout), None
+
+    # Offline defaults; explicit environment variables win
+    os.environ.setdefault("AI_PROVIDER", "stub")
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    from app.config.database import init_db
+    from app.main import app
+
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=timeout), app
+
+
+async def run(args) -> dict:
+    weighted = resolve(args.scenario)
+    client, app = build_client(args)
+    recorder = Recorder()
+
+    async with client:
+        lifespan = app.router.lifespan_context(app) if app is not None else None
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            if args.warmup:
+                await run_closed_loop(client, weighted, Recorder(), args.concurrency, args.warmup, args.seed)
+
+            started = time.perf_counter()
+            if args.rate:
+                await run_open_loop(
+                    client, weighted, recorder, args.rate, args.duration, args.max_in_flight, args.seed
+                )
+            else:
+                await run_closed_loop(client, weighted, recorder, args.concurrency, args.duration, args.seed)
+            elapsed = time.perf_counter() - started
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+
+    scenarios = recorder.summary(elapsed)
+    total = sum(s["requests"] for s in scenarios.values())
+    return {
+        "scenario": args.scenario,
+        "config": {
+            "mode": "open" if args.rate else "closed",
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "target": "in-process" if args.in_process else args.url,
+            "ai_provider": os.environ.get("AI_PROVIDER"),
+        },
+        "environment": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / elapsed, 2),
+        "scenarios": scenarios,
+    }
+
+
+# ==================== Reporting ====================
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_report(result: dict) -> None:
+    config = result["config"]
+    print(f"\nScenario: {result['scenario']}  mode={config['mode']}  target={config['target']}  "
+          f"commit={result['environment']['commit']}")
+    print(f"{'name':<18} {'reqs':>7} {'err%':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in result["scenarios"].items():
+        lat = stats["latency_ms"]
+        print(f"{name:<18} {stats['requests']:>7} {stats['error_rate'] * 100:>5.1f}% "
+              f"{stats['throughput_rps']:>9.1f} {lat['p50']:>9.2f} {lat['p95']:>9.2f} {lat['p99']:>9.2f}")
+    print(f"{'total':<18} {result['total_requests']:>7} {'':>6} {result['throughput_rps']:>9.1f}")
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> bool:
+    """Print deltas against a baseline. Returns False if any p95/p99 regressed past threshold."""
+    print(f"\nCompared with baseline {baseline['environment'].get('commit')} "
+          f"({baseline['environment'].get('timestamp')}):")
+    ok = True
+    for name, stats in result["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for metric in ("p50", "p95", "p99"):
+            old, new = base["latency_ms"][metric], stats["latency_ms"][metric]
+            change = (new - old) / old if old else 0.0
+            flag = ""
+            if metric != "p50" and change > threshold:
+                flag, ok = "  REGRESSION", False
+            print(f"  {name:<18} {metric}: {old:>9.2f} -> {new:>9.2f} ms ({change:+.1%}){flag}")
+        old_rps, new_rps = base["throughput_rps"], stats["throughput_rps"]
+        print(f"  {name:<18} rps: {old_rps:>9.1f} -> {new_rps:>9.1f}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="Scenario or mix: chat, chat_stream, visit, stats, resume_download, homepage, mixed")
+    parser.add_argument("--url", default="http://localhost:8000", help="Server base URL")
+    parser.add_argument("--in-process", action="store_true", help="Drive app.main:app in-process (no sockets)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured warm-up seconds")
+    parser.add_argument("--concurrency", type=int, default=16, help="Closed-loop workers")
+    parser.add_argument("--rate", type=float, default=0.0, help="Open-loop arrival rate (req/s); 0 = closed loop")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open-loop cap on concurrent requests")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for request generation")
+    parser.add_argument("--output", help="Write the JSON result to this path")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed p95/p99 regression (fraction)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Throughput scaling across gunicorn worker counts.
+
+Starts the production launcher (`gunicorn -c gunicorn.conf.py`) once per worker
+count on a local port, drives it with the closed-loop load generator from
+benchmarks.loadtest, and reports throughput, p95 and parallel efficiency
+relative to a single worker.
+
+    AI_PROVIDER=stub STUB_FIRST_TOKEN_MS=0 STUB_TOKEN_MS=0 \\
+        python -m benchmarks.scaling mixed --workers 1 2 4 --concurrency 64 --duration 15
+
+The load generator is a single Python process and competes with the server for
+CPU. --client-cpus pins the generator to those cores and the server to all the
+others (don't wrap the command in `taskset`: gunicorn would inherit the same
+cores). For more than a few workers, run the generator from another machine
+with `python -m benchmarks.loadtest --url`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Optional, Set
+
+import httpx
+
+from benchmarks.loadtest import run as run_load
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def split_cpus(client_cpus: Optional[list]) -> Optional[Set[int]]:
+    """Pin this process to client_cpus; return the cores left for the server."""
+    if not client_cpus:
+        return None
+    available = os.sched_getaffinity(0)
+    client = set(client_cpus)
+    server = available - client
+    if not client <= available or not server:
+        raise SystemExit(f"--client-cpus {sorted(client)} must leave at least one of {sorted(available)} for the server")
+    os.sched_setaffinity(0, client)
+    return server
+
+
+def start_server(workers: int, port: int, cpus: Optional[Set[int]] = None) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Children inherit our affinity; give the server its own cores instead
+        preexec_fn=(lambda: os.sched_setaffinity(0, cpus)) if cpus else None,
+    )
+
+
+def wait_ready(port: int, workers: int, timeout: float = 60.0) -> None:
+    """Wait until /health answers (and give the remaining workers time to boot)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                time.sleep(0.5 * workers)
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server with {workers} worker(s) did not become ready in {timeout}s")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def measure(args, workers: int, server_cpus: Optional[Set[int]]) -> dict:
+    process = start_server(workers, args.port, server_cpus)
+    try:
+        wait_ready(args.port, workers)
+        load_args = argparse.Namespace(
+            scenario=args.scenario,
+            url=f"http://127.0.0.1:{args.port}",
+            in_process=False,
+            duration=args.duration,
+            warmup=args.warmup,
+            concurrency=args.concurrency,
+            rate=0.0,
+            max_in_flight=args.concurrency,
+            timeout=60.0,
+            seed=args.seed,
+        )
+        return asyncio.run(run_load(load_args))
+    finally:
+        stop_server(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="Scenario or mix from benchmarks/scenarios.py")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to measure")
+    parser.add_argument("--concurrency", type=int, default=64, help="Closed-loop clients")
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds per worker count")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured warm-up seconds")
+    parser.add_argument("--port", type=int, default=8091, help="Local port for the server under test")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for request generation")
+    parser.add_argument("--output", help="Write all results as JSON to this path")
+    parser.add_argument(
+        "--client-cpus", type=int, nargs="+",
+        help="Pin the load generator to these cores and the server to the rest (Linux)",
+    )
+    args = parser.parse_args()
+    server_cpus = split_cpus(args.client_cpus)
+
+    # Offline defaults; explicit environment variables win
+    os.environ.setdefault("AI_PROVIDER", "stub")
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("METRICS_ENABLED", "false")
+
+    from app.config.database import init_db
+    init_db()
+
+    results = {}
+    for workers in args.workers:
+        print(f"Measuring {workers} worker(s)...", flush=True)
+        results[workers] = measure(args, workers, server_cpus)
+
+    base_rps = results[args.workers[0]]["throughput_rps"] / args.workers[0]
+    cpus = f"{len(server_cpus)} server" if server_cpus else str(os.cpu_count())
+    print(f"\nScenario: {args.scenario}  concurrency={args.concurrency}  cpus={cpus}")
+    print(f"{'workers':>7} {'rps':>9} {'speedup':>8} {'efficiency':>10} {'p95 ms':>9} {'p99 ms':>9} {'err%':>6}")
+    for workers, result in results.items():
+        rps = result["throughput_rps"]
+        stats = list(result["scenarios"].values())
+        p95 = max(s["latency_ms"]["p95"] for s in stats)
+        p99 = max(s["latency_ms"]["p99"] for s in stats)
+        errors = sum(s["error_rate"] * s["requests"] for s in stats) / max(result["total_requests"], 1)
+        speedup = rps / base_rps if base_rps else 0.0
+        print(f"{workers:>7} {rps:>9.1f} {speedup:>7.2f}x {speedup / workers:>9.0%} "
+              f"{p95:>9.2f} {p99:>9.2f} {errors * 100:>5.1f}%")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({str(k): v for k, v in results.items()}, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
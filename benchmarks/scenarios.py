@@ -0,0 +1,108 @@
+"""
+Load test scenarios.
+Each scenario describes one request type; mixes combine them with weights.
+"""
+import base64
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+BROWSER_UA = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.4 Safari/605.1.15"
+)
+
+QUESTIONS = [
+    "What is Howard's background and education?",
+    "Tell me about Howard's HPC simulation project",
+    "What experience does Howard have with cloud infrastructure?",
+    "What programming languages and technologies does Howard know?",
+    "What types of roles is Howard seeking?",
+    "Can you describe Howard's Smart Home Energy project?",
+]
+
+PAGES = ["/", "/projects", "/projects/hpc-smartops", "/projects/smart-home", "/resume"]
+
+
+@dataclass
+class RequestSpec:
+    """A single HTTP request to send."""
+    method: str
+    path: str
+    json: Optional[dict] = None
+    params: Optional[dict] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    """A named request generator and the statuses that count as success."""
+    name: str
+    build: Callable[[random.Random], RequestSpec]
+    ok_statuses: Tuple[int, ...] = (200,)
+
+
+def _chat(rng: random.Random) -> RequestSpec:
+    # Mostly repeated example questions, with some unique ones that miss the cache
+    if rng.random() < 0.7:
+        message = rng.choice(QUESTIONS)
+    else:
+        message = f"{rng.choice(QUESTIONS)} (variant {rng.randrange(1_000_000)})"
+    return RequestSpec("POST", "/api/chat/", json={"message": message})
+
+
+def _chat_stream(rng: random.Random) -> RequestSpec:
+    return RequestSpec("POST", "/api/chat/stream", json={"message": rng.choice(QUESTIONS)})
+
+
+_visitor_ids = itertools.count()
+
+
+def _visit(rng: random.Random) -> RequestSpec:
+    return RequestSpec(
+        "POST",
+        "/api/analytics/visit",
+        json={"page_visited": rng.choice(PAGES), "user_agent": BROWSER_UA},
+        headers={"X-Forwarded-For": f"10.0.{next(_visitor_ids) % 256}.{rng.randrange(256)}"},
+    )
+
+
+def _stats(rng: random.Random) -> RequestSpec:
+    return RequestSpec("GET", "/api/analytics/stats")
+
+
+def _resume_download(rng: random.Random) -> RequestSpec:
+    token = base64.b64encode(str(int(time.time() * 1000)).encode()).decode()
+    return RequestSpec(
+        "GET",
+        "/api/resume/download",
+        params={"token": token},
+        headers={"User-Agent": BROWSER_UA, "Accept": "application/pdf"},
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "chat": Scenario("chat", _chat),
+    "chat_stream": Scenario("chat_stream", _chat_stream),
+    "visit": Scenario("visit", _visit),
+    "stats": Scenario("stats", _stats),
+    # 429 is expected when rate limiting is on; run with RATE_LIMIT_ENABLED=false to measure the handler
+    "resume_download": Scenario("resume_download", _resume_download, ok_statuses=(200, 429)),
+}
+
+# Weighted mixes approximating real traffic
+MIXES: Dict[str, List[Tuple[str, float]]] = {
+    "homepage": [("visit", 0.45), ("stats", 0.45), ("resume_download", 0.1)],
+    "mixed": [("chat", 0.2), ("visit", 0.35), ("stats", 0.35), ("resume_download", 0.1)],
+}
+
+
+def resolve(name: str) -> List[Tuple[Scenario, float]]:
+    """Resolve a scenario or mix name into weighted scenarios."""
+    if name in SCENARIOS:
+        return [(SCENARIOS[name], 1.0)]
+    if name in MIXES:
+        return [(SCENARIOS[scenario], weight) for scenario, weight in MIXES[name]]
+    raise ValueError(f"Unknown scenario '{name}'. Choose from: {', '.join([*SCENARIOS, *MIXES])}")
@@ -5,6 +5,9 @@ import Image from 'next/image';
 import Button from './Button';
 import SecureDownloadButton from './SecureDownloadButton';
 
+// One key per page load: effect re-runs and retries are recognized as the same visit
+let visitKey: string | null = null;
+
 export default function Hero() {
     const [visitorCount, setVisitorCount] = useState<number | null>(null);
     const [loading, setLoading] = useState(true);
@@ -17,9 +20,10 @@ export default function Hero() {
             try {
                 // 1. Record the visit
                 // We use a simple POST request. You can expand the body if needed.
+                visitKey ??= crypto.randomUUID();
                 await fetch(`${API_URL}/api/analytics/visit`, {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
+                    headers: { 'Content-Type': 'application/json', 'Idempotency-Key': visitKey },
                     body: JSON.stringify({
                         page_visited: window.location.pathname,
                         user_agent: navigator.userAgent
@@ -0,0 +1,87 @@
+"""
+Gunicorn configuration for production, driven by Settings (environment / .env).
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+The app is imported once in the master (PRELOAD_APP) and forked into
+WEB_CONCURRENCY uvicorn workers (default 1: rate limits, caches and metrics
+live in each worker's memory). Database engines, the AI agent and background
+tasks are created per worker in the lifespan, never before the fork. Workers are
+recycled after WORKER_MAX_REQUESTS (+ jitter) requests and drain gracefully on
+SIGTERM: streams get STREAM_DRAIN_SECONDS, then shutdown hooks flush buffers.
+"""
+import multiprocessing
+import os
+
+from app.config.settings import settings
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on (respects container CPU affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return multiprocessing.cpu_count()
+
+
+def _worker_count() -> int:
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    # Async workers: one per core; the event loop already multiplexes I/O-bound requests
+    return max(1, min(_available_cpus(), settings.web_concurrency_max))
+
+
+# ==================== Server Socket ====================
+bind = f"{settings.host}:{os.environ.get('PORT', settings.port)}"
+backlog = 2048
+
+# ==================== Worker Processes ====================
+workers = _worker_count()
+worker_class = "app.workers.PortfolioWorker"
+preload_app = settings.preload_app
+max_requests = settings.worker_max_requests
+max_requests_jitter = settings.worker_max_requests_jitter
+timeout = settings.worker_timeout_seconds
+graceful_timeout = settings.graceful_timeout_seconds
+keepalive = settings.worker_keepalive_seconds
+
+# ==================== Logging ====================
+accesslog = "-" if settings.debug else None
+errorlog = "-"
+loglevel = "debug" if settings.debug else "info"
+
+# ==================== Startup Checks ====================
+# Logged from on_starting, once gunicorn's own logging is configured
+_startup_warnings = []
+
+# Drain (streams + 2s) and hooks must fit inside graceful_timeout or gunicorn kills the worker mid-flush
+_drain_budget = settings.stream_drain_seconds + 2 + settings.shutdown_hook_timeout_seconds
+if _drain_budget > graceful_timeout:
+    _startup_warnings.append(
+        f"GRACEFUL_TIMEOUT_SECONDS={graceful_timeout} is shorter than the drain budget "
+        f"({_drain_budget}s); shutdown hooks may be killed before they finish"
+    )
+
+# In-memory rate limits are per worker, so each extra worker adds a full allowance per IP
+if workers > 1 and settings.rate_limit_enabled and settings.rate_limit_storage_uri.startswith("memory://"):
+    _startup_warnings.append(
+        f"{workers} workers with in-memory rate limiting: per-IP limits are multiplied by {workers} "
+        f"and /metrics shows one worker per scrape; set RATE_LIMIT_STORAGE_URI to shared storage "
+        f"or WEB_CONCURRENCY=1"
+    )
+
+
+def on_starting(server):
+    for message in _startup_warnings:
+        server.log.warning(message)
+
+
+def when_ready(server):
+    server.log.info(
+        f"Serving with {workers} worker(s) (preload={preload_app}, "
+        f"max_requests={max_requests}+{max_requests_jitter})"
+    )
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker {worker.pid} exited")
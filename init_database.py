@@ -3,7 +3,7 @@ Database initialization script.
 Run this to create all necessary tables.
 """
 import sys, os
-from app.config.database import init_db, engine
+from app.config.database import init_db, get_engine
 from sqlalchemy import text
 
 # Add the app directory to Python path
@@ -15,7 +15,7 @@ def main():
     
     try:
         # Test connection first
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             result = conn.execute(text("SELECT 1"))
             print("✓ Database connection successful")
         
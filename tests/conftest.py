@@ -0,0 +1,41 @@
+"""
+Shared fixtures for the API test suite.
+
+The app runs in-process against the stub LLM provider and a throwaway SQLite
+database, so the suite needs no network, API key or running server.
+"""
+import os
+import tempfile
+
+import pytest
+
+_db_dir = tempfile.mkdtemp(prefix="portfolio-tests-")
+
+# Must be set before anything imports app.config.settings
+os.environ.update({
+    "AI_PROVIDER": "stub",
+    "STUB_FIRST_TOKEN_MS": "0",
+    "STUB_TOKEN_MS": "0",
+    "DATABASE_URL": f"sqlite:///{os.path.join(_db_dir, 'test.db')}",
+    "RATE_LIMIT_ENABLED": "false",
+    "WARMUP_ON_STARTUP": "false",
+})
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.config.database import init_db
+    from app.main import app as fastapi_app
+
+    init_db()
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """TestClient with the lifespan running (batch writers, health prober)."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        yield test_client
+
@@ -0,0 +1,28 @@
+"""
+Keeps the in-process micro-benchmarks runnable.
+
+Each benchmark asserts the status of the request it times; running them once
+with timing disabled catches routes or fixtures that drifted from the app.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_micro_benchmarks_pass_once():
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "--benchmark-disable",
+            "benchmarks/bench_asgi.py", "benchmarks/bench_cors.py",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout[-2000:]
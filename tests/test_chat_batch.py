@@ -0,0 +1,38 @@
+"""
+Tests for /api/chat/batch: FAQ and cache fast paths and upstream call packing.
+"""
+
+
+def test_faq_answers_are_not_reported_as_cached(client):
+    response = client.post("/api/chat/batch", json={"questions": ["What is his graduation date?"]})
+    assert response.status_code == 200
+    data = response.json()
+    answer = data["answers"][0]
+    assert answer["faq"] is True
+    assert answer["cached"] is False
+    assert "May 2025" in answer["response"]
+    assert data["upstream_calls"] == 0
+
+
+def test_repeated_question_is_served_from_cache(client):
+    question = "Which cloud platforms has he deployed to in production?"
+    first = client.post("/api/chat/batch", json={"questions": [question]}).json()
+    assert first["answers"][0]["cached"] is False
+    assert first["answers"][0]["faq"] is False
+
+    second = client.post("/api/chat/batch", json={"questions": [question]}).json()
+    assert second["answers"][0]["cached"] is True
+    assert second["upstream_calls"] == 0
+
+
+def test_questions_share_one_upstream_call(client):
+    questions = [
+        "What databases has he designed schemas for?",
+        "Which testing frameworks does he prefer?",
+        "What databases has he designed schemas for?",
+    ]
+    data = client.post("/api/chat/batch", json={"questions": questions}).json()
+    assert len(data["answers"]) == 3
+    assert all(answer["success"] for answer in data["answers"])
+    assert data["answers"][0]["response"] == data["answers"][2]["response"]
+    assert data["upstream_calls"] == 1
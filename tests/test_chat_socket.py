@@ -0,0 +1,87 @@
+"""
+Tests for the /api/chat/ws WebSocket transport.
+"""
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.middleware.cors import AllowedOrigins
+from app.routers import chat
+from app.services.ai_agent import get_ai_agent
+
+
+def receive_until(ws, kind: str):
+    """Collect frames up to and including the first one of the given type."""
+    frames = []
+    while True:
+        frame = ws.receive_json()
+        frames.append(frame)
+        if frame["type"] == kind:
+            return frames
+
+
+def test_answers_stream_and_history_is_kept(client):
+    with client.websocket_connect("/api/chat/ws?session_id=ws-history") as ws:
+        assert ws.receive_json() == {"type": "session", "session_id": "ws-history"}
+
+        ws.send_json({"type": "ask", "message": "What does he build with FastAPI? (ws)", "id": 1})
+        frames = receive_until(ws, "done")
+        tokens = [frame for frame in frames if frame["type"] == "token"]
+        assert tokens and all(frame["id"] == 1 for frame in tokens)
+        assert frames[-1]["completion_tokens"] > 0
+
+        ws.send_json({"type": "ask", "message": "And with React? (ws)", "id": 2})
+        second = receive_until(ws, "done")[-1]
+        # The follow-up carries the first exchange as history
+        assert second["prompt_tokens"] > frames[-1]["prompt_tokens"]
+
+
+def test_session_id_is_generated(client):
+    with client.websocket_connect("/api/chat/ws") as ws:
+        frame = ws.receive_json()
+        assert frame["type"] == "session"
+        assert len(frame["session_id"]) == 36
+
+
+def test_protocol_errors_keep_the_connection_open(client):
+    with client.websocket_connect("/api/chat/ws") as ws:
+        ws.receive_json()
+        ws.send_text("not json")
+        assert ws.receive_json()["status_code"] == 400
+        ws.send_json({"type": "shout"})
+        assert ws.receive_json()["detail"] == "Unknown frame type: shout"
+        ws.send_json({"type": "ask", "message": "", "id": 7})
+        assert ws.receive_json() == {
+            "type": "error", "detail": "message must be 1-2000 characters", "status_code": 422, "id": 7,
+        }
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+
+def test_cancel_stops_the_answer(client, monkeypatch):
+    monkeypatch.setattr(get_ai_agent().provider, "token_ms", 20.0)
+    with client.websocket_connect("/api/chat/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "ask", "message": "Walk me through every project he has built (ws cancel)", "id": "a"})
+        assert ws.receive_json()["type"] == "token"
+
+        ws.send_json({"type": "ask", "message": "Second question", "id": "b"})
+        busy = receive_until(ws, "error")[-1]
+        assert (busy["status_code"], busy["id"]) == (409, "b")
+
+        ws.send_json({"type": "cancel"})
+        assert receive_until(ws, "cancelled")[-1] == {"type": "cancelled", "id": "a"}
+
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+
+def test_disallowed_origin_is_refused(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/api/chat/ws", headers={"Origin": "https://evil.example"}) as ws:
+            ws.receive_json()
+
+
+def test_wildcard_origin_allows_any_browser(client, monkeypatch):
+    monkeypatch.setattr(chat, "_ws_origins", AllowedOrigins(["*"]))
+    with client.websocket_connect("/api/chat/ws", headers={"Origin": "https://anyone.example"}) as ws:
+        assert ws.receive_json()["type"] == "session"
@@ -0,0 +1,125 @@
+"""
+Tests for the gzip/brotli compression middleware.
+"""
+import asyncio
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, brotli, parse_accept_encoding
+
+LARGE = {"items": ["portfolio"] * 500}
+
+
+async def large(request):
+    return JSONResponse(LARGE, headers={"ETag": '"v1"'})
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def pdf(request):
+    return Response(b"%PDF" * 1000, media_type="application/pdf")
+
+
+async def events(request):
+    async def body():
+        for i in range(3):
+            yield f"data: {i}\n\n" * 200
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+async def chunks(request):
+    async def body():
+        for i in range(3):
+            yield f"chunk {i} " * 200
+    return StreamingResponse(body(), media_type="text/plain")
+
+
+app = CompressionMiddleware(
+    Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/pdf", pdf),
+        Route("/events", events),
+        Route("/chunks", chunks),
+    ]),
+    minimum_size=1024,
+    content_types=("application/json", "text/plain"),
+)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0, deflate;q=0.5") == ["gzip", "deflate"]
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) < 1000
+    assert response.json() == LARGE
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+def test_brotli_preferred_when_accepted(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+
+
+@pytest.mark.parametrize("path, accept", [
+    ("/small", "gzip"),
+    ("/pdf", "gzip"),
+    ("/events", "gzip"),
+    ("/large", "identity"),
+])
+def test_not_compressed(client, path, accept):
+    response = client.get(path, headers={"Accept-Encoding": accept})
+    assert "content-encoding" not in response.headers
+
+
+def test_stream_chunks_are_flushed():
+    """Every compressed chunk must decode on its own, without waiting for the end."""
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # Client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/chunks",
+        "raw_path": b"/chunks",
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("test", 80),
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    asyncio.run(app(scope, receive, send))
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    for i, message in enumerate(bodies[:3]):
+        assert decoder.decompress(message["body"]).decode() == f"chunk {i} " * 200
@@ -0,0 +1,83 @@
+"""
+Tests for the CORS and error-handling middleware.
+"""
+import pytest
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route, Router
+from starlette.testclient import TestClient
+
+from app.middleware.cors import ERROR_BODY, CORSMiddleware
+
+ALLOWED = "http://localhost:3000"
+
+
+async def ok(request):
+    return PlainTextResponse("ok", headers={"Vary": "Accept-Encoding"})
+
+
+async def boom(request):
+    raise RuntimeError("boom")
+
+
+def make_client(origins=(ALLOWED,)) -> TestClient:
+    # A bare router: in the app, CORSMiddleware sits inside ServerErrorMiddleware and sees errors first
+    app = Router(routes=[Route("/ok", ok, methods=["GET", "POST"]), Route("/boom", boom)])
+    middleware = CORSMiddleware(app, allow_origins=origins, expose_headers=["Content-Disposition"], max_age=7200)
+    return TestClient(middleware, raise_server_exceptions=False)
+
+
+def test_allowed_origin_gets_credentialed_headers():
+    response = make_client().get("/ok", headers={"Origin": ALLOWED})
+    assert response.headers["access-control-allow-origin"] == ALLOWED
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-expose-headers"] == "Content-Disposition"
+    assert response.headers["vary"] == "Accept-Encoding, Origin"
+
+
+@pytest.mark.parametrize("headers", [{"Origin": "https://evil.example"}, {}])
+def test_other_requests_get_no_cors_headers(headers):
+    response = make_client().get("/ok", headers=headers)
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+    assert "Origin" in response.headers["vary"]
+
+
+def test_preflight_is_answered_and_cached():
+    response = make_client().options("/ok", headers={
+        "Origin": ALLOWED,
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type, idempotency-key",
+    })
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-headers"] == "content-type, idempotency-key"
+    assert response.headers["access-control-max-age"] == "7200"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+
+def test_preflight_from_disallowed_origin():
+    response = make_client().options("/ok", headers={
+        "Origin": "https://evil.example",
+        "Access-Control-Request-Method": "POST",
+    })
+    assert response.status_code == 400
+
+
+def test_wildcard_reflects_any_origin():
+    response = make_client(origins=["*"]).get("/ok", headers={"Origin": "https://anyone.example"})
+    assert response.headers["access-control-allow-origin"] == "https://anyone.example"
+
+
+def test_unhandled_error_is_json_500_with_cors():
+    response = make_client().get("/boom", headers={"Origin": ALLOWED})
+    assert response.status_code == 500
+    assert response.content == ERROR_BODY
+    assert response.headers["access-control-allow-origin"] == ALLOWED
+
+
+def test_app_preflight(client):
+    response = client.options("/api/chat/", headers={
+        "Origin": "http://localhost:3000",
+        "Access-Control-Request-Method": "POST",
+    })
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
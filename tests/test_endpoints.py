@@ -0,0 +1,81 @@
+"""
+Endpoint checks ported from the old test_all_endpoints.py script.
+
+Same coverage as before (API info, health, chat, analytics, error handling),
+run in-process instead of against a live server on localhost:8000.
+"""
+
+
+def test_root_endpoint(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"name", "version", "status"} <= data.keys()
+    assert data["status"] == "operational"
+
+
+def test_health_check(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"status", "database", "ai_service", "version"} <= data.keys()
+    assert data["status"] in ("healthy", "degraded")
+    assert data["database"] is True
+
+
+def test_chat_examples(client):
+    response = client.get("/api/chat/examples")
+    assert response.status_code == 200
+    examples = response.json()["examples"]
+    assert isinstance(examples, list) and examples
+
+
+def test_chat_endpoint(client):
+    response = client.post("/api/chat/", json={"message": "What is Howard's background?"})
+    assert response.status_code == 200
+    data = response.json()
+    assert {"response", "session_id", "timestamp"} <= data.keys()
+    assert data["response"]
+
+
+def test_chat_with_history(client):
+    response = client.post("/api/chat/", json={
+        "message": "What programming languages does he know?",
+        "conversation_history": [
+            {"role": "user", "content": "Tell me about Howard"},
+            {"role": "assistant", "content": "Howard is a Computer Engineering graduate student..."},
+        ],
+    })
+    assert response.status_code == 200
+    assert response.json()["response"]
+
+
+def test_record_visit(client):
+    response = client.post("/api/analytics/visit", json={
+        "page_visited": "/test",
+        "user_agent": "Test Suite Bot/1.0",
+    })
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+
+def test_analytics_stats(client):
+    response = client.get("/api/analytics/stats")
+    assert response.status_code == 200
+    data = response.json()
+    for field in ("total_visitors", "total_visits", "recent_visits"):
+        assert isinstance(data[field], int)
+
+
+def test_recent_visits(client):
+    response = client.get("/api/analytics/recent?limit=5")
+    assert response.status_code == 200
+    assert isinstance(response.json()["visits"], list)
+
+
+def test_invalid_endpoint(client):
+    assert client.get("/api/nonexistent").status_code == 404
+
+
+def test_invalid_chat_request(client):
+    assert client.post("/api/chat/", json={"message": ""}).status_code == 422
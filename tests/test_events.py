@@ -0,0 +1,64 @@
+"""
+Tests for analytics events: batched inserts, daily counters and the endpoints.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+
+from app.config.database import AnalyticsEvent, SessionLocal
+from app.services.events import EventType, event_store
+
+
+def event(day: int, event_type: EventType, subject: str = None) -> dict:
+    return {"created_at": datetime(2020, 3, day, 12), "event_type": int(event_type), "ip_hash": "h", "subject": subject}
+
+
+def test_public_names():
+    assert EventType.CONTACT_CLICK.public_name == "contact_click"
+    assert EventType.from_public_name("Resume_Download") is EventType.RESUME_DOWNLOAD
+    assert EventType.from_public_name("nope") is None
+
+
+def test_batches_update_daily_counters(app):
+    event_store._write([
+        event(1, EventType.RESUME_DOWNLOAD, "resume.pdf"),
+        event(1, EventType.RESUME_DOWNLOAD),
+        event(1, EventType.CONTACT_CLICK),
+        event(2, EventType.PROJECT_CLICK),
+    ])
+    # The second batch finds existing counters and increments them
+    event_store._write([event(1, EventType.RESUME_DOWNLOAD), event(2, EventType.CHAT_OPEN)])
+
+    counts = event_store.daily_counts(date(2020, 3, 1))
+    assert counts[date(2020, 3, 1)] == {"resume_download": 3, "contact_click": 1}
+    assert counts[date(2020, 3, 2)] == {"project_click": 1, "chat_open": 1}
+    with SessionLocal() as db:
+        stored = db.scalar(select(func.count(AnalyticsEvent.id)).where(AnalyticsEvent.created_at < datetime(2020, 4, 1)))
+    assert stored == 6
+
+
+def test_endpoints_queue_events(client, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(event_store, "record", lambda *args: recorded.append(args))
+
+    assert client.post("/api/analytics/download", json={"file": "resume.pdf"}).status_code == 200
+    assert client.post("/api/analytics/visitor", json={"event": "project_click", "subject": "/projects/hpc"}).status_code == 200
+    assert [(kind, subject) for kind, _, subject in recorded] == [
+        (EventType.RESUME_DOWNLOAD, "resume.pdf"),
+        (EventType.PROJECT_CLICK, "/projects/hpc"),
+    ]
+
+
+def test_unknown_events_are_rejected(client):
+    assert client.post("/api/analytics/visitor", json={"event": "hover"}).status_code == 422
+    assert client.post("/api/analytics/download", json={"action": "contact_click"}).status_code == 422
+
+
+def test_daily_endpoint(client):
+    event_store._write([
+        {"created_at": datetime.now(), "event_type": int(EventType.RESUME_VIEW), "ip_hash": None, "subject": None}
+    ])
+    data = client.get("/api/analytics/events/daily?days=1").json()
+    assert data["totals"]["resume_view"] >= 1
+    assert data["days"][0]["date"] == date.today().isoformat()
+    assert client.get("/api/analytics/events/daily?days=0").status_code == 422
@@ -0,0 +1,78 @@
+"""
+Tests for the FAQ fast path.
+"""
+import pytest
+
+from app.config.settings import settings
+from app.services.document_loader import DocumentLoader
+from app.services.faq_index import FAQIndex, parse_faq
+
+FAQ = """# FAQ
+
+Q: What is Howard's graduation date?
+A: May 2025.
+
+Q: What type of roles is he seeking?
+A: Backend and infrastructure
+engineering roles.
+
+Q: What is his experience level?
+A: Two years of industry experience.
+"""
+
+
+def make_index(threshold: float = 0.8) -> FAQIndex:
+    return FAQIndex.from_documents([{"type": "faq", "content": FAQ}, {"type": "resume", "content": FAQ}], threshold)
+
+
+def test_parse_faq_joins_multiline_answers():
+    assert parse_faq(FAQ) == [
+        ("What is Howard's graduation date?", "May 2025."),
+        ("What type of roles is he seeking?", "Backend and infrastructure engineering roles."),
+        ("What is his experience level?", "Two years of industry experience."),
+    ]
+
+
+def test_only_faq_documents_are_indexed():
+    assert len(make_index().entries) == 3
+
+
+def test_rephrased_question_matches():
+    answer, score = make_index().match("When does he graduate?")
+    assert answer == "May 2025."
+    assert score >= 0.8
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("Is Howard willing to relocate?", "open to remote, hybrid, or relocation"),
+    ("When does Howard graduate and what is his availability?", "May 2025"),
+    ("What kind of jobs is he looking for?", "Junior to mid-level positions"),
+    ("Which industries is he interested in?", "Climate tech"),
+])
+def test_paraphrases_match_the_built_in_faq(question, expected):
+    index = FAQIndex.from_documents(DocumentLoader().documents, threshold=settings.faq_match_threshold)
+    answer, _ = index.match(question)
+    assert expected in answer
+
+
+@pytest.mark.parametrize("fragment", ["graduate", "What roles?", "relocation", "experience"])
+def test_single_word_fragments_go_to_the_llm(fragment):
+    index = FAQIndex.from_documents(DocumentLoader().documents, threshold=settings.faq_match_threshold)
+    assert index.match(fragment) is None
+
+
+def test_question_with_extra_content_goes_to_the_llm():
+    index = make_index()
+    assert index.match("What experience does he have with cloud infrastructure?") is None
+    assert index.match("Hello there") is None
+    assert index.snapshot()["misses"] == 2
+
+
+def test_chat_answers_faq_without_upstream(client, monkeypatch):
+    response = client.post("/api/chat/", json={"message": "Is he open to relocation?"})
+    assert response.status_code == 200
+    assert response.json()["tokens_used"] == 0
+
+    monkeypatch.setattr(settings, "faq_fast_path_enabled", False)
+    response = client.post("/api/chat/", json={"message": "Is he open to relocation?"})
+    assert response.json()["tokens_used"] > 0
@@ -0,0 +1,110 @@
+"""
+Tests for the background health prober and the cached /health response.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.schemas import DependencyHealth, HealthStatus
+from app.services import health
+from app.services.health import HealthProber
+
+
+class FakeProvider:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.pings = 0
+
+    async def ping(self):
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+
+
+def fake_agent(provider: FakeProvider, circuit: str = "closed"):
+    breaker = SimpleNamespace(snapshot=lambda: {"state": circuit, "retry_in_seconds": 12.0})
+    return SimpleNamespace(
+        provider=provider,
+        upstream=SimpleNamespace(breaker=breaker),
+        get_status=lambda: {"circuit": circuit},
+    )
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Capture published results instead of replacing the app's cached /health."""
+    results = []
+    monkeypatch.setattr(health, "static_responses", SimpleNamespace(
+        set=lambda name, body, status_code, cache_control: results.append(status_code)
+    ))
+    return results
+
+
+def make_prober(monkeypatch, agent=None, database_ok: bool = True, **options) -> HealthProber:
+    monkeypatch.setattr(health, "peek_ai_agent", lambda: agent)
+    prober = HealthProber(**{"interval": 60, "timeout": 0.5, "llm_interval": 60, "queue_warn_depth": 10, **options})
+
+    async def check_database():
+        return DependencyHealth(healthy=database_ok)
+
+    prober._check_database = check_database
+    return prober
+
+
+def test_healthy(monkeypatch, published):
+    prober = make_prober(monkeypatch, fake_agent(FakeProvider()))
+    result = asyncio.run(prober.probe())
+    assert result.status == HealthStatus.HEALTHY
+    assert published[-1] == 200
+
+
+def test_deep_queue_degrades(monkeypatch, published):
+    prober = make_prober(monkeypatch, fake_agent(FakeProvider()))
+    prober.register_queue("writes", lambda: 11)
+    prober.register_queue("broken", lambda: 1 / 0)
+    result = asyncio.run(prober.probe())
+    assert result.status == HealthStatus.DEGRADED
+    assert result.queues == {"writes": 11}
+
+
+def test_nothing_working_is_unhealthy(monkeypatch, published):
+    prober = make_prober(monkeypatch, agent=None, database_ok=False)
+    result = asyncio.run(prober.probe())
+    assert result.status == HealthStatus.UNHEALTHY
+    assert result.checks["llm"].detail == "AI agent initializing"
+    assert published[-1] == 503
+
+
+def test_llm_ping_is_rate_limited(monkeypatch, published):
+    provider = FakeProvider()
+    prober = make_prober(monkeypatch, fake_agent(provider))
+
+    async def probe_twice():
+        await prober.probe()
+        await prober.probe()
+
+    asyncio.run(probe_twice())
+    assert provider.pings == 1
+
+
+def test_open_circuit_skips_ping(monkeypatch, published):
+    provider = FakeProvider()
+    prober = make_prober(monkeypatch, fake_agent(provider, circuit="open"))
+    result = asyncio.run(prober.probe())
+    assert provider.pings == 0
+    assert result.checks["llm"].detail == "Circuit open, retry in 12.0s"
+
+
+def test_slow_ping_times_out(monkeypatch, published):
+    prober = make_prober(monkeypatch, fake_agent(FakeProvider(delay=5)), timeout=0.05)
+    result = asyncio.run(prober.probe())
+    assert result.checks["llm"].healthy is False
+    assert result.checks["llm"].detail == "Timed out after 0.05s"
+
+
+def test_health_endpoint_serves_cached_result(client):
+    first = client.get("/health")
+    assert first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+    revalidated = client.get("/health", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
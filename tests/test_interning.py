@@ -0,0 +1,66 @@
+"""
+Tests for lookup-table interning of pages and user agents.
+"""
+import uuid
+
+from sqlalchemy import func, select
+
+from app.config.database import Page, SessionLocal, UserAgent
+from app.services.interning import InternTable, page_ids, user_agent_ids
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}{uuid.uuid4().hex}"
+
+
+def test_resolve_inserts_once_then_hits_cache(app):
+    table = InternTable(Page, "path", max_entries=10)
+    path = unique("/intern/")
+
+    first_id, created = table.resolve(path)
+    assert created
+    assert table.resolve(path) == (first_id, False)
+    assert table.stats == {"hits": 1, "misses": 1, "inserts": 1}
+
+
+def test_evicted_value_resolves_from_the_table(app):
+    table = InternTable(Page, "path", max_entries=2)
+    paths = [unique("/lru/") for _ in range(3)]
+    ids = [table.resolve(path)[0] for path in paths]
+
+    assert table.snapshot()["entries"] == 2
+    # The oldest value fell out of the LRU but its row is found, not duplicated
+    assert table.resolve(paths[0]) == (ids[0], False)
+    assert table.stats["inserts"] == 3
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count(Page.id)).where(Page.path == paths[0])) == 1
+
+
+def test_another_worker_sees_existing_rows(app):
+    path = unique("/shared/")
+    row_id, _ = page_ids.resolve(path)
+    # A fresh table stands in for another worker's empty cache
+    assert InternTable(Page, "path", max_entries=10).resolve(path) == (row_id, False)
+
+
+def test_user_agents_are_keyed_by_hash(app):
+    agent = unique("Mozilla/5.0 intern-test ")
+    row_id, created = user_agent_ids.resolve(agent)
+    assert created
+    with SessionLocal() as db:
+        assert db.get(UserAgent, row_id).user_agent == agent
+
+
+def test_visits_store_ids_and_recent_joins_them(client):
+    paths = {unique("/recent/"), unique("/recent/")}
+    agent = unique("Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0 ")
+    for page in paths:
+        response = client.post("/api/analytics/visit", json={"page_visited": page, "user_agent": agent})
+        assert response.json()["message"] == "Visit recorded successfully"
+
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count(UserAgent.id)).where(UserAgent.user_agent == agent)) == 1
+
+    visits = client.get("/api/analytics/recent?limit=2").json()["visits"]
+    assert {visit["page"] for visit in visits} == paths
+    assert all(visit["user_agent"] == agent[:50] for visit in visits)
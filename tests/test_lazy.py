@@ -0,0 +1,55 @@
+"""
+Tests for lazily built singletons and import-time cost.
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from app.config.lazy import Lazy, startup_timings
+
+
+def test_lazy_builds_once_across_threads():
+    builds = []
+
+    def factory():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    holder = Lazy("test_value", factory)
+    assert holder.peek() is None and not holder.ready
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(holder.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(value is results[0] for value in results)
+    assert holder.ready
+    assert "test_value" in startup_timings
+
+
+def test_reset_rebuilds():
+    holder = Lazy("counter", iter(range(10)).__next__)
+    holder.get()
+    holder.reset()
+    assert holder.peek() is None
+    assert holder.get() == 1
+
+
+def test_importing_the_app_builds_nothing_heavy():
+    code = (
+        "import app.main\n"
+        "from app.config.database import peek_engine\n"
+        "from app.services import ai_agent\n"
+        "assert peek_engine() is None, 'database engine built at import'\n"
+        "assert not ai_agent._ai_agent.ready, 'AI agent built at import'\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=dict(os.environ), capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
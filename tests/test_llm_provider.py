@@ -0,0 +1,66 @@
+"""
+Tests for the LLM provider interface and the offline stub provider.
+"""
+import asyncio
+
+import pytest
+
+from app.services.chat_batch import build_batch_prompt, split_answers
+from app.services.llm_provider import StubProvider, create_provider
+from app.services.tokens import TokenUsage
+
+
+def make_stub(**overrides) -> StubProvider:
+    options = {"first_token_ms": 0, "token_ms": 0, "response_tokens": 20, "failure_rate": 0.0}
+    return StubProvider(**{**options, **overrides})
+
+
+async def collect(stream) -> str:
+    return "".join([chunk async for chunk in stream])
+
+
+def test_stub_is_deterministic():
+    stub = make_stub()
+    first = asyncio.run(stub.chat("What does Howard work on?", []))
+    second = asyncio.run(stub.chat("What does Howard work on?", []))
+    other = asyncio.run(stub.chat("Where did Howard study?", []))
+    assert first.text == second.text
+    assert first.text != other.text
+    assert len(first.text.split()) == 20
+
+
+def test_stub_stream_matches_chat_and_reports_usage():
+    stub = make_stub()
+    usage = TokenUsage()
+    streamed = asyncio.run(collect(stub.stream("Tell me about his projects", [], usage)))
+    result = asyncio.run(stub.chat("Tell me about his projects", []))
+    assert streamed == result.text
+    assert usage.completion_tokens == result.usage.completion_tokens > 0
+    assert usage.prompt_tokens == result.usage.prompt_tokens > 0
+
+
+def test_stub_history_counts_toward_prompt_tokens():
+    stub = make_stub()
+    history = [{"role": "user", "content": "Earlier question about Kubernetes clusters"}]
+    with_history = asyncio.run(stub.chat("And Docker?", history))
+    without = asyncio.run(stub.chat("And Docker?", []))
+    assert with_history.usage.prompt_tokens > without.usage.prompt_tokens
+
+
+def test_stub_answers_every_batched_question():
+    stub = make_stub()
+    prompt = build_batch_prompt("context", ["First?", "Second?", "Third?"])
+    answers = split_answers(asyncio.run(stub.chat(prompt, [])).text, 3)
+    assert all(answers)
+    assert len(set(answers)) == 3
+
+
+def test_stub_simulated_failures():
+    with pytest.raises(ConnectionError):
+        asyncio.run(make_stub(failure_rate=1.0).chat("Anything", []))
+
+
+def test_create_provider():
+    assert isinstance(create_provider("STUB"), StubProvider)
+    with pytest.raises(ValueError, match="Unknown AI provider"):
+        create_provider("nope")
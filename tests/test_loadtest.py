@@ -0,0 +1,64 @@
+"""
+Tests for the load-testing harness (benchmarks/loadtest.py).
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.loadtest import Recorder, compare, percentile, run_closed_loop
+from benchmarks.scenarios import SCENARIOS, resolve
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 95) == 0.0
+
+
+def test_recorder_separates_errors_from_latency():
+    recorder = Recorder()
+    stats = SCENARIOS["stats"]
+    recorder.record(stats, 200, 0.010)
+    recorder.record(stats, 200, 0.030)
+    recorder.record(stats, 500, 5.0)
+    recorder.record(stats, None, 1.0)
+    summary = recorder.summary(elapsed=2.0)["stats"]
+    assert summary["requests"] == 4
+    assert summary["errors"] == 2
+    assert summary["error_rate"] == 0.5
+    assert summary["throughput_rps"] == 2.0
+    assert summary["latency_ms"]["max"] == 30.0
+    assert summary["statuses"] == {"200": 2, "500": 1, "exception": 1}
+
+
+def test_compare_flags_tail_regressions(capsys):
+    def result(p95):
+        latency = {"p50": 10.0, "p95": p95, "p99": 20.0}
+        return {"environment": {}, "scenarios": {"stats": {"latency_ms": latency, "throughput_rps": 100.0}}}
+
+    assert compare(result(15.0), result(14.5), threshold=0.1) is True
+    assert compare(result(20.0), result(15.0), threshold=0.1) is False
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_resolve():
+    assert [scenario.name for scenario, _ in resolve("homepage")] == ["visit", "stats", "resume_download"]
+    with pytest.raises(ValueError):
+        resolve("nope")
+
+
+def test_closed_loop_in_process(app):
+    recorder = Recorder()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await run_closed_loop(client, resolve("stats"), recorder, concurrency=2, duration=0.2, seed=1)
+
+    asyncio.run(scenario())
+    summary = recorder.summary(elapsed=0.2)["stats"]
+    assert summary["requests"] > 0
+    assert summary["errors"] == 0
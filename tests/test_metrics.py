@@ -0,0 +1,47 @@
+"""
+Tests for the Prometheus /metrics endpoint and request latency recording.
+"""
+import pytest
+
+from app.config.settings import settings
+from app.services.metrics import RequestStats, request_stats
+
+
+def test_observations_land_in_buckets():
+    stats = RequestStats()
+    stats.observe("GET", "/", 200, 0.003)
+    stats.observe("GET", "/", 200, 0.3)
+    stats.observe("GET", "/", 200, 60.0)
+    counts, total = stats.series[("GET", "/", 200)]
+    assert counts[0] == 1
+    assert counts[stats.BUCKETS.index(0.5)] == 1
+    assert counts[-1] == 1
+    assert total == pytest.approx(60.303)
+
+    latency = next(stats.collect())
+    cumulative = {sample.labels["le"]: sample.value for sample in latency.samples if sample.name.endswith("_bucket")}
+    assert cumulative["0.005"] == 1
+    assert cumulative["+Inf"] == 3
+
+
+def test_requests_are_labelled_by_route_template(client):
+    client.get("/api/chat/examples")
+    client.get("/no/such/page")
+    assert ("GET", "/api/chat/examples", 200) in request_stats.series
+    assert ("GET", "unmatched", 404) in request_stats.series
+    assert not any(route == "/no/such/page" for _, route, _ in request_stats.series)
+
+
+def test_metrics_endpoint(client):
+    client.get("/api/chat/examples")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/chat/examples"' in response.text
+    assert "http_requests_in_flight" in response.text
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
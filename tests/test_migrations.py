@@ -0,0 +1,153 @@
+"""
+Tests for schema migrations, run against a database with the baseline schema
+(visitors storing user_agent and page_visited strings).
+"""
+import pytest
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.pool import NullPool
+
+from app.config import migrations
+from app.config.database import Page, UserAgent, Visitor, ensure_schema, init_db
+from app.config.settings import settings
+
+BASELINE_VISITORS = """
+CREATE TABLE visitors (
+    id INTEGER NOT NULL PRIMARY KEY,
+    visit_date DATETIME NOT NULL,
+    ip_hash VARCHAR(64),
+    user_agent TEXT,
+    page_visited VARCHAR(255) NOT NULL
+)
+"""
+
+CHROME = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0 Safari/537.36"
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+
+BASELINE_ROWS = [
+    ("ip-1", CHROME, "/"),
+    ("ip-2", CHROME, "/projects"),
+    ("ip-3", None, "/"),
+    ("ip-4", GOOGLEBOT, "/"),
+    (None, None, "/projects"),
+    ("ip-5", CHROME, "/"),
+]
+
+
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}", poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(BASELINE_VISITORS)
+        conn.exec_driver_sql("CREATE INDEX ix_visitors_id ON visitors (id)")
+        conn.exec_driver_sql(
+            "INSERT INTO visitors (visit_date, ip_hash, user_agent, page_visited) "
+            "VALUES ('2026-01-01 12:00:00', ?, ?, ?)",
+            BASELINE_ROWS,
+        )
+    return engine
+
+
+def visitors_schema(engine):
+    """Columns, foreign keys and indexes of visitors, as the inspector reports them."""
+    inspector = inspect(engine)
+    return (
+        [(c["name"], str(c["type"]), c["nullable"]) for c in inspector.get_columns("visitors")],
+        sorted(
+            (tuple(fk["constrained_columns"]), fk["referred_table"], tuple(fk["referred_columns"]))
+            for fk in inspector.get_foreign_keys("visitors")
+        ),
+        sorted(index["name"] for index in inspector.get_indexes("visitors")),
+    )
+
+
+def test_baseline_database_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrations, "ENCODE_CHUNK_SIZE", 2)
+    engine = baseline_engine(tmp_path)
+
+    init_db(engine)
+
+    fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}", poolclass=NullPool)
+    init_db(fresh)
+    assert visitors_schema(engine) == visitors_schema(fresh)
+    fresh.dispose()
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(Visitor.ip_hash, UserAgent.user_agent, Page.path)
+            .join(Page, Visitor.page_id == Page.id)
+            .outerjoin(UserAgent, Visitor.user_agent_id == UserAgent.id)
+            .order_by(Visitor.id)
+        ).all()
+        assert [tuple(row) for row in rows] == BASELINE_ROWS
+        assert conn.scalar(select(func.count(Page.id))) == 2
+        assert conn.scalar(select(func.count(UserAgent.id))) == 2
+        assert set(conn.scalars(select(migrations.schema_migrations.c.version))) == {
+            version for version, _, _ in migrations.MIGRATIONS
+        }
+    engine.dispose()
+
+
+def test_string_columns_are_kept_in_a_backup_table(tmp_path):
+    engine = baseline_engine(tmp_path)
+    init_db(engine)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT user_agent, page_visited FROM visitors_unencoded ORDER BY id").all()
+    assert [tuple(row) for row in rows] == [(agent, page) for _, agent, page in BASELINE_ROWS]
+    engine.dispose()
+
+
+def test_constraints_are_not_added_over_a_broken_backfill(tmp_path, monkeypatch):
+    engine = baseline_engine(tmp_path)
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:2])
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE visitors SET page_id = NULL WHERE ip_hash = 'ip-2'")
+    monkeypatch.undo()
+
+    with pytest.raises(migrations.MigrationError, match="1 visits without a page_id"):
+        migrations.run_migrations(engine)
+    assert migrations.pending_migrations(engine) == [3]
+    with engine.connect() as conn:
+        assert "page_visited" in migrations.table_columns(conn, "visitors")
+    engine.dispose()
+
+
+def test_migrations_run_once(tmp_path):
+    engine = baseline_engine(tmp_path)
+    init_db(engine)
+    assert migrations.run_migrations(engine) == []
+    engine.dispose()
+
+
+def test_fresh_database_is_only_stamped(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}", poolclass=NullPool)
+    init_db(engine)
+    with engine.connect() as conn:
+        assert "page_id" in migrations.table_columns(conn, "visitors")
+        assert conn.scalar(select(func.count()).select_from(migrations.schema_migrations)) == len(migrations.MIGRATIONS)
+    engine.dispose()
+
+
+def test_pending_migrations(tmp_path):
+    engine = baseline_engine(tmp_path)
+    assert migrations.pending_migrations(engine) == [version for version, _, _ in migrations.MIGRATIONS]
+    init_db(engine)
+    assert migrations.pending_migrations(engine) == []
+    engine.dispose()
+
+
+def test_startup_only_reports_a_stale_schema_in_production(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "environment", "production")
+    engine = baseline_engine(tmp_path)
+    ensure_schema(engine)
+    assert "run python init_database.py" in caplog.text
+    with engine.connect() as conn:
+        assert "page_visited" in migrations.table_columns(conn, "visitors")
+    engine.dispose()
+
+
+def test_startup_migrates_outside_production(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "environment", "development")
+    engine = baseline_engine(tmp_path)
+    ensure_schema(engine)
+    assert migrations.pending_migrations(engine) == []
+    engine.dispose()
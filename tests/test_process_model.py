@@ -0,0 +1,70 @@
+"""
+Tests for the production process model (gunicorn.conf.py) and limiter storage.
+"""
+import os
+import runpy
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.settings import settings
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+
+
+def test_single_worker_by_default():
+    assert runpy.run_path(CONF)["workers"] == 1
+
+
+def test_auto_workers_follow_available_cpus(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 0)
+    monkeypatch.setattr(settings, "web_concurrency_max", 1024)
+    conf = runpy.run_path(CONF)
+    assert conf["workers"] == conf["_available_cpus"]()
+
+
+def test_auto_workers_are_capped(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 0)
+    monkeypatch.setattr(settings, "web_concurrency_max", 1)
+    assert runpy.run_path(CONF)["workers"] == 1
+
+
+def test_explicit_worker_count_wins(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 3)
+    conf = runpy.run_path(CONF)
+    assert conf["workers"] == 3
+    assert conf["preload_app"] is settings.preload_app
+
+
+def startup_warnings(conf) -> list:
+    """Messages gunicorn.conf.py logs from its on_starting hook."""
+    logged = []
+    conf["on_starting"](SimpleNamespace(log=SimpleNamespace(warning=logged.append)))
+    return logged
+
+
+def test_multiple_workers_with_memory_limits_warn(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 3)
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_storage_uri", "memory://")
+    conf = runpy.run_path(CONF)
+    assert conf["workers"] == 3
+    assert any("multiplied by 3" in message for message in startup_warnings(conf))
+
+
+def test_shared_limit_storage_does_not_warn(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 3)
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_storage_uri", "redis://localhost:6379")
+    assert not any("rate limiting" in message for message in startup_warnings(runpy.run_path(CONF)))
+
+
+@pytest.mark.parametrize("module", ["app.main", "app.routers.resume"])
+def test_limiters_use_configured_storage(module):
+    from importlib import import_module
+
+    from limits.storage import MemoryStorage
+
+    limiter = import_module(module).limiter
+    assert isinstance(limiter._storage, MemoryStorage)
+    assert limiter._storage_uri == settings.rate_limit_storage_uri
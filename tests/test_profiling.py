@@ -0,0 +1,91 @@
+"""
+Tests for the sampling request profiler and the admin profile endpoints.
+"""
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.config.settings import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.services.profiling import ProfileStore, profile_store, sign_profile_request, verify_profile_request
+
+
+async def hello(request):
+    return PlainTextResponse("hello", status_code=201)
+
+
+def profiled_client(store: ProfileStore, sample_rate: float = 0.0) -> TestClient:
+    app = Starlette(routes=[Route("/hello", hello)])
+    return TestClient(ProfilingMiddleware(app, store, sample_rate=sample_rate, profiler="cprofile"))
+
+
+@pytest.fixture
+def profiling_token(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "profiling-secret")
+
+
+def test_signature_is_bound_to_path_and_time(profiling_token):
+    header = sign_profile_request("/hello")
+    assert verify_profile_request(header, "/hello")
+    assert not verify_profile_request(header, "/other")
+    assert not verify_profile_request(sign_profile_request("/hello", timestamp=1), "/hello")
+    assert not verify_profile_request("garbage", "/hello")
+
+
+def test_on_demand_profiling_is_off_without_token(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "profiling-secret")
+    header = sign_profile_request("/hello")
+    monkeypatch.setattr(settings, "profiling_token", "")
+
+    store = ProfileStore(max_profiles=5)
+    profiled_client(store).get("/hello", headers={"X-Profile-Request": header})
+    assert store.list() == []
+    with pytest.raises(ValueError, match="PROFILING_TOKEN"):
+        sign_profile_request("/hello")
+
+
+def test_only_signed_requests_are_profiled(profiling_token):
+    store = ProfileStore(max_profiles=5)
+    client = profiled_client(store)
+    assert client.get("/hello").status_code == 201
+    assert client.get("/hello", headers={"X-Profile-Request": "1.bad"}).status_code == 201
+    assert store.list() == []
+
+    client.get("/hello", headers={"X-Profile-Request": sign_profile_request("/hello")})
+    [summary] = store.list()
+    assert (summary["method"], summary["path"], summary["status"]) == ("GET", "/hello", 201)
+    assert "hello" in store.get(summary["id"]).as_text()
+
+
+def test_store_keeps_latest_profiles():
+    store = ProfileStore(max_profiles=2)
+    client = profiled_client(store, sample_rate=1.0)
+    for _ in range(3):
+        client.get("/hello")
+    assert len(store.list()) == 2
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "admin-secret")
+    return {"X-Admin-Token": "admin-secret"}
+
+
+def test_admin_api_is_off_without_token(client):
+    assert client.get("/api/admin/profiles").status_code == 404
+
+
+def test_admin_profiles(client, admin_token):
+    assert client.get("/api/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+    profiled_client(profile_store, sample_rate=1.0).get("/hello")
+    profiles = client.get("/api/admin/profiles", headers=admin_token).json()["profiles"]
+    profile_id = profiles[0]["id"]
+
+    raw = client.get(f"/api/admin/profiles/{profile_id}", headers=admin_token)
+    assert raw.headers["content-disposition"] == f"attachment; filename=profile-{profile_id}.prof"
+    text = client.get(f"/api/admin/profiles/{profile_id}?format=text", headers=admin_token)
+    assert "cumulative" in text.text
+    assert client.get("/api/admin/profiles/missing", headers=admin_token).status_code == 404
@@ -0,0 +1,37 @@
+"""
+Tests for the JSON response classes.
+"""
+import json
+from datetime import datetime
+
+from app.models.schemas import ChatResponse
+from app.responses import FastJSONResponse, PreparedResponse
+
+
+def test_model_renders_like_fastapi():
+    model = ChatResponse(response="Hi", session_id="abc", timestamp=datetime(2026, 1, 2, 3, 4, 5), tokens_used=3)
+    body = FastJSONResponse(model).body
+    assert json.loads(body) == json.loads(model.model_dump_json())
+    assert json.loads(body)["timestamp"] == "2026-01-02T03:04:05"
+
+
+def test_dict_with_nested_model_and_datetime():
+    model = ChatResponse(response="Hi", session_id="abc", timestamp=datetime(2026, 1, 2))
+    body = FastJSONResponse({"answer": model, 1: "int key", "when": datetime(2026, 1, 2)}).body
+    data = json.loads(body)
+    assert data["answer"]["session_id"] == "abc"
+    assert data["1"] == "int key"
+    assert data["when"].startswith("2026-01-02")
+
+
+def test_prepared_response_copies_headers():
+    headers = [(b"content-type", b"application/json")]
+    response = PreparedResponse(200, b"{}", headers)
+    response.raw_headers.append((b"x-extra", b"1"))
+    assert headers == [(b"content-type", b"application/json")]
+
+
+def test_app_serves_json(client):
+    response = client.get("/api/chat/examples")
+    assert response.headers["content-type"] == "application/json"
+    assert isinstance(response.json()["examples"], list)
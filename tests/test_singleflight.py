@@ -0,0 +1,118 @@
+"""
+Tests for coalescing identical in-flight calls and streams.
+"""
+import asyncio
+from contextlib import aclosing
+
+from app.services.ai_agent import get_ai_agent
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("q", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["answer"] * 5
+    assert [shared for _, shared in results] == [False, True, True, True, True]
+    assert flight.snapshot()["in_flight"] == 0
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do("q", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("q", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == ("answer", True)
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0)
+        raise ConnectionError("upstream down")
+
+    async def scenario():
+        return await asyncio.gather(flight.do("q", work), flight.do("q", work), return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in asyncio.run(scenario()))
+
+
+def test_late_stream_subscriber_gets_every_chunk():
+    flight = SingleFlight()
+
+    async def source():
+        for word in ("a", "b", "c"):
+            await asyncio.sleep(0.005)
+            yield word
+
+    async def read(chunks):
+        async with aclosing(chunks):
+            return [chunk async for chunk in chunks]
+
+    async def scenario():
+        first, shared_first = flight.stream("q", source)
+        leader = asyncio.create_task(read(first))
+        await asyncio.sleep(0.008)
+        second, shared_second = flight.stream("q", source)
+        return await leader, await read(second), shared_first, shared_second
+
+    assert asyncio.run(scenario()) == (["a", "b", "c"], ["a", "b", "c"], False, True)
+
+
+def test_abandoned_stream_is_cancelled():
+    flight = SingleFlight()
+    finished = []
+
+    async def source():
+        try:
+            for i in range(100):
+                await asyncio.sleep(0.001)
+                yield str(i)
+        finally:
+            finished.append(True)
+
+    async def scenario():
+        chunks, _ = flight.stream("q", source)
+        async with aclosing(chunks):
+            await chunks.__anext__()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert finished == [True]
+    assert flight.snapshot()["in_flight"] == 0
+
+
+def test_identical_chat_questions_make_one_upstream_call():
+    count = 4
+    agent = get_ai_agent()
+    message = "Coalescing check: which languages does he use daily?"
+
+    async def scenario():
+        return await asyncio.gather(*(agent.chat(message) for _ in range(count)))
+
+    before = agent.inflight.stats["leaders"]
+    results = asyncio.run(scenario())
+    assert agent.inflight.stats["leaders"] == before + 1
+    assert sum(1 for result in results if result.get("coalesced")) == count - 1
+    assert len({result["response"] for result in results}) == 1
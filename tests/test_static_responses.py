@@ -0,0 +1,58 @@
+"""
+Tests for pre-serialized responses with ETags and 304s.
+"""
+import pytest
+
+from app.services.static_responses import StaticResponse, StaticResponseRegistry
+
+
+def test_if_none_match_uses_weak_comparison():
+    response = StaticResponse(b"{}", 200, "no-cache", "application/json")
+    assert response.matches(response.etag)
+    assert response.matches(f'"other", W/{response.etag}')
+    assert response.matches("*")
+    assert not response.matches('"other"')
+    assert not response.matches(None)
+
+
+def test_registry_renders_once_until_refreshed():
+    registry = StaticResponseRegistry(max_age=60)
+    version = {"n": 1}
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"version": version["n"]}
+
+    registry.register("info", build)
+    registry.build_all()
+    registry.build_all()
+    first = registry._responses["info"]
+    assert len(builds) == 1
+
+    version["n"] = 2
+    refreshed = registry.refresh("info")
+    assert refreshed.body == b'{"version":2}'
+    assert refreshed.etag != first.etag
+    assert (b"cache-control", b"public, max-age=60") in refreshed.raw_headers
+
+
+@pytest.mark.parametrize("path", ["/", "/api/chat/examples", "/api/resume/preview"])
+def test_static_endpoints_revalidate(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    etag = response.headers["etag"]
+
+    not_modified = client.get(path, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_weakened_etag_still_revalidates(client):
+    """CompressionMiddleware turns the ETag weak; the client sends that back."""
+    etag = client.get("/api/chat/examples").headers["etag"]
+    assert client.get("/api/chat/examples", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
@@ -0,0 +1,87 @@
+"""
+Tests for tenant resolution and the tenant registry's memory budget.
+"""
+import asyncio
+
+from app.middleware.tenant import TenantMiddleware
+from app.services.tenants import TenantRegistry
+
+
+def make_registry(root, budget: int = 10 ** 9) -> TenantRegistry:
+    for name in ("acme", "beta"):
+        (root / name).mkdir()
+        (root / name / "about.md").write_text(f"# {name}\n\nBuilds things.", encoding="utf-8")
+    return TenantRegistry(root=root, hosts={"jane.example.com": "acme"}, memory_budget_bytes=budget, default_tenant="default")
+
+
+def run_middleware(registry: TenantRegistry, path: str, host: str = "localhost"):
+    """Send one request through TenantMiddleware; return (scope seen outside, scope seen inside)."""
+    seen = {}
+
+    async def routed_app(scope, receive, send):
+        seen.update(scope)
+        scope["route"] = "matched"
+
+    scope = {
+        "type": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "headers": [(b"host", host.encode())],
+    }
+    asyncio.run(TenantMiddleware(routed_app, registry)(scope, None, None))
+    return scope, seen
+
+
+def test_path_prefix_selects_tenant_and_is_stripped(tmp_path):
+    outer, inner = run_middleware(make_registry(tmp_path), "/t/acme/api/chat/")
+    assert inner["tenant"] == "acme"
+    assert inner["path"] == "/api/chat/"
+    assert inner["raw_path"] == b"/api/chat/"
+
+
+def test_route_is_visible_to_outer_middleware(tmp_path):
+    outer, _ = run_middleware(make_registry(tmp_path), "/t/acme/api/chat/")
+    assert outer["route"] == "matched"
+
+
+def test_host_selects_tenant(tmp_path):
+    outer, inner = run_middleware(make_registry(tmp_path), "/api/chat/", host="Jane.example.com:443")
+    assert inner["tenant"] == "acme"
+    assert outer["route"] == "matched"
+
+
+def test_unknown_host_has_no_tenant(tmp_path):
+    _, inner = run_middleware(make_registry(tmp_path), "/api/chat/", host="other.example.com")
+    assert "tenant" not in inner
+
+
+def test_least_recently_used_tenant_is_evicted_on_load(tmp_path):
+    registry = make_registry(tmp_path, budget=1)
+
+    async def scenario():
+        await registry.get("acme")
+        await registry.get("beta")
+
+    asyncio.run(scenario())
+    assert list(registry._agents) == ["beta"]
+    assert registry.stats == {"loads": 2, "evictions": 1}
+
+
+def test_cache_growth_after_load_is_evicted(tmp_path):
+    registry = make_registry(tmp_path)
+
+    async def scenario():
+        acme = await registry.get("acme")
+        beta = await registry.get("beta")
+        registry.memory_budget_bytes = registry._footprint(acme) + registry._footprint(beta) + 100
+        registry.BUDGET_CHECK_SECONDS = 0.0
+        assert await registry.get("acme") is acme
+        assert registry.stats["evictions"] == 0
+
+        # beta's cached answers push the loaded agents past the budget
+        beta.response_cache.set("question", "x" * 1000)
+        await registry.get("beta")
+
+    asyncio.run(scenario())
+    assert registry.stats["evictions"] == 1
+    assert list(registry._agents) == ["beta"]
@@ -0,0 +1,66 @@
+"""
+Tests for token accounting: local counts, session budgets and the limits the
+chat endpoint enforces before calling upstream.
+"""
+import time
+
+import pytest
+
+from app.config.settings import settings
+from app.services.ai_agent import get_ai_agent
+from app.services.tokens import SessionTokenBudgets, TokenLimitExceeded, count_tokens_local
+
+
+def test_local_count_is_words_and_punctuation():
+    assert count_tokens_local("Hello, world!") == 4
+    assert count_tokens_local("One paragraph.\n\nAnother one.") == 6
+    assert count_tokens_local("") == 0
+
+
+def test_budget_is_checked_before_spending():
+    budgets = SessionTokenBudgets(budget=100)
+    budgets.add("s", 60)
+    budgets.check("s", 40)
+    with pytest.raises(TokenLimitExceeded) as raised:
+        budgets.check("s", 41)
+    assert raised.value.status_code == 429
+    budgets.check(None, 1000)  # Anonymous requests have no session budget
+
+
+def test_budget_resets_when_idle(monkeypatch):
+    budgets = SessionTokenBudgets(budget=100, idle_reset=60)
+    budgets.add("s", 90)
+    later = time.monotonic() + 61
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert budgets.used("s") == 0
+    budgets.check("s", 100)
+
+
+def test_least_recent_sessions_are_forgotten():
+    budgets = SessionTokenBudgets(budget=100, max_sessions=2)
+    for session in ("a", "b", "c"):
+        budgets.add(session, 10)
+    assert budgets.used("a") == 0
+    assert budgets.used("c") == 10
+
+
+def test_chat_reports_usage(client):
+    data = client.post("/api/chat/", json={"message": "What does he do with Kubernetes, token test?"}).json()
+    assert data["prompt_tokens"] > 0
+    assert data["completion_tokens"] > 0
+    assert data["tokens_used"] == data["prompt_tokens"] + data["completion_tokens"]
+
+
+def test_oversized_prompt_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "max_prompt_tokens", 10)
+    response = client.post("/api/chat/", json={"message": "A question that is never sent upstream"})
+    assert response.status_code == 413
+    assert "Prompt too large" in response.json()["detail"]
+
+
+def test_exhausted_session_budget_is_rejected(client, monkeypatch):
+    budgets = get_ai_agent().token_budgets
+    monkeypatch.setattr(budgets, "budget", 1)
+    budgets.add("spent-session", 1)
+    response = client.post("/api/chat/", json={"message": "One more question", "session_id": "spent-session"})
+    assert response.status_code == 429
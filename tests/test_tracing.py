@@ -0,0 +1,83 @@
+"""
+Tests for request tracing: the server span middleware and span helpers.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.tenant import TenantMiddleware
+from app.services import tracing
+from app.services.tenants import TenantRegistry
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+from app.middleware.tracing import TracingMiddleware  # noqa: E402
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("test"))
+    return exporter
+
+
+def traced_client(tmp_path) -> TestClient:
+    # FastAPI routes (not bare Starlette ones) record scope["route"]
+    app = FastAPI()
+
+    @app.get("/projects/{name}")
+    async def project(name: str):
+        with tracing.span("chat.retrieval", documents=3):
+            pass
+        return PlainTextResponse(name)
+
+    registry = TenantRegistry(root=tmp_path, hosts={}, memory_budget_bytes=0, default_tenant="default")
+    return TestClient(TracingMiddleware(TenantMiddleware(app, registry)))
+
+
+def test_span_is_noop_when_disabled():
+    assert tracing._tracer is None
+    with tracing.span("anything"):
+        pass
+    tracing.record_span("anything", 0)
+
+
+def test_server_span_is_named_by_route(spans, tmp_path):
+    response = traced_client(tmp_path).get("/projects/hpc")
+    assert response.text == "hpc"
+
+    child, server = spans.get_finished_spans()
+    assert server.name == "GET /projects/{name}"
+    assert server.attributes["http.route"] == "/projects/{name}"
+    assert server.attributes["http.status_code"] == 200
+    assert child.name == "chat.retrieval"
+    assert child.parent.span_id == server.context.span_id
+
+
+def test_tenant_prefixed_request_keeps_route(spans, tmp_path):
+    traced_client(tmp_path).get("/t/acme/projects/hpc")
+    server = spans.get_finished_spans()[-1]
+    assert server.name == "GET /projects/{name}"
+
+
+def test_incoming_traceparent_is_continued(spans, tmp_path):
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    traced_client(tmp_path).get(
+        "/projects/hpc", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+    )
+    server = spans.get_finished_spans()[-1]
+    assert format(server.context.trace_id, "032x") == trace_id
+
+
+def test_record_span_uses_given_times(spans):
+    tracing.record_span("request.validation", 1_000, 5_000, route="/x")
+    [recorded] = spans.get_finished_spans()
+    assert (recorded.start_time, recorded.end_time) == (1_000, 5_000)
+    assert recorded.attributes["route"] == "/x"
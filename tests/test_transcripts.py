@@ -0,0 +1,93 @@
+"""
+Tests for chat transcript persistence and session id validation.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import DataError
+from starlette.websockets import WebSocketDisconnect
+
+from app.config.database import ChatSession, ChatTurn, get_engine
+from app.services.transcripts import TranscriptStore
+
+
+def turn(session_id: str, question: str = "q") -> dict:
+    return {
+        "session_id": session_id,
+        "created_at": datetime.now(),
+        "question": question,
+        "answer": "a",
+        "latency_ms": 1.0,
+        "prompt_tokens": None,
+        "completion_tokens": None,
+        "cached": False,
+        "streamed": False,
+        "success": True,
+        "provider": "stub",
+    }
+
+
+def count_turns(session_ids) -> int:
+    with get_engine().connect() as conn:
+        return conn.scalar(select(func.count(ChatTurn.id)).where(ChatTurn.session_id.in_(session_ids)))
+
+
+def test_batches_create_and_update_sessions(app):
+    store = TranscriptStore(enabled=True, retention_days=0, prune_interval=3600)
+    session_id = str(uuid.uuid4())
+    store._write([turn(session_id, "first"), turn(session_id, "second")])
+    store._write([turn(session_id, "third")])
+
+    assert count_turns([session_id]) == 3
+    with get_engine().connect() as conn:
+        messages = conn.scalar(select(ChatSession.messages_count).where(ChatSession.session_id == session_id))
+    assert messages == 3
+
+
+def test_prune_drops_turns_past_retention(app):
+    store = TranscriptStore(enabled=True, retention_days=30, prune_interval=3600)
+    session_id = str(uuid.uuid4())
+    expired = dict(turn(session_id, "old"), created_at=datetime.now() - timedelta(days=31))
+    store._write([expired, turn(session_id, "new")])
+
+    assert store.prune() >= 1
+    assert count_turns([session_id]) == 1
+
+
+def test_oversized_session_id_rejected_by_chat(client):
+    response = client.post("/api/chat/", json={"message": "Hi", "session_id": "x" * 37})
+    assert response.status_code == 422
+
+
+def test_oversized_session_id_rejected_by_batch(client):
+    response = client.post("/api/chat/batch", json={"questions": ["Hi"], "session_id": "x" * 37})
+    assert response.status_code == 422
+
+
+def test_oversized_session_id_rejected_by_websocket(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/api/chat/ws?session_id={'x' * 37}") as ws:
+            ws.receive_json()
+
+
+def test_bad_row_does_not_drop_the_batch(app, monkeypatch):
+    """A row the database refuses is dropped alone; the rest of the batch is written."""
+    store = TranscriptStore(enabled=True, retention_days=0, prune_interval=3600)
+    real_insert = TranscriptStore._insert
+
+    def strict_insert(turns):
+        # SQLite ignores VARCHAR lengths; behave like Postgres does
+        if any(len(t["session_id"]) > 36 for t in turns):
+            raise DataError("INSERT", {}, Exception("value too long for type character varying(36)"))
+        real_insert(turns)
+
+    monkeypatch.setattr(TranscriptStore, "_insert", staticmethod(strict_insert))
+
+    good = [str(uuid.uuid4()) for _ in range(5)]
+    batch = [turn(sid) for sid in good[:2]] + [turn("x" * 40)] + [turn(sid) for sid in good[2:]]
+    store._write(batch)
+
+    assert count_turns(good) == 5
+    assert store.rejected == 1
@@ -0,0 +1,46 @@
+"""
+Tests for background user-agent enrichment and the traffic breakdown.
+"""
+import uuid
+
+from sqlalchemy import select
+
+from app.config.database import SessionLocal, UserAgent
+from app.services.user_agents import ua_enricher, user_agent_hash
+
+
+def breakdown(client, by: str, include_bots: bool = False) -> dict:
+    data = client.get(f"/api/analytics/breakdown?by={by}&include_bots={str(include_bots).lower()}").json()
+    return {entry["value"]: entry["visits"] for entry in data["entries"]}
+
+
+def visit(client, user_agent: str) -> None:
+    # A fresh page per visit, so the dedup filter never drops one
+    response = client.post("/api/analytics/visit", json={"page_visited": f"/ua/{uuid.uuid4().hex}", "user_agent": user_agent})
+    assert response.json() == {"success": True, "message": "Visit recorded successfully"}
+
+
+def test_visits_are_parsed_and_broken_down(client):
+    marker = uuid.uuid4().hex[:8]
+    desktop = f"Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0 {marker}"
+    crawler = f"Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html) {marker}"
+
+    ua_enricher.backfill_once()  # Earlier tests' visits must not land in the delta
+    devices_before = breakdown(client, "device", include_bots=True)
+    for user_agent in (desktop, desktop, crawler):
+        visit(client, user_agent)
+    ua_enricher.backfill_once()  # Whatever the queued writer hasn't parsed yet
+
+    with SessionLocal() as db:
+        row = db.scalars(select(UserAgent).where(UserAgent.ua_hash == user_agent_hash(desktop))).one()
+    assert (row.browser, row.os, row.device, row.is_bot) == ("Firefox", "Linux", "desktop", False)
+
+    devices = breakdown(client, "device", include_bots=True)
+    assert devices["desktop"] - devices_before.get("desktop", 0) == 2
+    assert devices["bot"] - devices_before.get("bot", 0) == 1
+    assert "bot" not in breakdown(client, "device")
+    assert breakdown(client, "browser")["Firefox"] >= 2
+
+
+def test_unknown_dimension_is_rejected(client):
+    assert client.get("/api/analytics/breakdown?by=ip_hash").status_code == 422
@@ -0,0 +1,203 @@
+"""
+Tests for the upstream call layer: retries and the circuit breaker's half-open probe.
+"""
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from app.services.upstream import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    UpstreamClient,
+    UpstreamError,
+)
+
+
+class Transient(ConnectionError):
+    """A failure is_retryable() treats as upstream degradation."""
+
+
+class Rejected(Exception):
+    """A failure is_retryable() treats as the caller's fault."""
+
+
+def make_client(failure_threshold: int = 1, max_retries: int = 0) -> UpstreamClient:
+    return UpstreamClient(
+        name="test",
+        timeout=1.0,
+        deadline=2.0,
+        max_retries=max_retries,
+        backoff_base=0.0,
+        backoff_max=0.0,
+        hedge_delay=0.0,
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=0.0),
+    )
+
+
+async def fail_transient():
+    raise Transient("connection reset")
+
+
+async def succeed():
+    return "ok"
+
+
+def open_circuit(client: UpstreamClient) -> None:
+    """Trip the breaker; with reset_timeout=0 the next call is the half-open probe."""
+    with pytest.raises(UpstreamError):
+        asyncio.run(client.call(fail_transient))
+    assert client.breaker.state == CircuitState.OPEN
+
+
+def test_retries_transient_failures():
+    client = make_client(failure_threshold=5, max_retries=2)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Transient("reset")
+        return "ok"
+
+    assert asyncio.run(client.call(flaky)) == "ok"
+    assert len(attempts) == 3
+    assert client.stats["retries"] == 2
+
+
+def test_non_retryable_error_is_not_retried():
+    client = make_client(failure_threshold=5, max_retries=3)
+    attempts = []
+
+    async def rejected():
+        attempts.append(1)
+        raise Rejected("blocked")
+
+    with pytest.raises(UpstreamError):
+        asyncio.run(client.call(rejected))
+    assert len(attempts) == 1
+    assert client.breaker.state == CircuitState.CLOSED
+
+
+def test_probe_success_closes_circuit():
+    client = make_client()
+    open_circuit(client)
+    assert asyncio.run(client.call(succeed)) == "ok"
+    assert client.breaker.state == CircuitState.CLOSED
+
+
+def test_cancelled_probe_releases_slot():
+    client = make_client()
+    open_circuit(client)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        probe = asyncio.create_task(client.call(slow))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        # The next call must get the probe slot rather than CircuitOpenError
+        return await client.call(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert client.breaker.state == CircuitState.CLOSED
+
+
+def test_cancelled_stream_probe_before_first_chunk_releases_slot():
+    client = make_client()
+    open_circuit(client)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def slow_chunks():
+            started.set()
+            await asyncio.sleep(10)
+            yield "never"
+
+        async def consume():
+            async with aclosing(client.stream(slow_chunks)) as chunks:
+                async for _ in chunks:
+                    pass
+
+        task = asyncio.create_task(consume())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await client.call(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_abandoned_stream_probe_releases_slot():
+    client = make_client()
+    open_circuit(client)
+
+    async def chunks():
+        for word in ("a", "b", "c"):
+            yield word
+
+    async def scenario():
+        async with aclosing(client.stream(chunks)) as stream:
+            assert await stream.__anext__() == "a"
+        # Consumer left after one chunk
+        return await client.call(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_non_retryable_error_mid_stream_releases_probe():
+    client = make_client()
+    open_circuit(client)
+
+    async def chunks():
+        yield "partial"
+        raise Rejected("content blocked")
+
+    async def scenario():
+        received = []
+        with pytest.raises(UpstreamError):
+            async with aclosing(client.stream(chunks)) as stream:
+                async for chunk in stream:
+                    received.append(chunk)
+        assert received == ["partial"]
+        assert client.breaker.allow(), "probe slot leaked"
+        client.breaker.release()
+        return await client.call(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_retryable_error_mid_stream_reopens_circuit():
+    client = make_client()
+    open_circuit(client)
+
+    async def chunks():
+        yield "partial"
+        raise Transient("reset")
+
+    async def scenario():
+        with pytest.raises(UpstreamError):
+            async with aclosing(client.stream(chunks)) as stream:
+                async for _ in stream:
+                    pass
+
+    asyncio.run(scenario())
+    assert client.breaker.state == CircuitState.OPEN
+
+
+def test_open_circuit_short_circuits():
+    client = make_client()
+    client.breaker.reset_timeout = 60.0
+    open_circuit(client)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.call(succeed))
+    assert client.stats["short_circuits"] == 1
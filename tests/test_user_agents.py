@@ -0,0 +1,104 @@
+"""
+Tests for user-agent parsing and its cache.
+"""
+import pytest
+
+from app.services.user_agents import UserAgentInfo, UserAgentParser, parse_user_agent, user_agent_hash
+
+
+@pytest.mark.parametrize("user_agent, expected", [
+    (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/130.0.0.0 Safari/537.36",
+        ("Chrome", "Windows", "desktop"),
+    ),
+    (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/130.0.0.0 Safari/537.36 Edg/130.0.2849.68",
+        ("Edge", "Windows", "desktop"),
+    ),
+    (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+        "Version/17.1 Safari/605.1.15",
+        ("Safari", "macOS", "desktop"),
+    ),
+    ("Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0", ("Firefox", "Linux", "desktop")),
+    (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+        "Version/17.1 Mobile/15E148 Safari/604.1",
+        ("Safari", "iOS", "mobile"),
+    ),
+    (
+        "Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "SamsungBrowser/23.0 Chrome/115.0.0.0 Mobile Safari/537.36",
+        ("Samsung Internet", "Android", "mobile"),
+    ),
+    (
+        "Mozilla/5.0 (iPad; CPU OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+        "CriOS/130.0 Mobile/15E148 Safari/604.1",
+        ("Chrome", "iOS", "tablet"),
+    ),
+    (
+        "Mozilla/5.0 (Linux; Android 13; SM-X200) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/130.0.0.0 Safari/537.36",
+        ("Chrome", "Android", "tablet"),
+    ),
+    # Phone maker whose name contains "bot"
+    (
+        "Mozilla/5.0 (Linux; Android 10; CUBOT X30) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Mobile Safari/537.36",
+        ("Chrome", "Android", "mobile"),
+    ),
+    (
+        "Mozilla/5.0 (Linux; Android 11; Cubot Note 20) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/118.0.0.0 Mobile Safari/537.36",
+        ("Chrome", "Android", "mobile"),
+    ),
+    ("", ("Other", "Other", "desktop")),
+])
+def test_browsers(user_agent, expected):
+    info = parse_user_agent(user_agent)
+    assert (info.browser, info.os, info.device) == expected
+    assert info.is_bot is False
+
+
+@pytest.mark.parametrize("user_agent, name", [
+    ("Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)", "Googlebot"),
+    (
+        "Mozilla/5.0 AppleWebKit/537.36 (KHTML, like Gecko; compatible; bingbot/2.0; "
+        "+http://www.bing.com/bingbot.htm) Chrome/116.0.1938.76 Safari/537.36",
+        "bingbot",
+    ),
+    ("Mozilla/5.0 (compatible; AhrefsBot/7.0; +http://ahrefs.com/robot/)", "AhrefsBot"),
+    ("Mozilla/5.0 (compatible; YandexBot/3.0; +http://yandex.com/bots)", "YandexBot"),
+    ("Slackbot-LinkExpanding 1.0 (+https://api.slack.com/robots)", "Slackbot"),
+    ("Mozilla/5.0 (compatible; GPTBot/1.0; +https://openai.com/gptbot)", "GPTBot"),
+    ("Mozilla/5.0 (compatible; Baiduspider/2.0; +http://www.baidu.com/search/spider.html)", "Baiduspider"),
+    ("facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)", "Bot"),
+    ("curl/8.4.0", "curl"),
+    ("python-requests/2.31.0", "python-requests"),
+    (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "HeadlessChrome/130.0.0.0 Safari/537.36",
+        "Bot",
+    ),
+])
+def test_bots(user_agent, name):
+    info = parse_user_agent(user_agent)
+    assert info.is_bot is True
+    assert info.device == "bot"
+    assert info.browser == name
+
+
+def test_parser_cache():
+    parser = UserAgentParser(max_entries=1)
+    firefox = "Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0"
+    assert parser.parse(firefox) == UserAgentInfo("Firefox", "Linux", "desktop", False)
+    parser.parse(firefox)
+    parser.parse("curl/8.4.0")
+    assert parser.snapshot() == {"entries": 1, "hits": 1, "misses": 2}
+
+
+def test_hash_is_fixed_size():
+    assert len(user_agent_hash("x" * 10000)) == 32
+    assert user_agent_hash("a") != user_agent_hash("b")
@@ -0,0 +1,90 @@
+"""
+Tests for visit deduplication: the Bloom filters, Idempotency-Key replays, and
+retries of a visit whose insert failed.
+"""
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from app.config.database import SessionLocal, Visitor, get_db
+from app.services.visit_dedup import IdempotencyKeys, RotatingBloomFilter, VisitDeduplicator
+
+
+def visit_count() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count(Visitor.id)))
+
+
+def test_rotating_bloom_forgets_previous_bucket():
+    bloom = RotatingBloomFilter(bucket_seconds=60, capacity=100, error_rate=0.01)
+    assert bloom.check_and_add("a", now=0) is False
+    assert bloom.check_and_add("a", now=30) is True
+    assert bloom.contains("a", now=61) is False
+
+
+def test_rotating_bloom_grows_past_capacity():
+    bloom = RotatingBloomFilter(bucket_seconds=60, capacity=10, error_rate=0.01)
+    for i in range(50):
+        bloom.add(f"key-{i}", now=0)
+    assert len(bloom.slices) > 1
+    assert all(bloom.contains(f"key-{i}", now=0) for i in range(50))
+
+
+def test_idempotency_keys_are_bounded():
+    keys = IdempotencyKeys(ttl=600, max_entries=2)
+    for key in ("a", "b", "c"):
+        keys.add(key)
+    assert "a" not in keys
+    assert "c" in keys
+
+
+def test_check_does_not_remember():
+    dedup = VisitDeduplicator(enabled=True, bucket_seconds=60, capacity=100, error_rate=0.01, idempotency_ttl=600)
+    assert dedup.is_duplicate("ip", "/", "key") is False
+    assert dedup.is_duplicate("ip", "/", "key") is False
+    dedup.remember("ip", "/", "key")
+    assert dedup.is_duplicate("ip", "/", "key") is True
+    assert dedup.is_duplicate("ip", "/", None) is True
+    assert dedup.is_duplicate("other-ip", "/", None) is False
+
+
+def test_refresh_is_deduplicated(client):
+    visit = {"page_visited": f"/dedup/{uuid.uuid4().hex}"}
+    assert "deduplicated" not in client.post("/api/analytics/visit", json=visit).json()
+    assert client.post("/api/analytics/visit", json=visit).json()["deduplicated"] is True
+
+
+def test_retry_after_failed_commit_is_recorded(app, client):
+    def failing_db():
+        db = SessionLocal()
+
+        def commit():
+            raise OperationalError("COMMIT", {}, Exception("database is locked"))
+
+        db.commit = commit
+        try:
+            yield db
+        finally:
+            db.close()
+
+    visit = {"page_visited": "/dedup-retry", "user_agent": "Mozilla/5.0 (X11; Linux x86_64) Firefox/131.0"}
+    headers = {"Idempotency-Key": "retry-after-failure"}
+    before = visit_count()
+
+    app.dependency_overrides[get_db] = failing_db
+    try:
+        response = client.post("/api/analytics/visit", json=visit, headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_db)
+    assert response.status_code == 500
+    assert visit_count() == before
+
+    response = client.post("/api/analytics/visit", json=visit, headers=headers)
+    assert response.status_code == 200
+    assert "deduplicated" not in response.json()
+    assert visit_count() == before + 1
+
+    response = client.post("/api/analytics/visit", json=visit, headers=headers)
+    assert response.json()["deduplicated"] is True
+    assert visit_count() == before + 1